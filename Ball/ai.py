@@ -0,0 +1,139 @@
+import random
+
+
+# Reaction delay (ticks) and standard deviation of the aiming error (pixels)
+# per difficulty. A return is missed once the error passes half the paddle
+# plus the ball radius (70 pixels in BallGame).
+DIFFICULTIES = {
+    "easy": (20, 70),
+    "normal": (12, 45),
+    "hard": (6, 30),
+}
+
+
+def intercept(physics, x, y, vx, vy, face_x):
+    """Height, tick count and vertical velocity with which a ball at (x, y)
+    moving (vx, vy) per tick reaches face_x, bouncing off the top and bottom
+    walls on the way.
+
+    Closed form: the wall bounces are unfolded into a straight line and the
+    height folded back into the field, so the cost does not depend on the
+    number of bounces; the ball moves against vy when it ends on a folded
+    stretch. Returns None if the ball is not moving towards face_x.
+    """
+    if vx == 0 or (face_x - x) * vx <= 0:
+        return None
+    ticks = (face_x - x) / vx
+    low = physics.ball_radius
+    span = physics.height - 2 * low  # Range of the ball centre's height
+    if span <= 0:
+        return low, ticks, vy
+    offset = (y + vy * ticks - low) % (2 * span)
+    if offset <= span:
+        return low + offset, ticks, vy
+    return low + 2 * span - offset, ticks, -vy
+
+
+class PaddleAI:
+    """Computer player for one paddle.
+
+    Whenever the ball's horizontal velocity changes (a serve or a paddle
+    hit) the AI works out where the ball will cross its paddle's face with
+    intercept(), adds a normally distributed aiming error and, after reaction ticks, moves
+    there at speed pixels per tick. While the ball moves away it drifts
+    back to the middle. Planning is O(1) per hit rather than a simulation
+    every frame. Call reset() when a new ball is served.
+    """
+
+    def __init__(self, physics, paddle_x, speed, reaction=12, error=40, rng=None):
+        self.physics = physics
+        self.speed = speed
+        self.reaction = reaction
+        self.error = error
+        self.rng = rng or random.Random()
+        # Ball centre's x when it touches the paddle's front face
+        if paddle_x < physics.width / 2:
+            self.face_x = paddle_x + physics.paddle_width + physics.ball_radius
+        else:
+            self.face_x = paddle_x - physics.ball_radius
+        self.home = physics.height / 2 - physics.paddle_height / 2
+        self.reset()
+
+    @classmethod
+    def for_difficulty(cls, difficulty, physics, paddle_x, speed, rng=None):
+        reaction, error = DIFFICULTIES[difficulty]
+        return cls(physics, paddle_x, speed, reaction, error, rng)
+
+    def reset(self):
+        self.seen_vx = None
+        self.target = self.home
+        self.wait = 0
+
+    def plan(self, ball_pos, ball_vel):
+        """Paddle top to aim for on this trajectory (the middle if the ball moves away)"""
+        hit = intercept(self.physics, ball_pos[0], ball_pos[1], ball_vel[0], ball_vel[1], self.face_x)
+        return self.home if hit is None else self.aim(hit[0])
+
+    def aim(self, y):
+        """Paddle top for returning a ball that crosses the face at height y"""
+        return y - self.physics.paddle_height / 2 + self.rng.gauss(0, self.error)
+
+    def update(self, paddle, ball_pos, ball_vel):
+        """Move the paddle ([x, y] top-left, updated in place) for one tick.
+        Positions stay whole pixels, as BallGame records them."""
+        if ball_vel[0] != self.seen_vx:
+            self.seen_vx = ball_vel[0]
+            self.target = self.plan(ball_pos, ball_vel)
+            self.wait = self.reaction
+        if self.wait > 0:
+            self.wait -= 1
+            return
+        move = max(-self.speed, min(self.speed, self.target - paddle[1]))
+        paddle[1] = round(max(0, min(self.physics.height - self.physics.paddle_height, paddle[1] + move)))
+
+
+def play_match(physics, players, ball_speed, rng, points=5, max_hits=1000):
+    """Play a match between two PaddleAIs without stepping the physics.
+
+    The ball is followed from paddle face to paddle face: each leg's
+    intercept comes from intercept(), and both paddles get the moves their
+    AI would make in the leg's ticks, so a match costs O(1) per hit.
+    Contacts are treated as flat-face returns (speed and angle kept), also
+    on the paddle corners, where the full physics would deflect the ball.
+    players holds the left and right PaddleAI; both paddles start each
+    point in the middle, as in BallGame. A rally is cut short as a miss
+    after max_hits returns. Returns (score1, score2, hits, ticks).
+    """
+    height_limit = physics.height - physics.paddle_height
+    reach = physics.ball_radius  # The ball touches a paddle this far past its ends
+    scores = [0, 0]
+    hits = ticks = 0
+    while max(scores) < points:
+        tops = [player.home for player in players]
+        (x, y), (vx, vy) = physics.serve(rng, ball_speed)
+        for _ in range(max_hits):
+            receiver = 1 if vx > 0 else 0
+            player = players[receiver]
+            y_hit, leg, vy_hit = intercept(physics, x, y, vx, vy, player.face_x)
+            ticks += leg
+
+            # Both paddles move for the leg's ticks after their reaction delay:
+            # the receiver to its aim, the other one back to the middle
+            reach_receiver = player.speed * max(0.0, leg - player.reaction)
+            move = player.aim(y_hit) - tops[receiver]
+            top = tops[receiver] + max(-reach_receiver, min(reach_receiver, move))
+            top = tops[receiver] = max(0, min(height_limit, top))
+
+            other = players[1 - receiver]
+            reach_other = other.speed * max(0.0, leg - other.reaction)
+            move = other.home - tops[1 - receiver]
+            tops[1 - receiver] += max(-reach_other, min(reach_other, move))
+
+            if not top - reach <= y_hit <= top + physics.paddle_height + reach:
+                break
+            hits += 1
+            x, y, vx, vy = player.face_x, y_hit, -vx, vy_hit
+        else:
+            receiver = 1 - receiver  # Out of returns: the next receiver misses
+        scores[1 - receiver] += 1
+    return scores[0], scores[1], hits, ticks
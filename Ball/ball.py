@@ -1,16 +1,20 @@
 import pygame
-import cv2
-import mediapipe as mp
-import numpy as np
 import random
-import math
 from utils.sound_manager import SoundManager
+from utils.particles import ParticleSystem
+from utils.render_cache import RenderCache
+from utils.hand_tracker import get_hand_tracker
+from utils.hand_worker import INDEX_FINGER_TIP
+from utils.landmark_filter import LandmarkPredictor
+from utils.replay import InputRecorder, new_seed, recording_path
+from Ball.physics import PongPhysics, FIELD_WIDTH, FIELD_HEIGHT, PADDLE_WIDTH, PADDLE_HEIGHT, BALL_RADIUS
+from Ball.ai import PaddleAI
 
 class BallGame:
     def __init__(self):
         pygame.init()
-        self.WIDTH = 1280
-        self.HEIGHT = 720
+        self.WIDTH = FIELD_WIDTH
+        self.HEIGHT = FIELD_HEIGHT
         self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT), pygame.RESIZABLE)
         pygame.display.set_caption("AI Ping Pong")
         
@@ -30,25 +34,42 @@ class BallGame:
         self.small_font = pygame.font.Font(None, 36)
         
         # Game objects
-        self.paddle_width = 20
-        self.paddle_height = 100
-        self.ball_size = 20
+        self.paddle_width = PADDLE_WIDTH
+        self.paddle_height = PADDLE_HEIGHT
+        self.ball_size = BALL_RADIUS
         self.paddle_speed = 10
         self.ball_speed = 7
         
+        # Physics runs at a fixed tick rate, independent of the frame rate;
+        # speeds above are in pixels per tick
+        self.FPS = 60
+        self.TICK_RATE = 60
+        self.physics = PongPhysics(self.WIDTH, self.HEIGHT, self.paddle_width,
+                                   self.paddle_height, self.ball_size)
+        # Computer player for paddle 2, switched on with A. It has its own random
+        # generator so it does not disturb the replayable serves.
+        self.ai_opponent = False
+        self.opponent = PaddleAI.for_difficulty("normal", self.physics, self.physics.paddle_x[1],
+                                                self.paddle_speed, random.Random())
+        
         # Particle system
-        self.particles = []
         self.MAX_PARTICLES = 100
+        self.particles = ParticleSystem(self.MAX_PARTICLES)
+        
+        # Glow sprites and overlays, built once and reused every frame
+        self.render_cache = RenderCache()
         
         # Sound manager
         self.sound_manager = SoundManager()
         
-        # Hand tracking
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.7)
-        self.cap = cv2.VideoCapture(0)
+        # Shared hand tracker, subscribed to the first time hand control is switched on
+        self.hand_input = None
+        # Smooths the landmarks and predicts them forward over the tracking delay
+        self.hand_filter = LandmarkPredictor()
+        
+        # Gameplay randomness has its own generator so sessions can be replayed
+        self.rng = random.Random()
+        self.recorder = None
         
         # Game states
         self.paused = False
@@ -60,10 +81,10 @@ class BallGame:
         self.reset_game()
     
     def reset_game(self):
-        self.paddle1_pos = [50, self.HEIGHT//2 - self.paddle_height//2]
-        self.paddle2_pos = [self.WIDTH - 70, self.HEIGHT//2 - self.paddle_height//2]
-        self.ball_pos = [self.WIDTH//2, self.HEIGHT//2]
-        self.ball_dir = [random.choice([-1, 1]) * self.ball_speed, random.uniform(-1, 1) * self.ball_speed]
+        self.paddle1_pos = [self.physics.paddle_x[0], self.HEIGHT//2 - self.paddle_height//2]
+        self.paddle2_pos = [self.physics.paddle_x[1], self.HEIGHT//2 - self.paddle_height//2]
+        self.ball_pos, self.ball_dir = self.physics.serve(self.rng, self.ball_speed)
+        self.opponent.reset()
         self.score1 = 0
         self.score2 = 0
         self.game_over = False
@@ -71,57 +92,27 @@ class BallGame:
         self.particles.clear()
     
     def add_particles(self, pos, color, count=10):
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 5)
-            self.particles.append({
-                'pos': list(pos),
-                'vel': [math.cos(angle) * speed, math.sin(angle) * speed],
-                'color': color,
-                'life': 1.0
-            })
+        self.particles.burst(pos, color, count)
     
     def update_particles(self):
-        for particle in self.particles[:]:
-            particle['pos'][0] += particle['vel'][0]
-            particle['pos'][1] += particle['vel'][1]
-            particle['life'] -= 0.02
-            
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
-            else:
-                color = particle['color']
-                alpha = int(particle['life'] * 255)
-                pygame.draw.circle(self.screen, (*color, alpha), 
-                                 (int(particle['pos'][0]), int(particle['pos'][1])), 3)
+        self.particles.update()
+        self.particles.draw(self.screen)
     
     def draw_ui_overlay(self):
         # Draw top UI bar
-        overlay = pygame.Surface((self.WIDTH, 80), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.render_cache.panel((self.WIDTH, 80), (0, 0, 0, 180)), (0, 0))
         
         # Draw scores with glow
         score_text = f"{self.score1} - {self.score2}"
-        shadow_surf = self.font.render(score_text, True, (0, 0, 0))
-        text_surf = self.font.render(score_text, True, self.WHITE)
-        
-        # Add glow effect
-        glow_surf = pygame.Surface(text_surf.get_size(), pygame.SRCALPHA)
-        glow_surf.blit(text_surf, (0, 0))
-        for i in range(3):
-            pygame.draw.rect(glow_surf, (*self.BLUE, 50-i*15), 
-                           glow_surf.get_rect().inflate(i*2, i*2), 1)
-        
-        score_x = self.WIDTH//2
-        self.screen.blit(shadow_surf, (score_x - text_surf.get_width()//2 + 2, 22))
-        self.screen.blit(glow_surf, (score_x - text_surf.get_width()//2, 20))
-        self.screen.blit(text_surf, (score_x - text_surf.get_width()//2, 20))
+        score_surf = self.render_cache.framed_text(self.font, score_text, self.WHITE, self.BLUE)
+        text_width = score_surf.get_width() - 2  # Without the shadow
+        self.screen.blit(score_surf, (self.WIDTH//2 - text_width//2, 20))
         
         # Draw game controls with icons
         controls = [
             ("⌨️ Arrows", "Move"),
             ("🤚 H", "Hand Control: " + ("ON" if self.hand_control else "OFF")),
+            ("🤖 A", "AI Opponent: " + ("ON" if self.ai_opponent else "OFF")),
             ("⏸️ P", "Pause"),
             ("🏠 ESC", "Menu")
         ]
@@ -137,22 +128,11 @@ class BallGame:
     
     def draw_pause_menu(self):
         # Draw semi-transparent overlay
-        overlay = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
-        
-        # Draw pause menu title
-        title_text = "Game Paused"
-        title_surf = self.font.render(title_text, True, self.WHITE)
-        title_rect = title_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2 - 60))
-        
-        # Add glow effect to title
-        for i in range(3):
-            glow_surf = self.font.render(title_text, True, (*self.BLUE, 100-i*30))
-            glow_rect = glow_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2 - 60))
-            self.screen.blit(glow_surf, glow_rect.inflate(i*4, i*4))
+        self.screen.blit(self.render_cache.panel((self.WIDTH, self.HEIGHT), (0, 0, 0, 180)), (0, 0))
         
-        self.screen.blit(title_surf, title_rect)
+        # Draw pause menu title with glow
+        title_surf = self.render_cache.glow_text(self.font, "Game Paused", self.WHITE, self.BLUE)
+        self.screen.blit(title_surf, title_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2 - 60)))
         
         # Draw menu options
         options = [
@@ -168,23 +148,13 @@ class BallGame:
     
     def draw_game_over(self):
         # Draw semi-transparent overlay
-        overlay = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.render_cache.panel((self.WIDTH, self.HEIGHT), (0, 0, 0, 180)), (0, 0))
         
-        # Draw winner announcement with animation
+        # Draw winner announcement with a pulsing glow
         winner_text = f"Player {self.winner} Wins!"
-        title_surf = self.font.render(winner_text, True, self.GREEN)
-        title_rect = title_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2 - 60))
-        
-        # Add pulsing glow effect
-        pulse = math.sin(pygame.time.get_ticks() * 0.005) * 0.5 + 0.5
-        for i in range(3):
-            glow_surf = self.font.render(winner_text, True, (*self.GREEN, int(100*pulse-i*30)))
-            glow_rect = glow_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2 - 60))
-            self.screen.blit(glow_surf, glow_rect.inflate(i*4, i*4))
-        
-        self.screen.blit(title_surf, title_rect)
+        alphas = self.render_cache.pulse_alphas(pygame.time.get_ticks(), 0.005)
+        title_surf = self.render_cache.glow_text(self.font, winner_text, self.GREEN, alphas=alphas)
+        self.screen.blit(title_surf, title_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2 - 60)))
         
         # Draw final score
         score_text = f"Final Score: {self.score1} - {self.score2}"
@@ -205,27 +175,17 @@ class BallGame:
     
     def draw_tutorial(self):
         # Draw semi-transparent overlay
-        overlay = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
-        
-        # Draw tutorial title
-        title_text = "Welcome to AI Ping Pong!"
-        title_surf = self.font.render(title_text, True, self.BLUE)
-        title_rect = title_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//3))
-        
-        # Add glow to title
-        for i in range(3):
-            glow_surf = self.font.render(title_text, True, (*self.BLUE, 100-i*30))
-            glow_rect = glow_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//3))
-            self.screen.blit(glow_surf, glow_rect.inflate(i*4, i*4))
+        self.screen.blit(self.render_cache.panel((self.WIDTH, self.HEIGHT), (0, 0, 0, 180)), (0, 0))
         
-        self.screen.blit(title_surf, title_rect)
+        # Draw tutorial title with glow
+        title_surf = self.render_cache.glow_text(self.font, "Welcome to AI Ping Pong!", self.BLUE)
+        self.screen.blit(title_surf, title_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//3)))
         
         # Draw instructions
         instructions = [
             "🎮 Use UP/DOWN arrows to move your paddle",
             "🤚 Press H to toggle hand control mode",
+            "🤖 Press A to play against the computer",
             "🎯 First to 5 points wins!",
             "",
             "▶️ Press SPACE to start"
@@ -248,12 +208,11 @@ class BallGame:
                            (self.WIDTH//2 - 2, y, 4, 20))
         
         # Draw paddles with glow effect
+        paddle_glow = self.render_cache.glow_rect((self.paddle_width, self.paddle_height), self.BLUE)
+        margin = self.render_cache.glow_margin((50, 35, 20), 2)
         for paddle_pos in [self.paddle1_pos, self.paddle2_pos]:
             # Glow
-            for i in range(3):
-                glow_rect = pygame.Rect(paddle_pos[0]-i*2, paddle_pos[1]-i*2,
-                                      self.paddle_width+i*4, self.paddle_height+i*4)
-                pygame.draw.rect(self.screen, (*self.BLUE, 50-i*15), glow_rect, border_radius=5)
+            self.screen.blit(paddle_glow, (paddle_pos[0] - margin, paddle_pos[1] - margin))
             
             # Main paddle
             paddle_rect = pygame.Rect(paddle_pos[0], paddle_pos[1],
@@ -261,76 +220,108 @@ class BallGame:
             pygame.draw.rect(self.screen, self.WHITE, paddle_rect, border_radius=5)
         
         # Draw ball with glow
-        for i in range(3):
-            glow_size = self.ball_size + i*4
-            pygame.draw.circle(self.screen, (*self.YELLOW, 50-i*15),
-                             (int(self.ball_pos[0]), int(self.ball_pos[1])), glow_size)
+        ball_glow = self.render_cache.glow_circle(self.ball_size, self.YELLOW)
+        self.screen.blit(ball_glow, ball_glow.get_rect(center=(int(self.ball_pos[0]), int(self.ball_pos[1]))))
         
         pygame.draw.circle(self.screen, self.WHITE,
                          (int(self.ball_pos[0]), int(self.ball_pos[1])), self.ball_size)
     
     def update_game_state(self):
         if not self.paused and not self.game_over and not self.show_tutorial:
-            self.ball_pos[0] += self.ball_dir[0]
-            self.ball_pos[1] += self.ball_dir[1]
-            
-            # Collision with top and bottom
-            if self.ball_pos[1] < self.ball_size or self.ball_pos[1] > self.HEIGHT - self.ball_size:
-                self.ball_dir[1] *= -1
-            
-            # Collision with paddles
-            if (self.ball_pos[0] < self.paddle1_pos[0] + self.paddle_width and
-                self.ball_pos[1] > self.paddle1_pos[1] and
-                self.ball_pos[1] < self.paddle1_pos[1] + self.paddle_height):
-                self.ball_dir[0] *= -1
-            elif (self.ball_pos[0] > self.paddle2_pos[0] - self.ball_size and
-                  self.ball_pos[1] > self.paddle2_pos[1] and
-                  self.ball_pos[1] < self.paddle2_pos[1] + self.paddle_height):
-                self.ball_dir[0] *= -1
-            
-            # Collision with left and right
-            if self.ball_pos[0] < self.ball_size:
-                self.score2 += 1
-                self.reset_game()
-            elif self.ball_pos[0] > self.WIDTH - self.ball_size:
-                self.score1 += 1
+            if self.recorder:
+                self.recorder.write(self.paddle1_pos[1], self.paddle2_pos[1])
+            self.step_ball()
+            self.update_paddles(pygame.key.get_pressed())
+    
+    def step_ball(self):
+        # Swept collisions keep the ball from passing through a paddle at any speed
+        events = self.physics.step(self.ball_pos, self.ball_dir, [self.paddle1_pos, self.paddle2_pos])
+        for event, player in events:
+            if event == "score":
+                if player == 2:
+                    self.score2 += 1
+                else:
+                    self.score1 += 1
                 self.reset_game()
-            
-            # Update paddles
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_w]:
-                self.paddle1_pos[1] -= self.paddle_speed
-            if keys[pygame.K_s]:
-                self.paddle1_pos[1] += self.paddle_speed
+    
+    def update_paddles(self, keys):
+        if keys[pygame.K_w]:
+            self.paddle1_pos[1] -= self.paddle_speed
+        if keys[pygame.K_s]:
+            self.paddle1_pos[1] += self.paddle_speed
+        if self.ai_opponent:
+            self.opponent.update(self.paddle2_pos, self.ball_pos, self.ball_dir)
+        else:
             if keys[pygame.K_UP]:
                 self.paddle2_pos[1] -= self.paddle_speed
             if keys[pygame.K_DOWN]:
                 self.paddle2_pos[1] += self.paddle_speed
-            
-            # Ensure paddles don't go off screen
-            self.paddle1_pos[1] = max(0, min(self.HEIGHT - self.paddle_height, self.paddle1_pos[1]))
-            self.paddle2_pos[1] = max(0, min(self.HEIGHT - self.paddle_height, self.paddle2_pos[1]))
+        
+        # Ensure paddles don't go off screen
+        self.paddle1_pos[1] = max(0, min(self.HEIGHT - self.paddle_height, self.paddle1_pos[1]))
+        self.paddle2_pos[1] = max(0, min(self.HEIGHT - self.paddle_height, self.paddle2_pos[1]))
+    
+    def ensure_hand_tracking(self):
+        if self.hand_input is None:
+            self.hand_input = get_hand_tracker().subscribe()
+    
+    def replay_summary(self):
+        return {'score1': self.score1, 'score2': self.score2,
+                'ball_pos': [self.ball_pos[0], self.ball_pos[1]]}
+    
+    def start_recording(self):
+        # Recordings start from a freshly seeded rally so they can be replayed
+        seed = new_seed()
+        self.rng.seed(seed)
+        self.reset_game()
+        self.recorder = InputRecorder(recording_path('ball'), 'ball', seed)
+    
+    def stop_recording(self):
+        if self.recorder:
+            self.recorder.close(self.replay_summary())
+            print(f"Saved recording: {self.recorder.path}")
+            self.recorder = None
+    
+    def replay_session(self, replay, render=False):
+        """Re-run a recorded session as fast as possible and return its final state"""
+        self.rng.seed(replay.seed)
+        self.reset_game()
+        self.show_tutorial = False
+        for paddle1_y, paddle2_y in replay:
+            self.paddle1_pos[1] = paddle1_y
+            self.paddle2_pos[1] = paddle2_y
+            self.step_ball()
+            if render:
+                self.draw_game_state()
+                self.draw_ui_overlay()
+                pygame.display.flip()
+        return self.replay_summary()
     
     def process_hand_tracking(self):
-        ret, frame = self.cap.read()
-        if not ret:
-            return
-        
-        frame = cv2.flip(frame, 1)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb_frame)
-        
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                # Use index finger tip for paddle control
-                x = hand_landmarks.landmark[8].x
-                self.paddle1_pos[1] = int(x * self.HEIGHT) - self.paddle_height//2
-                self.paddle1_pos[1] = max(0, min(self.HEIGHT - self.paddle_height, self.paddle1_pos[1]))
+        self.ensure_hand_tracking()
+        # Feed new tracking results to the filter; forget the hand once it is lost
+        hands, timestamp = self.hand_input.poll()
+        if hands:
+            self.hand_filter.update(hands[0], timestamp)
+        elif hands is not None:
+            self.hand_filter.reset()
+        
+        # Every frame, move the paddle to where the hand should be by now;
+        # without a hand it keeps its place
+        hand = self.hand_filter.predict()
+        if hand is not None:
+            # Use index finger tip for paddle control
+            x = hand[INDEX_FINGER_TIP, 0]
+            self.paddle1_pos[1] = int(x * self.HEIGHT) - self.paddle_height//2
+            self.paddle1_pos[1] = max(0, min(self.HEIGHT - self.paddle_height, self.paddle1_pos[1]))
     
     def run(self):
         clock = pygame.time.Clock()
         running = True
         return_to_menu = True
+        tick_interval = 1000.0 / self.TICK_RATE
+        accumulator = 0.0
+        frame_time = 0
         
         while running:
             for event in pygame.event.get():
@@ -349,13 +340,24 @@ class BallGame:
                             self.paused = not self.paused
                     elif event.key == pygame.K_h:
                         self.hand_control = not self.hand_control
+                    elif event.key == pygame.K_a:
+                        self.ai_opponent = not self.ai_opponent
+                        self.opponent.reset()
+                    elif event.key == pygame.K_F9:
+                        if self.recorder:
+                            self.stop_recording()
+                        else:
+                            self.start_recording()
             
             # Process hand tracking
             if self.hand_control:
                 self.process_hand_tracking()
             
-            # Update game state
-            self.update_game_state()
+            # Advance the physics in fixed ticks; cap the catch-up after a stall
+            accumulator = min(accumulator + frame_time, 5 * tick_interval)
+            while accumulator >= tick_interval:
+                self.update_game_state()
+                accumulator -= tick_interval
             
             # Draw everything
             self.draw_game_state()
@@ -370,10 +372,9 @@ class BallGame:
                 self.draw_pause_menu()
             
             pygame.display.flip()
-            clock.tick(60)
+            frame_time = clock.tick(self.FPS)
         
-        self.cap.release()
-        self.hands.close()
+        self.stop_recording()
         pygame.quit()
         return return_to_menu
 
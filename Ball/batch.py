@@ -0,0 +1,222 @@
+import argparse
+import math
+import time
+
+import numpy as np
+
+from Ball.physics import PongPhysics
+
+
+class BatchPong:
+    """Many independent Ping Pong matches stepped together with NumPy.
+
+    Uses the same field, paddles, speeds and tick as BallGame, but keeps
+    every match's state in arrays: ball_pos and ball_vel (N, 2), paddles
+    (N, 2) holding the top of the left and right paddle, and scores (N, 2).
+    step() takes one action per paddle (-1 up, 0 stay, 1 down, or anything
+    in between) and advances all matches by one tick without a Python loop
+    over them.
+
+    The collisions follow PongPhysics: walls and paddle faces reflect the
+    ball, paddle corners deflect it as rounded corners would, and a return
+    keeps at least MIN_RETURN of the speed horizontal. Unlike PongPhysics
+    the ball is not moved contact to contact within a substep, so it can
+    be off by up to a substep's travel after a bounce, and the paddles'
+    top and bottom edges are not solid. A point scored serves a new ball
+    from the centre; a match stops once a player reaches points, until
+    reset() starts it again.
+    """
+
+    def __init__(self, count, physics=None, ball_speed=7, paddle_speed=10, points=5, seed=None):
+        # Same field as BallGame by default
+        self.physics = physics or PongPhysics()
+        self.count = count
+        self.ball_speed = ball_speed
+        self.paddle_speed = paddle_speed
+        self.points = points
+        self.rng = np.random.default_rng(seed)
+
+        p = self.physics
+        # Ball centre's x when it touches each paddle's front face
+        self.face_x = np.array([p.paddle_x[0] + p.paddle_width + p.ball_radius,
+                                p.paddle_x[1] - p.ball_radius])
+        self.home = p.height / 2 - p.paddle_height / 2
+
+        self.ball_pos = np.zeros((count, 2))
+        self.ball_vel = np.zeros((count, 2))
+        self.paddles = np.zeros((count, 2))
+        self.scores = np.zeros((count, 2), dtype=np.int32)
+        self.ticks = np.zeros(count, dtype=np.int64)
+        self.reset()
+
+    @property
+    def done(self):
+        """Matches that have a winner"""
+        return self.scores.max(axis=1) >= self.points
+
+    def winner(self):
+        """1 or 2 for finished matches, 0 while still playing"""
+        return np.where(self.done, np.argmax(self.scores, axis=1) + 1, 0)
+
+    def reset(self, mask=None):
+        """Start new matches, all of them or those selected by a boolean mask"""
+        mask = np.ones(self.count, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        self.scores[mask] = 0
+        self.ticks[mask] = 0
+        self.serve(mask)
+
+    def serve(self, mask):
+        count = int(mask.sum())
+        self.ball_pos[mask] = (self.physics.width // 2, self.physics.height // 2)
+        self.ball_vel[mask, 0] = self.rng.choice([-1, 1], count) * self.ball_speed
+        self.ball_vel[mask, 1] = self.rng.uniform(-1, 1, count) * self.ball_speed
+        self.paddles[mask] = self.home
+
+    def step(self, actions):
+        """Advance every unfinished match by one tick.
+
+        actions is (N, 2): the left and right paddles' moves in units of
+        paddle_speed. Returns (hits, scored): hits (N, 2) marks paddles that
+        returned the ball, scored (N,) the player who scored (1 or 2, else 0).
+        """
+        p = self.physics
+        active = ~self.done
+        moves = np.clip(actions, -1, 1) * self.paddle_speed
+        self.paddles = np.where(active[:, None],
+                                np.clip(self.paddles + moves, 0, p.height - p.paddle_height),
+                                self.paddles)
+
+        hits = np.zeros((self.count, 2), dtype=bool)
+        scored = np.zeros(self.count, dtype=np.int8)
+        speed = np.hypot(self.ball_vel[:, 0], self.ball_vel[:, 1])
+        substeps = max(1, math.ceil(speed[active].max(initial=0) / p.max_travel))
+        for _ in range(substeps):
+            moving = active & (scored == 0)
+            self.substep(moving, 1.0 / substeps, hits)
+
+            # Scoring edges, as in PongPhysics
+            x = self.ball_pos[:, 0]
+            scored[moving & (x < p.ball_radius)] = 2
+            scored[moving & (x > p.width - p.ball_radius)] = 1
+
+        self.ticks[active] += 1
+        for player in (1, 2):
+            self.scores[:, player - 1] += scored == player
+        point = scored > 0
+        self.serve(point & ~self.done)
+        # Finished matches keep their last position but stop moving
+        self.ball_vel[point & self.done] = 0
+        return hits, scored
+
+    def substep(self, moving, dt, hits):
+        p = self.physics
+        r = p.ball_radius
+        old = self.ball_pos
+        new = old + self.ball_vel * dt * moving[:, None]
+
+        # Top and bottom walls: mirror the overshoot back into the field
+        low, high = r, p.height - r
+        top = new[:, 1] < low
+        bottom = new[:, 1] > high
+        new[top, 1] = 2 * low - new[top, 1]
+        new[bottom, 1] = 2 * high - new[bottom, 1]
+        self.ball_vel[top | bottom, 1] *= -1
+
+        for side, away in ((0, 1.0), (1, -1.0)):
+            face = self.face_x[side]
+            # The centre crosses the face's plane while moving towards the paddle
+            crossing = moving & (self.ball_vel[:, 0] * away < 0) & \
+                ((old[:, 0] - face) * away >= 0) & ((new[:, 0] - face) * away < 0)
+            if not crossing.any():
+                continue
+            t = (old[crossing, 0] - face) / (old[crossing, 0] - new[crossing, 0])
+            y = old[crossing, 1] + (new[crossing, 1] - old[crossing, 1]) * t
+            paddle_top = self.paddles[crossing, side]
+            paddle_bottom = paddle_top + p.paddle_height
+            hit = (y >= paddle_top - r) & (y <= paddle_bottom + r)
+            index = np.flatnonzero(crossing)[hit]
+            if not len(index):
+                continue
+            y, paddle_top, paddle_bottom = y[hit], paddle_top[hit], paddle_bottom[hit]
+
+            # Normal: straight out of the face, or from the corner to the ball's
+            # centre where it meets a rounded corner
+            dy = np.where(y < paddle_top, y - paddle_top, np.where(y > paddle_bottom, y - paddle_bottom, 0.0))
+            nx = np.sqrt(np.maximum(r * r - dy * dy, 0.0)) / r * away
+            ny = dy / r
+            vel = self.ball_vel[index]
+            dot = vel[:, 0] * nx + vel[:, 1] * ny
+            vel[:, 0] -= 2 * dot * nx
+            vel[:, 1] -= 2 * dot * ny
+
+            # Steady return, as PongPhysics.steady_return
+            speed = np.hypot(vel[:, 0], vel[:, 1])
+            vx = np.maximum(np.abs(vel[:, 0]), speed * p.MIN_RETURN)
+            vel[:, 1] = np.copysign(np.sqrt(np.maximum(speed * speed - vx * vx, 0.0)), vel[:, 1])
+            vel[:, 0] = vx * away
+            self.ball_vel[index] = vel
+            new[index, 0] = 2 * face - new[index, 0]
+            hits[index, side] = True
+        self.ball_pos = new
+
+    def intercept(self, side):
+        """Height at which each ball will cross the face of paddle side (0 left,
+        1 right), bouncing off the walls, as Ball.ai.intercept(); NaN for balls
+        moving away from it"""
+        p = self.physics
+        x, y = self.ball_pos[:, 0], self.ball_pos[:, 1]
+        vx, vy = self.ball_vel[:, 0], self.ball_vel[:, 1]
+        face = self.face_x[side]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ticks = (face - x) / vx
+        low = p.ball_radius
+        span = p.height - 2 * low
+        offset = np.mod(y + vy * np.where(ticks > 0, ticks, 0.0) - low, 2 * span)
+        height = low + np.where(offset <= span, offset, 2 * span - offset)
+        return np.where(ticks > 0, height, np.nan)
+
+    def track(self, side, error=0.0):
+        """Actions that move paddle side towards where the ball will cross its
+        face (back to the middle while the ball moves away), for (N,) aiming
+        errors in pixels. A vectorised Ball.ai.PaddleAI without reaction delay."""
+        target = self.intercept(side) - self.physics.paddle_height / 2 + error
+        target = np.where(np.isnan(target), self.home, target)
+        return np.clip((target - self.paddles[:, side]) / self.paddle_speed, -1, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Step many Ping Pong matches at once with NumPy")
+    parser.add_argument("--matches", type=int, default=10000)
+    parser.add_argument("--ticks", type=int, default=2000, help="Ticks to step")
+    parser.add_argument("--aim-error", type=float, default=40,
+                        help="Standard deviation of the players' aiming error, in pixels")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game = BatchPong(args.matches, seed=args.seed)
+    rng = np.random.default_rng(args.seed + 1)
+    errors = rng.normal(0, args.aim_error, (args.matches, 2))
+    hit_count = finished = left_wins = 0
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        actions = np.stack([game.track(0, errors[:, 0]), game.track(1, errors[:, 1])], axis=1)
+        hits, scored = game.step(actions)
+        hit_count += int(hits.sum())
+        # Each paddle aims afresh for every ball it returns and every serve
+        fresh = hits[:, ::-1] | (scored > 0)[:, None]
+        errors = np.where(fresh, rng.normal(0, args.aim_error, errors.shape), errors)
+        done = game.done
+        finished += int(done.sum())
+        left_wins += int((game.winner() == 1).sum())
+        game.reset(done)
+    elapsed = time.perf_counter() - start
+
+    steps = args.matches * args.ticks
+    print(f"{args.matches} matches x {args.ticks} ticks in {elapsed:.2f}s "
+          f"({steps / elapsed:,.0f} match ticks/s, {elapsed / args.ticks * 1000:.2f} ms per step)")
+    print(f"{finished} matches finished ({finished / elapsed:,.0f}/s, left won {left_wins}), "
+          f"{hit_count} returns")
+
+
+if __name__ == "__main__":
+    main()
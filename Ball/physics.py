@@ -0,0 +1,190 @@
+import math
+
+# The field as BallGame plays it; the headless tools use the same one
+FIELD_WIDTH = 1280
+FIELD_HEIGHT = 720
+PADDLE_WIDTH = 20
+PADDLE_HEIGHT = 100
+BALL_RADIUS = 20
+# Gap between each paddle and its side of the field
+PADDLE_INSET = 50
+
+
+class PongPhysics:
+    """Ball physics for Ping Pong on a fixed timestep.
+
+    Works in pixels and ticks: velocities are pixels per tick and step()
+    advances exactly one tick, whatever the display frame rate. The ball is
+    swept as a circle against the paddles (rectangles) and the top and bottom
+    walls, so it cannot pass through a paddle however fast it moves. Each
+    tick is split into substeps of at most max_travel pixels, and within a
+    substep the ball is moved contact to contact.
+
+    No pygame is needed, so rallies can be simulated headless (Ball/rallies.py).
+    """
+
+    # Contacts resolved per substep before the rest of the move is dropped
+    MAX_CONTACTS = 4
+    # Smallest share of the ball's speed kept horizontal after a paddle
+    # return, so corner hits cannot leave it bouncing between the walls
+    MIN_RETURN = 0.5
+
+    def __init__(self, width=FIELD_WIDTH, height=FIELD_HEIGHT, paddle_width=PADDLE_WIDTH,
+                 paddle_height=PADDLE_HEIGHT, ball_radius=BALL_RADIUS, max_travel=None,
+                 paddle_inset=PADDLE_INSET):
+        self.width = width
+        self.height = height
+        self.paddle_width = paddle_width
+        self.paddle_height = paddle_height
+        self.ball_radius = ball_radius
+        # Left edge of the left and the right paddle
+        self.paddle_x = (paddle_inset, width - paddle_inset - paddle_width)
+        # By default a substep moves the ball at most its own radius
+        self.max_travel = max_travel or ball_radius
+
+    def serve(self, rng, speed):
+        """Ball position and velocity for a serve from the centre"""
+        pos = [self.width // 2, self.height // 2]
+        vel = [rng.choice([-1, 1]) * speed, rng.uniform(-1, 1) * speed]
+        return pos, vel
+
+    def step(self, ball_pos, ball_vel, paddles):
+        """Advance ball_pos and ball_vel (lists, updated in place) by one tick.
+
+        paddles holds the top-left [x, y] of each paddle. Returns a list of
+        events: ("wall", None), ("paddle", index) and ("score", player),
+        where player 1 scores when the ball reaches the right edge. Stepping
+        stops at a score.
+        """
+        events = []
+        speed = math.hypot(ball_vel[0], ball_vel[1])
+        substeps = max(1, math.ceil(speed / self.max_travel))
+        for _ in range(substeps):
+            self.move(ball_pos, ball_vel, paddles, 1.0 / substeps, events)
+
+            # Scoring edges, as before: the ball's edge reaches the side of the screen
+            if ball_pos[0] < self.ball_radius:
+                events.append(("score", 2))
+                break
+            if ball_pos[0] > self.width - self.ball_radius:
+                events.append(("score", 1))
+                break
+        return events
+
+    def move(self, ball_pos, ball_vel, paddles, dt, events):
+        remaining = dt
+        for _ in range(self.MAX_CONTACTS):
+            dx = ball_vel[0] * remaining
+            dy = ball_vel[1] * remaining
+            hit_t, normal, hit = 1.0, None, None
+
+            # Top and bottom walls
+            if dy < 0 and ball_pos[1] + dy < self.ball_radius:
+                t = max(0.0, (self.ball_radius - ball_pos[1]) / dy)
+                if t < hit_t:
+                    hit_t, normal, hit = t, (0.0, 1.0), ("wall", None)
+            elif dy > 0 and ball_pos[1] + dy > self.height - self.ball_radius:
+                t = max(0.0, (self.height - self.ball_radius - ball_pos[1]) / dy)
+                if t < hit_t:
+                    hit_t, normal, hit = t, (0.0, -1.0), ("wall", None)
+
+            for index, paddle in enumerate(paddles):
+                contact = self.sweep_rect(ball_pos, dx, dy, paddle[0], paddle[1],
+                                          paddle[0] + self.paddle_width,
+                                          paddle[1] + self.paddle_height)
+                if contact and contact[0] < hit_t:
+                    hit_t, normal = contact
+                    hit = ("paddle", index)
+
+            ball_pos[0] += dx * hit_t
+            ball_pos[1] += dy * hit_t
+            if hit is None:
+                return
+
+            # Reflect the velocity about the contact normal
+            dot = ball_vel[0] * normal[0] + ball_vel[1] * normal[1]
+            ball_vel[0] -= 2 * dot * normal[0]
+            ball_vel[1] -= 2 * dot * normal[1]
+            if hit[0] == "paddle" and normal[0] != 0:
+                self.steady_return(ball_vel, normal[0])
+            events.append(hit)
+            remaining *= 1.0 - hit_t
+
+    def steady_return(self, ball_vel, away):
+        speed = math.hypot(ball_vel[0], ball_vel[1])
+        vx = max(abs(ball_vel[0]), speed * self.MIN_RETURN)
+        ball_vel[0] = math.copysign(vx, away)
+        ball_vel[1] = math.copysign(math.sqrt(max(0.0, speed * speed - vx * vx)), ball_vel[1])
+
+    def sweep_rect(self, pos, dx, dy, left, top, right, bottom):
+        """Earliest contact of the moving ball with a rectangle.
+
+        The rectangle is grown by the ball radius (a rounded rectangle), and
+        the ball centre is ray-cast against it. Returns (t, normal) with t in
+        [0, 1] along (dx, dy), or None. Contacts where the ball is already
+        moving away are ignored so a ball touching a paddle cannot stick.
+        """
+        r = self.ball_radius
+        x, y = pos
+        # Slab test against the rectangle grown by r on every side
+        t_enter, t_exit = 0.0, 1.0
+        normal = None
+        for start, delta, low, high, axis in ((x, dx, left - r, right + r, 0),
+                                              (y, dy, top - r, bottom + r, 1)):
+            if delta == 0:
+                if start < low or start > high:
+                    return None
+                continue
+            t0 = (low - start) / delta
+            t1 = (high - start) / delta
+            face = -1.0 if delta > 0 else 1.0
+            if t0 > t1:
+                t0, t1 = t1, t0
+            if t0 > t_enter:
+                t_enter = t0
+                normal = (face, 0.0) if axis == 0 else (0.0, face)
+            t_exit = min(t_exit, t1)
+            if t_enter > t_exit:
+                return None
+
+        hit_x = x + dx * t_enter
+        hit_y = y + dy * t_enter
+        # In a corner region the grown rectangle is rounded: hit the corner circle instead
+        corner_x = left if hit_x < left else right if hit_x > right else None
+        corner_y = top if hit_y < top else bottom if hit_y > bottom else None
+        if corner_x is not None and corner_y is not None:
+            contact = self.sweep_circle(x, y, dx, dy, corner_x, corner_y, r)
+            if contact is None:
+                return None
+            t_enter, normal = contact
+        elif normal is None:
+            # Already overlapping at the start: push out along the shallowest axis
+            overlaps = [(x - (left - r), (-1.0, 0.0)), ((right + r) - x, (1.0, 0.0)),
+                        (y - (top - r), (0.0, -1.0)), ((bottom + r) - y, (0.0, 1.0))]
+            normal = min(overlaps)[1]
+
+        if dx * normal[0] + dy * normal[1] >= 0:
+            return None
+        return t_enter, normal
+
+    def sweep_circle(self, x, y, dx, dy, cx, cy, r):
+        # Ray from (x, y) along (dx, dy) against a circle of radius r at (cx, cy)
+        fx, fy = x - cx, y - cy
+        a = dx * dx + dy * dy
+        b = 2 * (fx * dx + fy * dy)
+        c = fx * fx + fy * fy - r * r
+        if a == 0:
+            return None
+        disc = b * b - 4 * a * c
+        if disc < 0:
+            return None
+        t = (-b - math.sqrt(disc)) / (2 * a)
+        if t < 0:
+            if c > 0:
+                return None
+            t = 0.0  # Starting inside the corner circle
+        if t > 1:
+            return None
+        nx, ny = fx + dx * t, fy + dy * t
+        length = math.hypot(nx, ny) or 1.0
+        return t, (nx / length, ny / length)
@@ -0,0 +1,133 @@
+import argparse
+import random
+import time
+
+from Ball.ai import DIFFICULTIES, PaddleAI, play_match
+from Ball.physics import PongPhysics
+
+
+def track_ball(physics, paddle, ball_pos, paddle_speed, error=0.0):
+    """Move a paddle towards the ball's height at paddle_speed (headless opponent)"""
+    target = ball_pos[1] + error - physics.paddle_height / 2
+    move = max(-paddle_speed, min(paddle_speed, target - paddle[1]))
+    paddle[1] = max(0, min(physics.height - physics.paddle_height, paddle[1] + move))
+
+
+def simulate_rallies(physics, rallies, ball_speed, paddle_speed, seed=0, max_ticks=10000, aim_error=90):
+    """Play rallies between two ball-tracking paddles and return per-rally stats.
+
+    Each paddle aims at the ball with a random error, redrawn whenever it
+    hits, so rallies end. Returns (hits, ticks, winner) tuples.
+    """
+    rng = random.Random(seed)
+    results = []
+    for _ in range(rallies):
+        paddles = [[x, physics.height // 2 - physics.paddle_height // 2] for x in physics.paddle_x]
+        ball_pos, ball_vel = physics.serve(rng, ball_speed)
+        errors = [rng.uniform(-aim_error, aim_error) for _ in paddles]
+        hits, winner, tick = 0, None, 0
+        while winner is None and tick < max_ticks:
+            tick += 1
+            for index, paddle in enumerate(paddles):
+                track_ball(physics, paddle, ball_pos, paddle_speed, errors[index])
+            for event, value in physics.step(ball_pos, ball_vel, paddles):
+                if event == "paddle":
+                    hits += 1
+                    errors[value] = rng.uniform(-aim_error, aim_error)
+                elif event == "score":
+                    winner = value
+        results.append((hits, tick, winner))
+    return results
+
+
+def play_match_ticks(physics, players, ball_speed, rng, points=5, max_ticks=100000):
+    """play_match() stepped tick by tick through the full physics, to check it against.
+    A point longer than max_ticks is replayed."""
+    scores = [0, 0]
+    hits = ticks = 0
+    while max(scores) < points:
+        paddles = [[x, player.home] for x, player in zip(physics.paddle_x, players)]
+        ball_pos, ball_vel = physics.serve(rng, ball_speed)
+        for player in players:
+            player.reset()
+        for _ in range(max_ticks):
+            ticks += 1
+            events = physics.step(ball_pos, ball_vel, paddles)
+            hits += sum(1 for event, _ in events if event == "paddle")
+            if events and events[-1][0] == "score":
+                scores[events[-1][1] - 1] += 1
+                break
+            for player, paddle in zip(players, paddles):
+                player.update(paddle, ball_pos, ball_vel)
+    return scores[0], scores[1], hits, ticks
+
+
+def simulate_matches(physics, matches, ball_speed, paddle_speed, left="normal", right="normal",
+                     seed=0, points=5, full_physics=False):
+    """AI-vs-AI matches between two difficulties; returns (score1, score2, hits, ticks) tuples"""
+    rng = random.Random(seed)
+    players = [PaddleAI.for_difficulty(left, physics, physics.paddle_x[0], paddle_speed, rng),
+               PaddleAI.for_difficulty(right, physics, physics.paddle_x[1], paddle_speed, rng)]
+    play = play_match_ticks if full_physics else play_match
+    return [play(physics, players, ball_speed, rng, points) for _ in range(matches)]
+
+
+def report_matches(args, physics):
+    start = time.perf_counter()
+    results = simulate_matches(physics, args.matches, args.ball_speed, args.paddle_speed,
+                               args.left, args.right, args.seed, args.points, args.full_physics)
+    elapsed = time.perf_counter() - start
+
+    wins = sum(1 for score1, score2, _, _ in results if score1 > score2)
+    points = sum(score1 + score2 for score1, score2, _, _ in results)
+    hits = sum(h for _, _, h, _ in results)
+    ticks = sum(t for _, _, _, t in results)
+    print(f"{args.matches} matches to {args.points} in {elapsed:.2f}s "
+          f"({args.matches / elapsed:,.0f} matches/s, {ticks / 60 / elapsed:,.0f}x real time at 60 Hz)")
+    print(f"{args.left} (left) won {wins}, {args.right} (right) won {args.matches - wins}; "
+          f"{hits / points:.1f} hits and {ticks / points / 60:.1f}s of play per point")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate Ping Pong rallies headless for tuning")
+    parser.add_argument("--rallies", type=int, default=1000)
+    parser.add_argument("--ball-speed", type=float, default=7, help="Pixels per tick")
+    parser.add_argument("--paddle-speed", type=float, default=10, help="Pixels per tick")
+    parser.add_argument("--aim-error", type=float, default=90,
+                        help="Largest aiming error of the simulated players, in pixels")
+    parser.add_argument("--max-ticks", type=int, default=10000, help="Tick limit per rally")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--matches", type=int,
+                        help="Play this many AI-vs-AI matches instead of simulating rallies")
+    parser.add_argument("--left", choices=sorted(DIFFICULTIES), default="normal",
+                        help="Difficulty of the left AI")
+    parser.add_argument("--right", choices=sorted(DIFFICULTIES), default="normal",
+                        help="Difficulty of the right AI")
+    parser.add_argument("--points", type=int, default=5,
+                        help="Points needed to win a match (5, as in BallGame)")
+    parser.add_argument("--full-physics", action="store_true",
+                        help="Step matches through the full physics instead of hit to hit")
+    args = parser.parse_args()
+
+    # Same field as BallGame
+    physics = PongPhysics()
+    if args.matches:
+        report_matches(args, physics)
+        return
+    start = time.perf_counter()
+    results = simulate_rallies(physics, args.rallies, args.ball_speed, args.paddle_speed,
+                               seed=args.seed, max_ticks=args.max_ticks, aim_error=args.aim_error)
+    elapsed = time.perf_counter() - start
+
+    total_ticks = sum(ticks for _, ticks, _ in results)
+    hits = [h for h, _, _ in results]
+    wins = [sum(1 for _, _, winner in results if winner == player) for player in (1, 2)]
+    unfinished = sum(1 for _, _, winner in results if winner is None)
+    print(f"{args.rallies} rallies, {total_ticks} ticks in {elapsed:.2f}s "
+          f"({total_ticks / elapsed:,.0f} ticks/s, {total_ticks / 60 / elapsed:,.0f}x real time at 60 Hz)")
+    print(f"Mean hits per rally {sum(hits) / len(hits):.1f}, max {max(hits)}; "
+          f"points P1 {wins[0]}, P2 {wins[1]}, unfinished {unfinished}")
+
+
+if __name__ == "__main__":
+    main()
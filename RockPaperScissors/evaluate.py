@@ -0,0 +1,194 @@
+import argparse
+import os
+import random
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from RockPaperScissors.history import HistoryStore, read_csv, split_sessions
+from RockPaperScissors.predictor import MOVE_INDEX, MOVES, MovePredictor
+
+DEFAULT_HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_history.csv")
+
+
+class LegacyPredictor:
+    """The AI as it was before MovePredictor: counters the player's most
+    frequent move, counted from the fourth round on"""
+
+    def __init__(self):
+        self.move_history = []
+        self.pattern_weights = {"rock": 0.33, "paper": 0.33, "scissors": 0.33}
+
+    def choose(self, rng):
+        if len(self.move_history) < 3:
+            return rng.choice(MOVES)
+        predicted_move = max(self.pattern_weights, key=self.pattern_weights.get)
+        return MOVES[(MOVE_INDEX[predicted_move] + 1) % 3]
+
+    def update(self, player_move):
+        if len(self.move_history) >= 3:
+            self.pattern_weights[player_move] += 1
+        self.move_history.append(player_move)
+
+    def prediction(self):
+        if len(self.move_history) < 3:
+            return None
+        return MOVE_INDEX[max(self.pattern_weights, key=self.pattern_weights.get)]
+
+
+class RandomPredictor:
+    """Baseline: uniformly random moves"""
+
+    def choose(self, rng):
+        return rng.choice(MOVES)
+
+    def update(self, player_move):
+        pass
+
+    def prediction(self):
+        return None
+
+
+# Everything with the game's choose(rng) / update(player_move) interface
+PREDICTORS = {
+    "ensemble": MovePredictor,
+    "frequency": lambda: MovePredictor(orders=(0,)),
+    "order-2": lambda: MovePredictor(orders=(2,)),
+    "legacy": LegacyPredictor,
+    "random": RandomPredictor,
+}
+
+
+# Scripted players for sessions beyond the recorded ones. Each takes the
+# round number, the previous (player, AI) move indices (None in round 0)
+# and a random generator, and returns a move index.
+BOTS = {
+    "random": lambda i, last, rng: rng.randrange(3),
+    "rock-heavy": lambda i, last, rng: 0 if rng.random() < 0.5 else rng.randrange(3),
+    "cycle": lambda i, last, rng: i % 3,
+    "beat-last": lambda i, last, rng: rng.randrange(3) if last is None else (last[1] + 1) % 3,
+    "repeat-win": lambda i, last, rng: rng.randrange(3) if last is None or (last[0] - last[1]) % 3 != 1
+    else last[0],
+    "phases": lambda i, last, rng: (i // 50) % 3 if i % 2 else rng.randrange(3),
+}
+
+
+def load_sessions(paths):
+    """Recorded player move sequences from game_history.csv files and history directories"""
+    sessions = []
+    for path in paths:
+        if os.path.isdir(path):
+            store = HistoryStore(path)
+            rounds = {name: np.asarray(store.column(name)) for name in ('player', 'round_number')}
+        else:
+            rounds = read_csv(path)
+        for session in split_sessions(rounds['round_number']):
+            sessions.append(("recorded", path, rounds['player'][session]))
+    return sessions
+
+
+def play_session(predictor_name, session, seed):
+    """Play one session against a predictor; returns its counts and the time taken"""
+    kind, name, moves = session
+    rng = random.Random(seed)
+    bot_rng = random.Random(seed + 1)
+    predictor = PREDICTORS[predictor_name]()
+    rounds = len(moves) if kind == "recorded" else moves
+    bot = BOTS.get(name)
+    wins = ties = predicted = correct = 0
+    last = None
+
+    start = time.perf_counter()
+    for i in range(rounds):
+        ai = MOVE_INDEX[predictor.choose(rng)]
+        guess = predictor.prediction()
+        player = int(moves[i]) if kind == "recorded" else bot(i, last, bot_rng)
+        predictor.update(MOVES[player])
+        outcome = (ai - player) % 3  # 1: AI wins, 2: AI loses
+        wins += outcome == 1
+        ties += outcome == 0
+        if guess is not None:
+            predicted += 1
+            correct += guess == player
+        last = (player, ai)
+    elapsed = time.perf_counter() - start
+    return predictor_name, rounds, wins, ties, predicted, correct, elapsed
+
+
+def measure_memory(predictor_name, rounds, seed=0):
+    """Memory the predictor holds after rounds rounds against a random player, in bytes"""
+    rng = random.Random(seed)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    predictor = PREDICTORS[predictor_name]()
+    for _ in range(rounds):
+        predictor.choose(rng)
+        predictor.update(rng.choice(MOVES))
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used
+
+
+def evaluate(predictor_names, sessions, seed=0, jobs=None):
+    """Play every session against every predictor on a process pool.
+
+    Returns {predictor: [rounds, AI wins, ties, rounds with a prediction,
+    correct predictions, seconds]}.
+    """
+    tasks = [(name, session, seed + 2 * index)
+             for name in predictor_names for index, session in enumerate(sessions)]
+    totals = {name: [0, 0, 0, 0, 0, 0.0] for name in predictor_names}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        chunksize = max(1, len(tasks) // (4 * (jobs or os.cpu_count() or 1)))
+        for name, *counts in pool.map(play_session, *zip(*tasks), chunksize=chunksize):
+            totals[name] = [total + count for total, count in zip(totals[name], counts)]
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate Rock Paper Scissors AIs offline")
+    parser.add_argument("paths", nargs="*",
+                        help="game_history.csv files or history directories (default: game_history.csv)")
+    parser.add_argument("--predictors", default=",".join(PREDICTORS),
+                        help="Comma-separated predictors: " + ", ".join(PREDICTORS))
+    parser.add_argument("--bots", type=int, default=0,
+                        help="Also play this many sessions against each scripted player: "
+                             + ", ".join(BOTS))
+    parser.add_argument("--rounds", type=int, default=1000, help="Rounds per scripted session")
+    parser.add_argument("--jobs", type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--memory-rounds", type=int, default=100000,
+                        help="Rounds played when measuring each predictor's memory")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    names = args.predictors.split(",")
+    for name in names:
+        if name not in PREDICTORS:
+            parser.error(f"unknown predictor {name}")
+    sessions = load_sessions(args.paths or ([] if args.bots else [DEFAULT_HISTORY]))
+    sessions += [("bot", bot, args.rounds) for bot in BOTS for _ in range(args.bots)]
+    if not sessions:
+        parser.error("no sessions to play")
+
+    start = time.perf_counter()
+    totals = evaluate(names, sessions, args.seed, args.jobs)
+    elapsed = time.perf_counter() - start
+    total_rounds = sum(counts[0] for counts in totals.values())
+    print(f"{len(sessions)} sessions x {len(names)} predictors, {total_rounds} rounds in {elapsed:.2f}s "
+          f"({total_rounds / elapsed:,.0f} rounds/s)")
+
+    print(f"{'predictor':>10} {'AI win':>7} {'tie':>6} {'AI loss':>7} {'accuracy':>8} "
+          f"{'rounds/s':>10} {'memory':>9}")
+    for name in names:
+        rounds, wins, ties, predicted, correct, seconds = totals[name]
+        losses = rounds - wins - ties
+        accuracy = f"{correct / predicted:8.1%}" if predicted else f"{'-':>8}"
+        memory = measure_memory(name, args.memory_rounds, args.seed) / 1024
+        print(f"{name:>10} {wins / rounds:7.1%} {ties / rounds:6.1%} {losses / rounds:7.1%} {accuracy} "
+              f"{rounds / seconds:10,.0f} {memory:7.1f}KB")
+
+
+if __name__ == "__main__":
+    main()
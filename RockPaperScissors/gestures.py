@@ -0,0 +1,158 @@
+import os
+
+import numpy as np
+
+from utils.hand_poses import LABELS
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gesture_model.npz")
+# Accuracy on recorded webcam hands a model needs before the game uses it in
+# place of rule_gesture; accuracy on synthetic hands does not count, as they
+# come from the generator the model was trained on
+MIN_VALIDATION = 0.9
+
+# Landmark chains from the palm to each fingertip (MediaPipe hand landmark indices)
+FINGERS = [
+    [1, 2, 3, 4],  # Thumb
+    [0, 5, 6, 7, 8],  # Index
+    [0, 9, 10, 11, 12],  # Middle
+    [0, 13, 14, 15, 16],  # Ring
+    [0, 17, 18, 19, 20],  # Pinky
+]
+# Joints whose bend is measured: (a, b, c) for the angle between a->b and b->c
+JOINTS = np.array([(chain[i], chain[i + 1], chain[i + 2])
+                   for chain in FINGERS for i in range(len(chain) - 2)])
+# Landmark pairs whose distance is measured: fingertips to the wrist and to
+# their finger's base, neighbouring fingertips, and the thumb tip to the
+# index and pinky bases
+DISTANCES = np.array([(4, 0), (8, 0), (12, 0), (16, 0), (20, 0),
+                      (4, 2), (8, 5), (12, 9), (16, 13), (20, 17),
+                      (4, 8), (8, 12), (12, 16), (16, 20),
+                      (4, 5), (4, 17)])
+FEATURE_COUNT = len(JOINTS) + len(DISTANCES)
+
+# Every vector the features need, gathered in one indexing operation: the two
+# bones at each joint, each measured pair, and the palm (wrist to middle base)
+VECTOR_STARTS = np.concatenate([JOINTS[:, 0], JOINTS[:, 1], DISTANCES[:, 1], [0]])
+VECTOR_ENDS = np.concatenate([JOINTS[:, 1], JOINTS[:, 2], DISTANCES[:, 0], [9]])
+
+
+def landmark_features(landmarks):
+    """Features of (..., 21, 3) hand landmarks, as (..., FEATURE_COUNT) float32.
+
+    The cosine of every finger joint's bend, then distances between key
+    landmarks measured in palm lengths (wrist to middle finger base), so
+    neither where the hand is, how far from the camera, nor how it is
+    turned matters.
+    """
+    points = np.asarray(landmarks, dtype=np.float32)
+    vectors = points[..., VECTOR_ENDS, :] - points[..., VECTOR_STARTS, :]
+    lengths = np.sqrt(np.einsum('...ij,...ij->...i', vectors, vectors)) + 1e-6
+
+    joints = len(JOINTS)
+    first, second = vectors[..., :joints, :], vectors[..., joints:2 * joints, :]
+    bends = np.einsum('...ij,...ij->...i', first, second) / (
+        lengths[..., :joints] * lengths[..., joints:2 * joints])
+    distances = lengths[..., 2 * joints:-1] / lengths[..., -1:]
+    return np.concatenate([bends, distances], axis=-1)
+
+
+def rule_gesture(hand):
+    """The thumb and index tip rule the game used before the model: paper
+    when the tips are level, rock when the thumb tip is higher, scissors
+    otherwise"""
+    thumb_y, index_y = hand[4, 1], hand[8, 1]
+    if abs(thumb_y - index_y) < 0.1:
+        return "paper"
+    return "rock" if thumb_y < index_y else "scissors"
+
+
+class GestureClassifier:
+    """Classifies hand landmarks as rock, paper, scissors or nothing.
+
+    A multinomial logistic regression over landmark_features(), trained
+    with scikit-learn (RockPaperScissors/train_gestures.py) and stored as
+    plain arrays: the feature scaling, weights and biases. Prediction is a
+    few NumPy operations, so scikit-learn is only needed for training and
+    one frame costs tens of microseconds. Below min_confidence the hand
+    counts as no gesture. validation is the accuracy measured on recorded
+    hands kept out of training, None until measured.
+    """
+
+    def __init__(self, mean, scale, weights, bias, min_confidence=0.6, validation=None):
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.min_confidence = min_confidence
+        self.validation = validation
+        # The scaling folded into the weights, for one matrix product per frame
+        self.scaled_weights = (self.weights / self.scale).T
+        self.scaled_bias = self.bias - self.scaled_weights.T @ self.mean
+
+    @classmethod
+    def load(cls, path=MODEL_PATH, min_confidence=0.6):
+        with np.load(path) as data:
+            validation = float(data['validation']) if 'validation' in data.files else None
+            return cls(data['mean'], data['scale'], data['weights'], data['bias'], min_confidence,
+                       validation)
+
+    def save(self, path=MODEL_PATH):
+        extra = {} if self.validation is None else {'validation': self.validation}
+        np.savez(path, mean=self.mean, scale=self.scale, weights=self.weights, bias=self.bias, **extra)
+
+    def validated(self):
+        """Whether the model has been checked on recorded hands and is good enough to play with"""
+        return self.validation is not None and self.validation >= MIN_VALIDATION
+
+    def probabilities(self, features):
+        """(N, FEATURE_COUNT) features to (N, 4) probabilities, in LABELS order"""
+        scores = np.exp(self.scores(features))
+        return scores / scores.sum(axis=-1, keepdims=True)
+
+    def scores(self, features):
+        # Log-probabilities up to a constant, shifted so the best is 0
+        scores = features @ self.scaled_weights + self.scaled_bias
+        return scores - scores.max(axis=-1, keepdims=True)
+
+    def predict(self, landmarks):
+        """Label indices for (N, 21, 3) landmarks"""
+        scores = self.scores(landmark_features(landmarks))
+        confidence = 1.0 / np.exp(scores).sum(axis=-1)
+        return np.where(confidence >= self.min_confidence, scores.argmax(axis=-1), 0)
+
+    def classify(self, hand):
+        """The gesture name of one hand's (21, 3) landmarks, or None"""
+        scores = self.scores(landmark_features(hand))
+        if 1.0 / np.exp(scores).sum() < self.min_confidence:
+            return None
+        return LABELS[int(scores.argmax())]
+
+
+class GestureVoter:
+    """Majority vote over the last window per-frame labels.
+
+    A ring buffer of label indices with a running count per label, so
+    push() is O(1). A label wins once it has at least min_votes of the
+    window; until then there is no decision. It starts full of label 0.
+    """
+
+    def __init__(self, window=12, min_votes=8, labels=len(LABELS)):
+        self.window = window
+        self.min_votes = min_votes
+        self.labels = labels
+        self.reset()
+
+    def reset(self):
+        self.buffer = [0] * self.window
+        self.counts = [0] * self.labels
+        self.counts[0] = self.window
+        self.index = 0
+
+    def push(self, label):
+        """Add a frame's label; returns the winning label index, or None"""
+        self.counts[self.buffer[self.index]] -= 1
+        self.buffer[self.index] = label
+        self.counts[label] += 1
+        self.index = (self.index + 1) % self.window
+        best = max(range(self.labels), key=self.counts.__getitem__)
+        return best if self.counts[best] >= self.min_votes else None
@@ -0,0 +1,262 @@
+import argparse
+import atexit
+import csv
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from RockPaperScissors.predictor import MOVE_INDEX, MOVES
+
+HISTORY_DIR = "rps_history"
+
+# One round, as logged and as stored column by column. Moves are indices
+# into MOVES; result is from the player's side: 1 win, 0 tie, -1 loss.
+ROUND_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('player', 'u1'),
+    ('computer', 'u1'),
+    ('result', 'i1'),
+    ('player_score', '<i4'),
+    ('computer_score', '<i4'),
+    ('round_number', '<i4'),
+    ('streak', '<i4'),
+])
+
+RESULTS = {"Win": 1, "Tie": 0, "Lose": -1}
+
+
+def read_csv(path):
+    """Rounds of a game_history.csv file as a ROUND_DTYPE array.
+
+    Columns: timestamp (YYYY-MM-DD HH:MM:SS), player_choice,
+    computer_choice, result (Win, Tie or Lose), player_score,
+    computer_score, round_number, streak.
+    """
+    rows = []
+    with open(path, newline="") as file:
+        for row in csv.DictReader(file):
+            rows.append((time.mktime(time.strptime(row['timestamp'], "%Y-%m-%d %H:%M:%S")),
+                         MOVE_INDEX[row['player_choice']], MOVE_INDEX[row['computer_choice']],
+                         RESULTS[row['result']], int(row['player_score']),
+                         int(row['computer_score']), int(row['round_number']),
+                         int(row['streak'])))
+    return np.array(rows, dtype=ROUND_DTYPE)
+
+
+def split_sessions(round_numbers):
+    """Slices of the rounds making up each session (round numbers start again)"""
+    starts = np.flatnonzero(np.diff(round_numbers) <= 0) + 1
+    bounds = np.r_[0, starts, len(round_numbers)]
+    return [slice(start, end) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
+
+class RoundLogger:
+    """Appends played rounds to the history log from a background thread.
+
+    log() only puts the round on a queue, so the game thread never waits
+    for the disk. The thread writes rounds in batches of up to batch
+    records, at least every interval seconds, as raw ROUND_DTYPE records
+    to rounds.log; close() (also run at exit) writes what is left and
+    compacts the log into the HistoryStore's columns.
+    """
+
+    def __init__(self, directory=HISTORY_DIR, batch=256, interval=2.0):
+        self.store = HistoryStore(directory)
+        self.batch = batch
+        self.interval = interval
+        self.rounds = queue.Queue()
+        self.written = 0
+        self.thread = threading.Thread(target=self.write_loop, name="rps-history", daemon=True)
+        self.thread.start()
+        # Until closed, so the exit handlers do not pile up and hold on to
+        # every logger and its store
+        atexit.register(self.close)
+
+    def log(self, player, computer, result, player_score, computer_score, round_number, streak,
+            timestamp=None):
+        """Queue a round; moves are names from MOVES and result 1, 0 or -1"""
+        self.rounds.put((time.time() if timestamp is None else timestamp,
+                         MOVE_INDEX[player], MOVE_INDEX[computer], result,
+                         player_score, computer_score, round_number, streak))
+
+    def write_loop(self):
+        buffer = []
+        flush_at = time.monotonic() + self.interval
+        while True:
+            try:
+                item = self.rounds.get(timeout=max(0.0, flush_at - time.monotonic()))
+            except queue.Empty:
+                item = ()
+            if item:
+                buffer.append(item)
+            if buffer and (item is None or len(buffer) >= self.batch or time.monotonic() >= flush_at):
+                self.store.append_log(np.array(buffer, dtype=ROUND_DTYPE))
+                self.written += len(buffer)
+                buffer = []
+            if time.monotonic() >= flush_at:
+                flush_at = time.monotonic() + self.interval
+            if item is None:
+                break
+
+    def close(self):
+        """Write the queued rounds and compact the log"""
+        if self.thread is None:
+            return
+        atexit.unregister(self.close)
+        self.rounds.put(None)
+        self.thread.join()
+        self.thread = None
+        self.store.compact()
+
+
+class HistoryStore:
+    """Every round ever played, one binary file per column.
+
+    Columns are raw little-endian arrays (columns/<name>.bin) opened with
+    np.memmap, so loading costs nothing up front however many rounds there
+    are. New rounds go to rounds.log first and are appended to the columns
+    by compact().
+    """
+
+    PENDING_SUFFIX = ".pending"
+
+    def __init__(self, directory=HISTORY_DIR):
+        self.directory = directory
+        self.log_path = os.path.join(directory, "rounds.log")
+        self.columns_dir = os.path.join(directory, "columns")
+
+    def column_path(self, name):
+        return os.path.join(self.columns_dir, name + ".bin")
+
+    def append_log(self, rounds):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.log_path, "ab") as file:
+            file.write(rounds.tobytes())
+
+    def read_log(self, path=None):
+        path = path or self.log_path
+        if not os.path.exists(path):
+            return np.zeros(0, dtype=ROUND_DTYPE)
+        # A record cut short by a crash is dropped
+        with open(path, "rb") as file:
+            data = file.read()
+        usable = len(data) - len(data) % ROUND_DTYPE.itemsize
+        return np.frombuffer(data[:usable], dtype=ROUND_DTYPE)
+
+    def append(self, rounds):
+        """Append a ROUND_DTYPE array to the columns"""
+        if not len(rounds):
+            return
+        os.makedirs(self.columns_dir, exist_ok=True)
+        for name in ROUND_DTYPE.names:
+            with open(self.column_path(name), "ab") as file:
+                file.write(np.ascontiguousarray(rounds[name]).tobytes())
+
+    def truncate(self, count):
+        """Cut every column back to its first count rounds"""
+        for name in ROUND_DTYPE.names:
+            path = self.column_path(name)
+            size = count * ROUND_DTYPE[name].itemsize
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                os.truncate(path, size)
+
+    def pending_log(self):
+        """Path of a log left mid-compaction, or None"""
+        if not os.path.isdir(self.directory):
+            return None
+        for name in os.listdir(self.directory):
+            if name.startswith("rounds.") and name.endswith(self.PENDING_SUFFIX):
+                return os.path.join(self.directory, name)
+        return None
+
+    def compact(self):
+        """Move the logged rounds into the columns; returns how many there were.
+
+        The log is first renamed to rounds.<count>.pending, count being the
+        number of rounds in the columns before its own. If a crash cuts the
+        move short, the next compact() cuts the columns back to count and
+        appends the pending rounds again, so none are lost or doubled.
+        """
+        moved = 0
+        while True:
+            pending = self.pending_log()
+            if pending is None:
+                if not os.path.exists(self.log_path):
+                    return moved
+                pending = os.path.join(self.directory, f"rounds.{len(self)}{self.PENDING_SUFFIX}")
+                os.replace(self.log_path, pending)
+            start = int(os.path.basename(pending).split(".")[1])
+            rounds = self.read_log(pending)
+            self.truncate(start)
+            self.append(rounds)
+            os.remove(pending)
+            moved += len(rounds)
+
+    def __len__(self):
+        lengths = [os.path.getsize(self.column_path(name)) // ROUND_DTYPE[name].itemsize
+                   if os.path.exists(self.column_path(name)) else 0
+                   for name in ROUND_DTYPE.names]
+        return min(lengths)
+
+    def column(self, name):
+        """One column of every compacted round, memory-mapped (read-only)"""
+        count = len(self)
+        if count == 0:
+            return np.zeros(0, dtype=ROUND_DTYPE[name])
+        return np.memmap(self.column_path(name), dtype=ROUND_DTYPE[name], mode="r", shape=(count,))
+
+    def load(self):
+        """Every compacted round as a dict of memory-mapped columns"""
+        return {name: self.column(name) for name in ROUND_DTYPE.names}
+
+    def stats(self):
+        """Round count, the player's win/tie/loss rates and move frequencies"""
+        result = self.column('result')
+        player = self.column('player')
+        count = len(result)
+        outcomes = np.bincount(result.astype(np.int64) + 1, minlength=3) / max(count, 1)
+        moves = np.bincount(player, minlength=3) / max(count, 1)
+        return {
+            'rounds': count,
+            'win': float(outcomes[2]), 'tie': float(outcomes[1]), 'loss': float(outcomes[0]),
+            'moves': {move: float(share) for move, share in zip(MOVES, moves)},
+        }
+
+    def import_csv(self, path):
+        """Append the rounds of a game_history.csv file; returns how many there were"""
+        rounds = read_csv(path)
+        # Finish any interrupted compaction first, which would cut these off
+        self.compact()
+        self.append(rounds)
+        return len(rounds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rock Paper Scissors round history")
+    parser.add_argument("--dir", default=HISTORY_DIR, help="History directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    load = commands.add_parser("import", help="Import a game_history.csv file")
+    load.add_argument("path")
+    commands.add_parser("compact", help="Move logged rounds into the columns")
+    commands.add_parser("stats", help="Show statistics over every round")
+    args = parser.parse_args()
+
+    store = HistoryStore(args.dir)
+    if args.command == "import":
+        print(f"Imported {store.import_csv(args.path)} rounds from {args.path}")
+    elif args.command == "compact":
+        print(f"Compacted {store.compact()} logged rounds")
+    else:
+        start = time.perf_counter()
+        stats = store.stats()
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{stats['rounds']} rounds (read in {elapsed:.1f} ms): player won {stats['win']:.1%}, "
+              f"tied {stats['tie']:.1%}, lost {stats['loss']:.1%}")
+        print("Player moves: " + ", ".join(f"{move} {share:.1%}" for move, share in stats['moves'].items()))
+
+
+if __name__ == "__main__":
+    main()
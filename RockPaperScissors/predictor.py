@@ -0,0 +1,151 @@
+import numpy as np
+
+MOVES = ["rock", "paper", "scissors"]
+# Index of each move; the move beating move i is (i + 1) % 3
+MOVE_INDEX = {move: index for index, move in enumerate(MOVES)}
+
+
+class NGramModel:
+    """Predicts the player's next move from their last order moves.
+
+    Keeps one row of counts for each of the 3**order possible contexts, so
+    memory is fixed by the order; the context is kept as a base-3 number
+    and updated in place. Counts decay by decay every time their row is
+    updated, so the model follows a player who changes habits.
+    """
+
+    def __init__(self, order, decay=0.98):
+        self.order = order
+        self.decay = decay
+        self.size = 3 ** order
+        self.counts = [[0.0, 0.0, 0.0] for _ in range(self.size)]
+        self.context = 0
+        self.seen = 0  # Moves seen, up to order
+
+    def predict(self):
+        """Most likely next move index, or None if this context has not come up"""
+        if self.seen < self.order:
+            return None
+        row = self.counts[self.context]
+        best = max(row)
+        return row.index(best) if best > 0 else None
+
+    def update(self, move):
+        if self.seen >= self.order:
+            row = self.counts[self.context]
+            for i in range(3):
+                row[i] *= self.decay
+            row[move] += 1
+        else:
+            self.seen += 1
+        self.context = (self.context * 3 + move) % self.size
+
+    def fit(self, moves):
+        """Start over from a whole history of move indices at once.
+
+        Gives the same counts as calling update() for every move, with
+        NumPy: each occurrence of a context is weighted by decay to the
+        power of how many times the context came up after it.
+        """
+        moves = np.asarray(moves, dtype=np.int32)
+        counts = np.zeros(self.size * 3)
+        if len(moves) > self.order:
+            # Each move with the base-3 code of the order moves before it
+            following = moves[self.order:]
+            contexts = np.zeros(len(following), dtype=np.int32)
+            for k in range(self.order):
+                contexts = contexts * 3 + moves[k:k + len(following)]
+            if self.size < 2 ** 15:
+                contexts = contexts.astype(np.int16)  # Sorted much faster (radix sort)
+
+            # Occurrences of the same context, in order: later ones make the earlier decay
+            order = np.argsort(contexts, kind='stable')
+            grouped = contexts[order]
+            first = np.r_[True, grouped[1:] != grouped[:-1]]
+            starts = np.flatnonzero(first)
+            group = np.cumsum(first) - 1
+            sizes = np.diff(np.r_[starts, len(grouped)])
+            later = sizes[group] - 1 - (np.arange(len(grouped)) - starts[group])
+            weights = np.exp(later * np.log(self.decay))
+            counts = np.bincount(grouped.astype(np.int32) * 3 + following[order], weights, self.size * 3)
+        self.counts = counts.reshape(self.size, 3).tolist()
+        self.seen = min(len(moves), self.order)
+        self.context = 0
+        for move in moves[len(moves) - self.seen:]:
+            self.context = (self.context * 3 + int(move)) % self.size
+
+
+class MovePredictor:
+    """The RPS AI: an ensemble of NGramModels of several orders.
+
+    Each model backs three strategies: play what beats its prediction,
+    what beats that (in case the player expects the first) or the
+    prediction itself. Every strategy is scored on every round with a
+    decaying tally (+1 win, -1 loss), and choose() plays the move of the
+    one currently winning, or a random move while none is ahead. Update
+    and choice cost O(models) per round and memory stays fixed, however
+    long the session.
+    """
+
+    def __init__(self, orders=(0, 1, 2, 3, 4), decay=0.98, score_decay=0.9):
+        self.models = [NGramModel(order, decay) for order in orders]
+        self.score_decay = score_decay
+        self.scores = [[0.0, 0.0, 0.0] for _ in self.models]
+        self.leader = None  # (model index, shift) of the last strategy played
+        self.planned = None  # Strategy moves worked out by the last choose()
+
+    def strategy_moves(self):
+        """Move index of every strategy, per model (None for models without a prediction)"""
+        moves = []
+        for model in self.models:
+            predicted = model.predict()
+            moves.append(None if predicted is None else
+                         [(predicted + 1 + shift) % 3 for shift in range(3)])
+        return moves
+
+    def warm_up(self, moves):
+        """Train the models on a past history of the player's move indices
+        (the strategies' scores still start from nothing)"""
+        for model in self.models:
+            model.fit(moves)
+
+    def choose(self, rng):
+        """The AI's move for the next round"""
+        best, move, self.leader = 0.0, None, None
+        self.planned = self.strategy_moves()
+        for index, model_moves in enumerate(self.planned):
+            if model_moves is None:
+                continue
+            for shift, score in enumerate(self.scores[index]):
+                if score > best:
+                    best, move, self.leader = score, model_moves[shift], (index, shift)
+        return rng.choice(MOVES) if move is None else MOVES[move]
+
+    def update(self, player_move):
+        """Score the strategies against the player's move, then learn it"""
+        player = MOVE_INDEX[player_move]
+        planned = self.planned or self.strategy_moves()
+        self.planned = None
+        for scores, model_moves in zip(self.scores, planned):
+            if model_moves is None:
+                continue
+            for shift, move in enumerate(model_moves):
+                # +1 if move beats the player's, -1 if it loses, 0 for a tie
+                outcome = (move - player + 1) % 3 - 1
+                scores[shift] = scores[shift] * self.score_decay + outcome
+        for model in self.models:
+            model.update(player)
+
+    def prediction(self):
+        """The player move index the last choice was countering, or None if it was random"""
+        if self.leader is None or not self.planned:
+            return None
+        index, shift = self.leader
+        return (self.planned[index][shift] - 1) % 3
+
+    def describe(self):
+        """Which strategy the last choice came from, for display"""
+        if self.leader is None:
+            return "random"
+        index, shift = self.leader
+        return f"order {self.models[index].order}" + ("" if shift == 0 else f" +{shift}")
@@ -1,16 +1,23 @@
 import pygame
 import cv2
-import mediapipe as mp
 import numpy as np
 from utils.sound_manager import SoundManager
-import math
+from utils.particles import ParticleSystem
+from utils.render_cache import RenderCache
+from utils.hand_tracker import get_hand_tracker
+from utils.replay import InputRecorder, new_seed, recording_path
 import random
+from collections import deque
+from RockPaperScissors.predictor import MovePredictor
+from RockPaperScissors.gestures import GestureClassifier, GestureVoter, rule_gesture
 
 class RockPaperScissors:
     def __init__(self):
         pygame.init()
         self.WIDTH = 1280
         self.HEIGHT = 720
+        # Glow sprites and overlays, built once and reused every frame
+        self.render_cache = RenderCache()
         self.init_display()
         
         # Initialize fonts
@@ -37,24 +44,37 @@ class RockPaperScissors:
         self.ai_choice = None
         self.round_result = None
         self.frame = None
-        self.particles = []
-        self.move_history = []
-        self.pattern_weights = {"rock": 0.33, "paper": 0.33, "scissors": 0.33}
-        
-        # Initialize MediaPipe
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.7
-        )
-        
-        # Initialize camera
-        self.cap = cv2.VideoCapture(0)
-        if not self.cap.isOpened():
-            print("Error: Could not open camera")
-            self.running = False
+        self.particles = ParticleSystem()
+        # The player's recent moves; the AI keeps its own fixed-size statistics
+        self.HISTORY_LENGTH = 100
+        self.move_history = deque(maxlen=self.HISTORY_LENGTH)
+        self.predictor = MovePredictor()
+        self.rounds = 0
+        self.streak = 0  # Rounds the player has won in a row
+        
+        # Rounds played live are logged to the history (see open_history);
+        # past rounds warm up the AI
+        self.round_log = None
+        self.WARM_UP_ROUNDS = 100000
+        
+        # Each tracking result is classified, and a throw counts once one gesture
+        # has most of the recent votes; the hand has to leave the camera (no
+        # gesture winning the vote) before the next throw
+        self.GESTURES = [None, "rock", "paper", "scissors"]
+        self.RESET_RECORD = 255  # Recorded in place of a gesture when R resets the scores
+        # The trained model replaces the thumb/index rule only once it has been
+        # validated on recorded hands (python -m RockPaperScissors.train_gestures validate)
+        classifier = GestureClassifier.load()
+        self.gesture_classifier = classifier if classifier.validated() else None
+        self.gesture_votes = GestureVoter(window=12, min_votes=8)
+        self.throw_ready = True
+        
+        # Gameplay randomness has its own generator so sessions can be replayed
+        self.rng = random.Random()
+        self.recorder = None
+        
+        # Shared hand tracker, subscribed to when the game starts running
+        self.hand_input = None
         
         # Load sound manager
         self.sound_manager = SoundManager()
@@ -63,62 +83,39 @@ class RockPaperScissors:
         """Initialize or reinitialize the display"""
         self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
         pygame.display.set_caption("Rock Paper Scissors")
+        # Cached sprites were converted for the old display
+        self.render_cache.clear()
+    
+    def open_camera(self):
+        """Subscribe to the shared hand tracker, opening the camera on first use"""
+        self.hand_input = get_hand_tracker().subscribe()
+        if not self.hand_input.is_opened():
+            print("Error: Could not open camera")
+            self.running = False
+    
+    def open_history(self):
+        """Start logging rounds and train the AI on the player's past moves"""
+        from RockPaperScissors.history import RoundLogger
+        
+        self.round_log = RoundLogger()
+        past_moves = self.round_log.store.column('player')
+        self.predictor.warm_up(past_moves[-self.WARM_UP_ROUNDS:])
     
     def cleanup(self):
         """Clean up resources"""
-        if self.cap is not None:
-            self.cap.release()
-        if self.hands is not None:
-            self.hands.close()
+        self.stop_recording()
+        if self.round_log:
+            self.round_log.close()
+            self.round_log = None
         cv2.destroyAllWindows()
     
-    def create_particles(self, x, y, color):
-        for _ in range(10):
-            particle = {
-                "x": x,
-                "y": y,
-                "dx": np.random.uniform(-5, 5),
-                "dy": np.random.uniform(-5, 5),
-                "lifetime": 30,
-                "color": color,
-                "size": np.random.uniform(2, 6)
-            }
-            self.particles.append(particle)
-
-    def update_particles(self):
-        for particle in self.particles[:]:
-            particle["x"] += particle["dx"]
-            particle["y"] += particle["dy"]
-            particle["lifetime"] -= 1
-            if particle["lifetime"] <= 0:
-                self.particles.remove(particle)
-
-    def draw_particles(self):
-        for particle in self.particles:
-            alpha = min(255, particle["lifetime"] * 8)
-            color = (*particle["color"][:3], alpha)
-            surf = pygame.Surface((particle["size"], particle["size"]), pygame.SRCALPHA)
-            pygame.draw.circle(surf, color, (particle["size"]/2, particle["size"]/2), particle["size"]/2)
-            self.screen.blit(surf, (particle["x"], particle["y"]))
-
     def draw_tutorial(self):
         # Draw semi-transparent overlay
-        overlay = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
-        
-        # Draw tutorial title
-        title_text = "Rock Paper Scissors with AI!"
-        title_surf = self.font.render(title_text, True, self.PURPLE)
-        title_rect = title_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//3))
-        
-        # Add glow to title
-        for i in range(3):
-            glow_surf = self.font.render(title_text, True, (*self.PURPLE, 100-i*30))
-            glow_rect = glow_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//3))
-            self.screen.blit(glow_surf, glow_rect.inflate(i*4, i*4))
+        self.screen.blit(self.render_cache.panel((self.WIDTH, self.HEIGHT), (0, 0, 0, 180)), (0, 0))
         
-        self.screen.blit(title_surf, title_rect)
+        # Draw tutorial title with glow
+        title_surf = self.render_cache.glow_text(self.font, "Rock Paper Scissors with AI!", self.PURPLE)
+        self.screen.blit(title_surf, title_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//3)))
         
         # Draw instructions
         instructions = [
@@ -140,25 +137,11 @@ class RockPaperScissors:
 
     def draw_ui_overlay(self):
         # Draw top UI bar
-        overlay = pygame.Surface((self.WIDTH, 80), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.render_cache.panel((self.WIDTH, 80), (0, 0, 0, 180)), (0, 0))
         
         # Draw scores with glow
         score_text = f"You: {self.player_score}  AI: {self.ai_score}"
-        shadow_surf = self.font.render(score_text, True, (0, 0, 0))
-        text_surf = self.font.render(score_text, True, self.WHITE)
-        
-        # Add glow effect
-        glow_surf = pygame.Surface(text_surf.get_size(), pygame.SRCALPHA)
-        glow_surf.blit(text_surf, (0, 0))
-        for i in range(3):
-            pygame.draw.rect(glow_surf, (*self.PURPLE, 50-i*15), 
-                           glow_surf.get_rect().inflate(i*2, i*2), 1)
-        
-        self.screen.blit(shadow_surf, (22, 22))
-        self.screen.blit(glow_surf, (20, 20))
-        self.screen.blit(text_surf, (20, 20))
+        self.screen.blit(self.render_cache.framed_text(self.font, score_text, self.WHITE, self.PURPLE), (20, 20))
         
         # Draw game controls with icons
         controls = [
@@ -179,22 +162,11 @@ class RockPaperScissors:
 
     def draw_pause_menu(self):
         # Draw semi-transparent overlay
-        overlay = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
-        
-        # Draw pause menu title
-        title_text = "Game Paused"
-        title_surf = self.font.render(title_text, True, self.WHITE)
-        title_rect = title_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2 - 60))
+        self.screen.blit(self.render_cache.panel((self.WIDTH, self.HEIGHT), (0, 0, 0, 180)), (0, 0))
         
-        # Add glow effect to title
-        for i in range(3):
-            glow_surf = self.font.render(title_text, True, (*self.PURPLE, 100-i*30))
-            glow_rect = glow_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2 - 60))
-            self.screen.blit(glow_surf, glow_rect.inflate(i*4, i*4))
-        
-        self.screen.blit(title_surf, title_rect)
+        # Draw pause menu title with glow
+        title_surf = self.render_cache.glow_text(self.font, "Game Paused", self.WHITE, self.PURPLE)
+        self.screen.blit(title_surf, title_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2 - 60)))
         
         # Draw menu options
         options = [
@@ -220,24 +192,24 @@ class RockPaperScissors:
         player_rect = player_surf.get_rect(center=(self.WIDTH//4, self.HEIGHT//2))
         self.screen.blit(player_surf, player_rect)
         
-        # Draw VS text with glow
-        vs_text = "VS"
-        vs_surf = self.title_font.render(vs_text, True, self.PURPLE)
-        vs_rect = vs_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2))
-        
-        # Add pulsing glow to VS
-        pulse = math.sin(pygame.time.get_ticks() * 0.003) * 0.5 + 0.5
-        for i in range(3):
-            glow_surf = self.title_font.render(vs_text, True, (*self.PURPLE, int(100*pulse-i*30)))
-            glow_rect = glow_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2))
-            self.screen.blit(glow_surf, glow_rect.inflate(i*4, i*4))
+        # Draw VS text with a pulsing glow
+        alphas = self.render_cache.pulse_alphas(pygame.time.get_ticks(), 0.003)
+        vs_surf = self.render_cache.glow_text(self.title_font, "VS", self.PURPLE, alphas=alphas)
+        self.screen.blit(vs_surf, vs_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2)))
         
-        self.screen.blit(vs_surf, vs_rect)
+        # Draw the last round's result
+        if self.round_result:
+            result_surf = self.font.render(self.round_result, True, self.YELLOW)
+            result_rect = result_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2 + 70))
+            self.screen.blit(result_surf, result_rect)
         
         # Draw AI choice
         ai_surf = self.font.render(ai_text, True, self.WHITE)
         ai_rect = ai_surf.get_rect(center=(3*self.WIDTH//4, self.HEIGHT//2))
         self.screen.blit(ai_surf, ai_rect)
+        if self.ai_choice:
+            strategy_surf = self.small_font.render(f"Strategy: {self.predictor.describe()}", True, self.GRAY)
+            self.screen.blit(strategy_surf, strategy_surf.get_rect(center=(3*self.WIDTH//4, self.HEIGHT//2 + 45)))
         
         # Draw hand gesture preview if available
         if self.frame is not None:
@@ -252,67 +224,24 @@ class RockPaperScissors:
                                    self.HEIGHT - preview_size[1] - 20))
 
     def add_particles(self, pos, color):
-        for _ in range(10):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 5)
-            self.particles.append({
-                'pos': list(pos),
-                'vel': [math.cos(angle) * speed, math.sin(angle) * speed],
-                'color': color,
-                'life': 1.0
-            })
+        self.particles.burst(pos, color)
 
     def update_particles(self):
-        for particle in self.particles[:]:
-            particle['pos'][0] += particle['vel'][0]
-            particle['pos'][1] += particle['vel'][1]
-            particle['life'] -= 0.02
-            
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
-            else:
-                color = particle['color']
-                alpha = int(particle['life'] * 255)
-                pygame.draw.circle(self.screen, (*color, alpha), 
-                                 (int(particle['pos'][0]), int(particle['pos'][1])), 3)
+        self.particles.update()
+        self.particles.draw(self.screen)
 
-    def detect_gesture(self, hand_landmarks):
-        # Implement gesture detection logic here
-        # This is a simplified version - you should implement proper gesture recognition
-        thumb_tip = hand_landmarks.landmark[4]
-        index_tip = hand_landmarks.landmark[8]
-        middle_tip = hand_landmarks.landmark[12]
-        
-        if abs(thumb_tip.y - index_tip.y) < 0.1:
-            return "paper"
-        elif thumb_tip.y < index_tip.y:
-            return "rock"
-        else:
-            return "scissors"
+    def detect_gesture(self, hand):
+        """Rock, paper, scissors or None for one hand's (21, 3) landmarks"""
+        if self.gesture_classifier is None:
+            return rule_gesture(hand)
+        return self.gesture_classifier.classify(hand)
 
     def get_ai_choice(self):
-        if len(self.move_history) < 3:
-            return np.random.choice(["rock", "paper", "scissors"])
-        
-        # Analyze patterns in move history
-        last_moves = self.move_history[-3:]
-        pattern = "".join(last_moves)
-        
-        # Predict next move based on pattern weights
-        predicted_move = max(self.pattern_weights, key=self.pattern_weights.get)
-        
-        # Choose counter move
-        counter_moves = {
-            "rock": "paper",
-            "paper": "scissors",
-            "scissors": "rock"
-        }
-        return counter_moves[predicted_move]
+        # Counter the n-gram prediction that has been winning lately (random until one is)
+        return self.predictor.choose(self.rng)
 
     def update_ai(self, player_move):
-        if len(self.move_history) >= 3:
-            pattern = "".join(self.move_history[-3:])
-            self.pattern_weights[player_move] += 1
+        self.predictor.update(player_move)
         self.move_history.append(player_move)
 
     def determine_winner(self, player_choice, ai_choice):
@@ -332,14 +261,93 @@ class RockPaperScissors:
             self.ai_score += 1
             return "AI Wins!"
 
+    def handle_gesture(self, gesture):
+        """Turn the per-frame gesture into throws"""
+        vote = self.gesture_votes.push(self.GESTURES.index(gesture))
+        if vote is None:
+            return
+        if vote == 0:
+            self.throw_ready = True
+        elif self.throw_ready:
+            self.throw_ready = False
+            self.play_round(self.GESTURES[vote])
+    
+    def play_round(self, player_choice):
+        # The AI commits to its move before learning from the player's
+        self.ai_choice = self.get_ai_choice()
+        self.player_choice = player_choice
+        self.round_result = self.determine_winner(player_choice, self.ai_choice)
+        self.update_ai(player_choice)
+        self.rounds += 1
+        self.streak = self.streak + 1 if self.round_result == "You Win!" else 0
+        if self.round_log:
+            result = {"You Win!": 1, "Tie!": 0, "AI Wins!": -1}[self.round_result]
+            self.round_log.log(player_choice, self.ai_choice, result, self.player_score,
+                               self.ai_score, self.rounds, self.streak)
+        
+        if self.round_result == "You Win!":
+            color = self.GREEN
+        elif self.round_result == "AI Wins!":
+            color = self.RED
+        else:
+            color = self.YELLOW
+        self.add_particles((self.WIDTH//2, self.HEIGHT//2), color)
+    
+    def reset_session(self, seed=None):
+        """Reset scores and what the AI has learned"""
+        if seed is not None:
+            self.rng.seed(seed)
+        self.player_score = 0
+        self.ai_score = 0
+        self.player_choice = None
+        self.ai_choice = None
+        self.round_result = None
+        self.rounds = 0
+        self.streak = 0
+        self.move_history.clear()
+        self.predictor = MovePredictor()
+        self.gesture_votes.reset()
+        self.throw_ready = True
+    
+    def reset_scores(self):
+        self.player_score = 0
+        self.ai_score = 0
+
+    def replay_summary(self):
+        return {'player_score': self.player_score, 'ai_score': self.ai_score, 'rounds': self.rounds}
+    
+    def start_recording(self):
+        # Recordings start from a fresh, seeded session so they can be replayed
+        seed = new_seed()
+        self.reset_session(seed)
+        self.recorder = InputRecorder(recording_path('rps'), 'rps', seed)
+    
+    def stop_recording(self):
+        if self.recorder:
+            self.recorder.close(self.replay_summary())
+            print(f"Saved recording: {self.recorder.path}")
+            self.recorder = None
+    
+    def replay_session(self, replay, render=False):
+        """Re-run a recorded session as fast as possible and return its final state"""
+        self.reset_session(replay.seed)
+        for (gesture_code,) in replay:
+            if gesture_code == self.RESET_RECORD:
+                self.reset_scores()
+                continue
+            self.handle_gesture(self.GESTURES[gesture_code])
+            if render:
+                self.draw_game_state()
+                self.update_particles()
+                pygame.display.flip()
+        return self.replay_summary()
+    
     def process_frame(self):
-        rgb_frame = cv2.cvtColor(self.frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb_frame)
-        
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                return self.detect_gesture(hand_landmarks)
-        return None
+        """Newest landmarks from the hand tracker (one (21, 3) array per
+        hand, possibly none), or None if no new result has arrived"""
+        hands, _ = self.hand_input.poll()
+        self.frame = self.hand_input.frame()
+        return hands
 
     def handle_events(self):
         for event in pygame.event.get():
@@ -354,9 +362,10 @@ class RockPaperScissors:
                     return True  # Signal to return to menu, not quit game
                     
                 elif event.key == pygame.K_r:
-                    # Reset scores
-                    self.player_score = 0
-                    self.ai_score = 0
+                    # Reset scores, in the recording too so replays match
+                    if self.recorder:
+                        self.recorder.write(self.RESET_RECORD)
+                    self.reset_scores()
                     self.sound_manager.play_sound("menu_select")
                     
                 elif event.key == pygame.K_p:
@@ -366,10 +375,18 @@ class RockPaperScissors:
                 elif event.key == pygame.K_SPACE and self.paused:
                     self.paused = False
                     self.sound_manager.play_sound("menu_select")
+                
+                elif event.key == pygame.K_F9:
+                    if self.recorder:
+                        self.stop_recording()
+                    else:
+                        self.start_recording()
 
     def run(self):
         clock = pygame.time.Clock()
         tutorial_shown = True  # Set to False to show tutorial
+        self.open_camera()
+        self.open_history()
         
         while self.running:
             if not tutorial_shown:
@@ -394,12 +411,13 @@ class RockPaperScissors:
                     return return_to_menu
                 
                 if not self.paused:
-                    # Process camera input
-                    ret, frame = self.cap.read()
-                    if ret:
-                        self.frame = cv2.flip(frame, 1)  # Mirror the frame
-                        # Process hand landmarks
-                        self.process_frame()
+                    # Process camera input, once per new tracking result
+                    hands = self.process_frame()
+                    if hands is not None:
+                        gesture = self.detect_gesture(hands[0]) if hands else None
+                        if self.recorder:
+                            self.recorder.write(self.GESTURES.index(gesture))
+                        self.handle_gesture(gesture)
                 
                 # Draw game state
                 try:
@@ -0,0 +1,132 @@
+import argparse
+import time
+
+import numpy as np
+
+from RockPaperScissors.gestures import (LABELS, MIN_VALIDATION, MODEL_PATH, GestureClassifier,
+                                        landmark_features, rule_gesture)
+from utils.hand_poses import synthetic_hands
+
+
+def train(landmarks, labels, regularization=1.0, min_confidence=0.6):
+    """Fit a GestureClassifier on labelled landmarks with scikit-learn"""
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import StandardScaler
+
+    features = landmark_features(landmarks)
+    scaler = StandardScaler().fit(features)
+    model = LogisticRegression(C=regularization, max_iter=2000).fit(scaler.transform(features), labels)
+    return GestureClassifier(scaler.mean_, scaler.scale_, model.coef_, model.intercept_, min_confidence)
+
+
+def load_samples(paths):
+    """Recorded (landmarks, labels) from .npz files saved by record"""
+    landmarks, labels = [], []
+    for path in paths:
+        with np.load(path) as data:
+            landmarks.append(data['landmarks'])
+            labels.append(data['labels'])
+    return np.concatenate(landmarks), np.concatenate(labels)
+
+
+def record_samples(label, path, seconds):
+    """Record the shared hand tracker's landmarks of one gesture, labelled"""
+    from utils.hand_tracker import get_hand_tracker
+
+    hand_input = get_hand_tracker().subscribe()
+    if not hand_input.is_opened():
+        raise RuntimeError("Could not open camera")
+    samples = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        hands, _ = hand_input.poll()
+        if hands:
+            samples.append(hands[0])
+        time.sleep(0.002)
+    np.savez_compressed(path, landmarks=np.array(samples, dtype=np.float32),
+                        labels=np.full(len(samples), LABELS.index(label)))
+    return len(samples)
+
+
+def benchmark(classifier, landmarks, labels, frames=5000, kind="recorded"):
+    """Accuracy on labelled landmarks and the cost of classifying one hand per frame"""
+    predicted = classifier.predict(landmarks)
+    rule = np.array([LABELS.index(rule_gesture(hand)) for hand in landmarks])
+    print(f"Accuracy on {len(labels)} {kind} hands: {np.mean(predicted == labels):.1%} "
+          f"(thumb/index rule {np.mean(rule == labels):.1%})")
+    if kind == "synthetic":
+        print("  The model was trained on the same generator, so this says little about real hands")
+    for index, label in enumerate(LABELS):
+        chosen = labels == index
+        print(f"  {str(label):>8}: {np.mean(predicted[chosen] == index):.1%} of {chosen.sum()}")
+
+    hands = landmarks[:frames]
+    start = time.perf_counter()
+    for hand in hands:
+        classifier.classify(hand)
+    per_frame = (time.perf_counter() - start) / len(hands) * 1e6
+    start = time.perf_counter()
+    classifier.predict(landmarks)
+    batched = (time.perf_counter() - start) / len(landmarks) * 1e6
+    print(f"Classifying one hand per frame: {per_frame:.1f} us; batched: {batched:.2f} us per hand")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train and check the Rock Paper Scissors gesture classifier")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Record landmarks of one gesture from the webcam")
+    record.add_argument("label", choices=["rock", "paper", "scissors", "none"])
+    record.add_argument("path", help="Output .npz file")
+    record.add_argument("--seconds", type=float, default=20)
+
+    fit = commands.add_parser("train", help="Train the classifier and save it")
+    fit.add_argument("data", nargs="*", help="Recorded .npz samples to train on as well")
+    fit.add_argument("--synthetic", type=int, default=20000, help="Synthetic hands to train on")
+    fit.add_argument("--regularization", type=float, default=1.0, help="Inverse strength (C)")
+    fit.add_argument("--output", default=MODEL_PATH)
+
+    check = commands.add_parser("benchmark", help="Accuracy and per-frame cost of a saved model")
+    check.add_argument("data", nargs="*", help="Recorded .npz samples (default: synthetic hands)")
+    check.add_argument("--model", default=MODEL_PATH)
+
+    validate = commands.add_parser("validate", help="Measure a model on recorded hands it was not "
+                                   "trained on; the game uses it once it is accurate enough")
+    validate.add_argument("data", nargs="+", help="Recorded .npz samples kept out of training")
+    validate.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        label = None if args.label == "none" else args.label
+        count = record_samples(label, args.path, args.seconds)
+        print(f"Recorded {count} {args.label} samples to {args.path}")
+    elif args.command == "train":
+        landmarks, labels = synthetic_hands(args.synthetic, args.seed)
+        if args.data:
+            recorded = load_samples(args.data)
+            landmarks = np.concatenate([landmarks, recorded[0]])
+            labels = np.concatenate([labels, recorded[1]])
+        classifier = train(landmarks, labels, args.regularization)
+        classifier.save(args.output)
+        print(f"Trained on {len(labels)} hands, saved to {args.output}")
+        benchmark(classifier, *synthetic_hands(5000, args.seed + 1), kind="synthetic")
+        print("Validate it on recorded hands before the game uses it in place of the thumb/index rule")
+    elif args.command == "validate":
+        classifier = GestureClassifier.load(args.model)
+        landmarks, labels = load_samples(args.data)
+        classifier.validation = float(np.mean(classifier.predict(landmarks) == labels))
+        classifier.save(args.model)
+        benchmark(classifier, landmarks, labels)
+        verdict = "uses it" if classifier.validated() else f"keeps the thumb/index rule (needs {MIN_VALIDATION:.0%})"
+        print(f"Saved validation {classifier.validation:.1%} to {args.model}; the game {verdict}")
+    else:
+        classifier = GestureClassifier.load(args.model)
+        if args.data:
+            benchmark(classifier, *load_samples(args.data))
+        else:
+            benchmark(classifier, *synthetic_hands(5000, args.seed + 1), kind="synthetic")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ from Ball.ball import BallGame
 from RockPaperScissors.rpsdata import RockPaperScissors
 from snake_game.snake import SnakeGame
 from utils.sound_manager import SoundManager
+from utils.render_cache import RenderCache
 import os
 
 class MainMenu:
@@ -11,6 +12,8 @@ class MainMenu:
         pygame.init()
         self.WIDTH = 1280
         self.HEIGHT = 720
+        # Glow sprites, built once and reused every frame
+        self.render_cache = RenderCache()
         self.init_display()
         
         # Initialize fonts
@@ -41,6 +44,8 @@ class MainMenu:
         """Initialize or reinitialize the display"""
         self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
         pygame.display.set_caption("AI Mini Games")
+        # Cached sprites were converted for the old display
+        self.render_cache.clear()
     
     def init_buttons(self):
         """Initialize menu buttons"""
@@ -122,24 +127,9 @@ class MainMenu:
         try:
             self.screen.fill(self.BLACK)
             
-            # Draw title
-            title_text = "AI Mini Games"
-            title_surf = self.title_font.render(title_text, True, self.PURPLE)
-            title_rect = title_surf.get_rect(center=(self.WIDTH//2, 120))
-            
-            # Add glow to title
-            for i in range(3):
-                glow_surf = pygame.Surface(title_surf.get_size(), pygame.SRCALPHA)
-                glow_surf.blit(title_surf, (0, 0))
-                size_mult = 1 + (i * 0.1)
-                scaled_size = (int(glow_surf.get_width() * size_mult), 
-                             int(glow_surf.get_height() * size_mult))
-                glow_surf = pygame.transform.smoothscale(glow_surf, scaled_size)
-                glow_surf.set_alpha(100 - i * 30)
-                glow_rect = glow_surf.get_rect(center=title_rect.center)
-                self.screen.blit(glow_surf, glow_rect)
-            
-            self.screen.blit(title_surf, title_rect)
+            # Draw title with glow
+            title_surf = self.render_cache.glow_text(self.title_font, "AI Mini Games", self.PURPLE, scale=0.1)
+            self.screen.blit(title_surf, title_surf.get_rect(center=(self.WIDTH//2, 120)))
             
             # Draw buttons
             mouse_pos = pygame.mouse.get_pos()
@@ -158,15 +148,9 @@ class MainMenu:
                 button_y = button['rect'].y - button['y_offset']
                 
                 # Draw button glow
-                for i in range(3):
-                    glow_rect = pygame.Rect(
-                        button['rect'].x - i*2,
-                        button_y - i*2,
-                        button['rect'].width + i*4,
-                        button['rect'].height + i*4
-                    )
-                    pygame.draw.rect(self.screen, (*button_color, 50-i*15), 
-                                   glow_rect, border_radius=10)
+                glow_surf = self.render_cache.glow_rect(button['rect'].size, button_color, border_radius=10)
+                margin = self.render_cache.glow_margin((50, 35, 20), 2)
+                self.screen.blit(glow_surf, (button['rect'].x - margin, button_y - margin))
                 
                 # Draw main button
                 pygame.draw.rect(self.screen, button_color,
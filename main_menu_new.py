@@ -1,11 +1,12 @@
 import pygame
 import sys
-import math
 import random
 from Ball.ball import BallGame
 from RockPaperScissors.rpsdata import RockPaperScissors
 from snake_game.snake import SnakeGame
 from utils.sound_manager import SoundManager
+from utils.particles import ParticleSystem
+from utils.render_cache import RenderCache
 import os
 
 class MainMenu:
@@ -58,8 +59,11 @@ class MainMenu:
         ]
         
         # Particle system
-        self.particles = []
         self.MAX_PARTICLES = 100
+        self.particles = ParticleSystem(self.MAX_PARTICLES)
+        
+        # Glow sprites, built once and reused every frame
+        self.render_cache = RenderCache()
         
         # Background stars
         self.stars = [(random.randint(0, self.WIDTH), random.randint(0, self.HEIGHT)) 
@@ -114,10 +118,11 @@ class MainMenu:
             color = tuple(min(c + 30, 255) for c in color)
             pygame.draw.rect(self.screen, color, rect, border_radius=self.button_radius)
             # Add glow effect
-            for i in range(3):
-                glow_rect = rect.inflate(i*4, i*4)
-                pygame.draw.rect(self.screen, (*color, 100-i*30), glow_rect, 
-                               border_radius=self.button_radius+i*2, width=2)
+            alphas = (100, 70, 40)
+            glow_surf = self.render_cache.glow_rect(rect.size, color, alphas=alphas,
+                                                    border_radius=self.button_radius, width=2)
+            margin = self.render_cache.glow_margin(alphas, 2)
+            self.screen.blit(glow_surf, (rect.x - margin, rect.y - margin))
         else:
             pygame.draw.rect(self.screen, color, rect, border_radius=self.button_radius)
         
@@ -152,29 +157,11 @@ class MainMenu:
                              (int(x), int(y)), size)
     
     def add_particles(self, pos, color):
-        for _ in range(10):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 5)
-            self.particles.append({
-                'pos': list(pos),
-                'vel': [math.cos(angle) * speed, math.sin(angle) * speed],
-                'color': color,
-                'life': 1.0
-            })
+        self.particles.burst(pos, color)
     
     def update_particles(self):
-        for particle in self.particles[:]:
-            particle['pos'][0] += particle['vel'][0]
-            particle['pos'][1] += particle['vel'][1]
-            particle['life'] -= 0.02
-            
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
-            else:
-                color = particle['color']
-                alpha = int(particle['life'] * 255)
-                pygame.draw.circle(self.screen, (*color, alpha), 
-                                 (int(particle['pos'][0]), int(particle['pos'][1])), 3)
+        self.particles.update()
+        self.particles.draw(self.screen)
     
     def run(self):
         clock = pygame.time.Clock()
@@ -0,0 +1,173 @@
+import time
+
+from snake_game.pathfinding import GridPathfinder, AStarPathfinder, neighbour_table
+from snake_game.hamiltonian import HamiltonianPlanner
+
+
+class SnakeAI:
+    """Picks the snake's next direction for a SnakeSimulation.
+
+    Can be used directly as a fast_forward controller: ai(sim) -> direction.
+    The A* strategy (also the Hamiltonian strategy's fallback) spends at most
+    budget_us microseconds per tick searching; a search that does not finish
+    resumes on the next tick while the snake follows its best partial path.
+    budget_us=None searches to completion every time, which keeps headless
+    runs independent of CPU speed. The Hamiltonian cycle is built within the
+    same budget over the first ticks on a board, with A* standing in until it
+    is ready. strategies lists the ones cycle_strategy() goes through.
+    """
+
+    STRATEGIES = ["bfs", "hamiltonian", "astar"]
+
+    def __init__(self, width, height, strategy="bfs", budget_us=2000, strategies=None):
+        self.strategies = strategies or self.STRATEGIES
+        if strategy not in self.STRATEGIES or not set(self.strategies) <= set(self.STRATEGIES):
+            raise ValueError(f"Unknown AI strategy: {strategy}")
+        self.width = width
+        self.height = height
+        self.strategy = strategy
+        self.budget_us = budget_us
+        # One neighbour table serves every planner on the board
+        self.neighbours = neighbour_table(width, height)
+        self.pathfinder = GridPathfinder(width, height, self.neighbours)
+        self.astar = AStarPathfinder(width, height, self.neighbours)
+        self.hamiltonian = None
+        self.obstacles = None
+        self.path = []
+        self.search_target = None  # Target of the A* search in progress, if any
+        self.search_steps = 0  # Moves made along that search's partial path
+        self.tick_start = 0.0  # When the current tick's planning began
+
+    def new_board(self, obstacles):
+        """Rebuild per-board planner state once the obstacles are spawned"""
+        self.obstacles = obstacles
+        self.path = []
+        self.search_target = None
+        # The cycle itself is built by next_move(), a budget's worth per tick;
+        # on large boards it takes a noticeable part of a second
+        try:
+            self.hamiltonian = HamiltonianPlanner(self.width, self.height, obstacles,
+                                                  self.neighbours, build=False)
+        except ValueError:
+            # Odd board dimensions have no cycle of this shape; stay on BFS
+            self.hamiltonian = None
+
+    def reset(self):
+        """Forget any planned path, e.g. after the player steered manually"""
+        self.path = []
+        self.search_target = None
+        if self.hamiltonian:
+            self.hamiltonian.reset()
+
+    def cycle_strategy(self):
+        index = self.strategies.index(self.strategy) if self.strategy in self.strategies else -1
+        self.strategy = self.strategies[(index + 1) % len(self.strategies)]
+        self.reset()
+
+    def find_path_to_food(self, sim):
+        target = sim.food if not sim.special_food else sim.special_food
+        self.pathfinder.blocked[:] = sim.board.blocked_cells()
+        return self.pathfinder.find_path(sim.snake[0], target)
+
+    def direction_to(self, sim, pos):
+        # Unit step from the head to an adjacent cell, accounting for wrap-around
+        dx = (pos[0] - sim.snake[0][0]) % self.width
+        dy = (pos[1] - sim.snake[0][1]) % self.height
+        if dx > 1:
+            dx -= self.width
+        if dy > 1:
+            dy -= self.height
+        return (dx, dy)
+
+    def start_search(self, sim, target):
+        self.astar.blocked[:] = sim.board.blocked_cells()
+        self.astar.start(sim.snake[0], target)
+        self.search_target = target
+        self.search_steps = 0
+
+    def tick_deadline(self, share=1.0):
+        """time.perf_counter() value by which share of this tick's budget is spent"""
+        if self.budget_us is None:
+            return None
+        return self.tick_start + share * self.budget_us / 1e6
+
+    def plan_astar(self, sim, target):
+        """Next cell from the budgeted A* search, resuming it if one is running"""
+        deadline = self.tick_deadline()
+        head = sim.snake[0]
+        for restart in (False, True):
+            if restart or target != self.search_target:
+                self.start_search(sim, target)
+            path, complete = self.astar.run(deadline)
+            # The head has walked search_steps cells down the search tree;
+            # carry on only while the best path still runs through it
+            steps = self.search_steps
+            on_path = steps == 0 or (len(path) >= steps and path[steps - 1] == head)
+            if on_path and len(path) > steps and not sim.board.is_blocked(path[steps]):
+                if complete:
+                    self.path = path[steps + 1:]
+                    self.search_target = None
+                else:
+                    self.search_steps += 1
+                return path[steps]
+            if on_path or complete:
+                break
+            # The best path moved off the head's branch: search again from here
+        self.search_target = None
+        return self.safe_move(sim, target)
+
+    def safe_move(self, sim, target):
+        # No usable path yet: step onto any free neighbour, nearest the target first
+        head = sim.snake[0]
+        moves = [((head[0] + dx) % self.width, (head[1] + dy) % self.height)
+                 for dx, dy in self.pathfinder.DIRECTIONS]
+        moves = [pos for pos in moves if not sim.board.is_blocked(pos)]
+        if not moves:
+            return None
+        if target is None:
+            return moves[0]
+        return min(moves, key=lambda pos: self.distance(pos, target))
+
+    def distance(self, a, b):
+        # Manhattan distance on the wrap-around board
+        dx = abs(a[0] - b[0])
+        dy = abs(a[1] - b[1])
+        return min(dx, self.width - dx) + min(dy, self.height - dy)
+
+    def next_move(self, sim):
+        # A reset simulation spawns a fresh obstacle list
+        if sim.obstacles is not self.obstacles:
+            self.new_board(sim.obstacles)
+
+        self.tick_start = time.perf_counter()
+        target = sim.food if not sim.special_food else sim.special_food
+        # Until the cycle is built (in half of each tick's budget) A* steers
+        planner = self.hamiltonian if self.strategy == "hamiltonian" else None
+        if planner and planner.build(self.tick_deadline(0.5)):
+            next_pos = planner.next_move(
+                sim.snake[0], sim.snake[-1], len(sim.snake), target,
+                sim.board.is_blocked)
+            if next_pos:
+                self.path = []
+                self.search_target = None
+                return next_pos
+            # Body out of cycle order after manual steering and the cycle
+            # ahead is blocked (or the head is boxed in off it): fall back to A*
+
+        if not self.path:
+            if self.strategy == "bfs":
+                self.path = self.find_path_to_food(sim)
+            else:
+                return self.plan_astar(sim, target)
+        if self.path:
+            next_pos = self.path[0]
+            self.path = self.path[1:]
+            return next_pos
+        return None
+
+    def next_direction(self, sim):
+        next_pos = self.next_move(sim)
+        return self.direction_to(sim, next_pos) if next_pos else None
+
+    def __call__(self, sim):
+        return self.next_direction(sim)
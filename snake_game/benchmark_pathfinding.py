@@ -0,0 +1,110 @@
+import argparse
+import random
+import time
+
+from snake_game.pathfinding import GridPathfinder
+
+
+def legacy_find_path(snake, obstacles, target, width, height):
+    """The list-based BFS SnakeGame.find_path_to_food used before GridPathfinder"""
+    start = snake[0]
+    queue = [(start, [start])]
+    visited = set([start])
+
+    while queue:
+        current, path = queue.pop(0)
+        if current == target:
+            return path[1:] if len(path) > 1 else []
+
+        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            next_pos = ((current[0] + dx) % width, (current[1] + dy) % height)
+            if (next_pos not in visited and
+                next_pos not in snake[:-1] and
+                next_pos not in obstacles):
+                queue.append((next_pos, path + [next_pos]))
+                visited.add(next_pos)
+    return []
+
+
+def build_board(width, height, snake_length, obstacle_density, rng):
+    # Lay the snake out as a serpentine starting in the top-left corner
+    snake = []
+    for y in range(height):
+        row = range(width) if y % 2 == 0 else range(width - 1, -1, -1)
+        for x in row:
+            snake.append((x, y))
+    snake = snake[:snake_length]
+    snake.reverse()  # Head is the last cell laid out
+
+    occupied = set(snake)
+    free = [(x, y) for y in range(height) for x in range(width) if (x, y) not in occupied]
+    rng.shuffle(free)
+    num_obstacles = int(len(free) * obstacle_density)
+    obstacles = free[:num_obstacles]
+    # Food goes half the board away from the head in both directions, the farthest
+    # cell on a wrapping board, or on the free cell nearest to that spot
+    remaining = free[num_obstacles:]
+    head_x, head_y = snake[0]
+    far = ((head_x + width // 2) % width, (head_y + height // 2) % height)
+
+    def distance_to_far(pos):
+        dx = abs(pos[0] - far[0])
+        dy = abs(pos[1] - far[1])
+        return min(dx, width - dx) + min(dy, height - dy)
+
+    target = min(remaining, key=distance_to_far) if remaining else None
+    return snake, obstacles, target
+
+
+def time_call(func, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snake pathfinding microbenchmark")
+    parser.add_argument("--width", type=int, default=32)
+    parser.add_argument("--height", type=int, default=24)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[1, 50, 200, 400, 600])
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.0, 0.1, 0.3])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-legacy", action="store_true",
+                        help="Only time GridPathfinder (the legacy BFS is slow on long snakes)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pathfinder = GridPathfinder(args.width, args.height)
+
+    print(f"Board {args.width}x{args.height}, {args.repeats} repeats per case")
+    print(f"{'length':>8} {'density':>8} {'path':>6} {'grid (us)':>12} {'legacy (us)':>12} {'speedup':>8}")
+    for length in args.lengths:
+        for density in args.densities:
+            snake, obstacles, target = build_board(args.width, args.height, length, density, rng)
+
+            def grid_search():
+                pathfinder.set_blocked(snake[:-1], obstacles)
+                return pathfinder.find_path(snake[0], target)
+
+            path = grid_search()
+            grid_time = time_call(grid_search, args.repeats)
+
+            if args.skip_legacy:
+                legacy_text, speedup_text = "-", "-"
+            else:
+                legacy_path = legacy_find_path(snake, obstacles, target, args.width, args.height)
+                assert len(legacy_path) == len(path), "pathfinders disagree on path length"
+                legacy_time = time_call(
+                    lambda: legacy_find_path(snake, obstacles, target, args.width, args.height),
+                    args.repeats)
+                legacy_text = f"{legacy_time * 1e6:.1f}"
+                speedup_text = f"{legacy_time / grid_time:.1f}x"
+
+            print(f"{length:>8} {density:>8.2f} {len(path):>6} {grid_time * 1e6:>12.1f} "
+                  f"{legacy_text:>12} {speedup_text:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+from array import array
+from collections import deque
+
+
+class BoardState:
+    """Occupancy of a Snake board with O(1) spawning and collision checks.
+
+    Three views are kept in sync: a per-cell occupancy map, the snake body as
+    a deque (head first) and the set of free cells, stored as an array with a
+    position index so cells can be added, removed (swap-remove) and sampled
+    in constant time however full the board is. Each snake cell also keeps
+    the serial number it was entered on, so a renderer can find a segment's
+    neighbours along the body from the cell alone.
+    """
+
+    EMPTY = 0
+    SNAKE = 1
+    OBSTACLE = 2
+    FOOD = 3
+    SPECIAL_FOOD = 4
+
+    # Maps an occupancy byte to 1 where the snake cannot move
+    BLOCKING = bytes([0, 1, 1, 0, 0]) + bytes(251)
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.clear()
+
+    def clear(self):
+        self.cells = bytearray(self.size)
+        self.free = array('i', range(self.size))
+        self.free_index = array('i', range(self.size))
+        self.body = deque()
+        self.stamps = array('q', [0]) * self.size
+        self.serial = 0
+
+    def to_index(self, pos):
+        return pos[0] + pos[1] * self.width
+
+    def to_pos(self, index):
+        return (index % self.width, index // self.width)
+
+    def kind(self, pos):
+        return self.cells[pos[0] + pos[1] * self.width]
+
+    def free_count(self):
+        return len(self.free)
+
+    def occupy(self, pos, kind):
+        index = pos[0] + pos[1] * self.width
+        if self.cells[index] == self.EMPTY:
+            # Swap-remove the cell from the free array
+            slot = self.free_index[index]
+            last = self.free[-1]
+            self.free[slot] = last
+            self.free_index[last] = slot
+            self.free.pop()
+            self.free_index[index] = -1
+        self.cells[index] = kind
+
+    def release(self, pos):
+        index = pos[0] + pos[1] * self.width
+        if self.cells[index] == self.EMPTY:
+            return
+        self.cells[index] = self.EMPTY
+        self.free_index[index] = len(self.free)
+        self.free.append(index)
+
+    def random_free(self, rng):
+        """Sample a free cell uniformly, or None when the board is full"""
+        if not self.free:
+            return None
+        return self.to_pos(self.free[rng.randrange(len(self.free))])
+
+    def push_head(self, pos):
+        self.body.appendleft(pos)
+        self.occupy(pos, self.SNAKE)
+        self.serial += 1
+        self.stamps[pos[0] + pos[1] * self.width] = self.serial
+
+    def pop_tail(self):
+        pos = self.body.pop()
+        self.release(pos)
+        return pos
+
+    def segment_neighbours(self, pos):
+        """The segments before (towards the head) and after a body cell.
+
+        Consecutive segments carry consecutive stamps, so this checks the four
+        adjacent cells instead of walking the body. Either side is None at the
+        ends of the snake.
+        """
+        x, y = pos
+        stamp = self.stamps[x + y * self.width]
+        before = after = None
+        for nx, ny in (((x + 1) % self.width, y), ((x - 1) % self.width, y),
+                       (x, (y + 1) % self.height), (x, (y - 1) % self.height)):
+            index = nx + ny * self.width
+            if self.cells[index] != self.SNAKE:
+                continue
+            if self.stamps[index] == stamp + 1:
+                before = (nx, ny)
+            elif self.stamps[index] == stamp - 1:
+                after = (nx, ny)
+        return before, after
+
+    def is_blocked(self, pos, tail_moves=True):
+        """True if moving the head onto pos is a collision.
+
+        With tail_moves the tail cell counts as free, since it is vacated on
+        the same tick the head advances.
+        """
+        index = pos[0] + pos[1] * self.width
+        kind = self.cells[index]
+        if kind == self.OBSTACLE:
+            return True
+        if kind == self.SNAKE:
+            return not (tail_moves and pos == self.body[-1])
+        return False
+
+    def blocked_cells(self):
+        """Flat 0/1 grid of cells the head cannot enter, with the tail left open"""
+        blocked = self.cells.translate(self.BLOCKING)
+        if self.body:
+            blocked[self.to_index(self.body[-1])] = 0
+        return blocked
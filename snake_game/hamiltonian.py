@@ -0,0 +1,314 @@
+import time
+from array import array
+from collections import deque
+
+from snake_game.pathfinding import neighbour_table
+
+
+class HamiltonianPlanner:
+    """Snake AI that follows a precomputed Hamiltonian cycle and takes safe shortcuts.
+
+    The cycle is built from a spanning tree over 2x2 blocks of cells, skipping
+    blocks that contain an obstacle (and any cut off from the largest group of
+    the rest), so it needs an even board width and height.
+    While the body lies in cycle order between tail and head, any move that lands
+    strictly inside the free stretch of the cycle ahead of the head (minus a growth
+    margin) keeps that order, so it can never trap the snake. Food off the cycle
+    (in a skipped block) is fetched the same way: from a cycle cell next to the
+    food's off-cycle region, the head walks through that region over the food
+    and back onto the cycle inside the free stretch; until such a walk fits it
+    keeps circling.
+
+    With build=False the cycle is left for build() to make in slices, so a
+    large board's cycle can be spread over several ticks; next_move() needs
+    it finished (ready).
+    """
+
+    # Blocks or cells handled between clock checks while building
+    BUILD_STEP = 256
+
+    def __init__(self, width, height, obstacles=(), neighbours=None, shortcut_margin=3,
+                 shortcut_fill=0.5, build=True):
+        if width % 2 or height % 2 or width < 2 or height < 2:
+            raise ValueError("Hamiltonian planner needs an even board width and height")
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.shortcut_margin = shortcut_margin
+        self.shortcut_fill = shortcut_fill
+
+        # order[cell] is the cell's position on the cycle (-1 when off the cycle)
+        # and successor[cell] is the next cell along it
+        self.order = array('i', [-1]) * self.size
+        self.successor = array('i', [-1]) * self.size
+        self.neighbours = neighbours if neighbours is not None else neighbour_table(width, height)
+
+        self.obstacles = {self.to_index(pos) for pos in obstacles}
+        self.cycle_length = 0
+        self.ready = False
+        self.building = self.build_cycle(list(obstacles))
+        if build:
+            self.build()
+
+        # Number of consecutive moves taken along the cycle, used to tell when
+        # the body is back in cycle order after a fallback move
+        self.ordered_moves = 0
+        # Cells still to walk on a detour off the cycle, ending back on it
+        self.detour_path = []
+        # Off-cycle target and the cycle cells next to its off-cycle region
+        self.target_index = None
+        self.entries = ()
+
+    def build(self, deadline=None):
+        """Carry on building the cycle until time.perf_counter() passes
+        deadline (None to finish); returns whether it is ready"""
+        while not self.ready:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            self.ready = next(self.building, True) is True
+        return self.ready
+
+    def build_cycle(self, obstacles):
+        """Generator making the cycle, yielding every BUILD_STEP blocks or cells"""
+        block_width = self.width // 2
+        block_height = self.height // 2
+        open_blocks = bytearray([1]) * (block_width * block_height)
+        for x, y in obstacles:
+            open_blocks[x // 2 + (y // 2) * block_width] = 0
+
+        # Spanning trees over each connected group of open blocks; edges are
+        # stored per block as flags for the left, right, up and down neighbours.
+        # The cycle goes round the largest tree.
+        left, right, up, down = 1, 2, 4, 8
+        edges = bytearray(block_width * block_height)
+        group = array('i', [-1]) * (block_width * block_height)
+        start_block, largest = None, 0
+        visited = 0
+        for root in range(block_width * block_height):
+            if root % self.BUILD_STEP == 0:
+                yield
+            if not open_blocks[root] or group[root] >= 0:
+                continue
+            group[root] = root
+            frontier = deque([root])
+            count = 1
+            while frontier:
+                block = frontier.popleft()
+                visited += 1
+                if visited % self.BUILD_STEP == 0:
+                    yield
+                bx, by = block % block_width, block // block_width
+                for dx, dy, flag, back in ((-1, 0, left, right), (1, 0, right, left),
+                                           (0, -1, up, down), (0, 1, down, up)):
+                    nx, ny = bx + dx, by + dy
+                    if not (0 <= nx < block_width and 0 <= ny < block_height):
+                        continue
+                    neighbour = nx + ny * block_width
+                    if group[neighbour] >= 0 or not open_blocks[neighbour]:
+                        continue
+                    group[neighbour] = root
+                    edges[block] |= flag
+                    edges[neighbour] |= back
+                    frontier.append(neighbour)
+                    count += 1
+            if count > largest:
+                start_block, largest = root, count
+        if start_block is None:
+            return
+
+        # Walk each block counterclockwise, crossing into a neighbouring block
+        # wherever the tree has an edge, which traces the tree's outline
+        width = self.width
+        for block in range(block_width * block_height):
+            if block % self.BUILD_STEP == 0:
+                yield
+            if group[block] != start_block:
+                continue
+            bx, by = (block % block_width) * 2, (block // block_width) * 2
+            flags = edges[block]
+            top_left = bx + by * width
+            bottom_left = top_left + width
+            top_right = top_left + 1
+            bottom_right = bottom_left + 1
+            self.successor[top_left] = top_left - 1 if flags & left else bottom_left
+            self.successor[bottom_left] = bottom_left + width if flags & down else bottom_right
+            self.successor[bottom_right] = bottom_right + 1 if flags & right else top_right
+            self.successor[top_right] = top_right - width if flags & up else top_left
+
+        start = (start_block % block_width) * 2 + (start_block // block_width) * 2 * width
+        index, position = start, 0
+        while True:
+            self.order[index] = position
+            position += 1
+            index = self.successor[index]
+            if index == start:
+                break
+            if position % self.BUILD_STEP == 0:
+                yield
+        self.cycle_length = position
+
+    def to_index(self, pos):
+        return pos[0] + pos[1] * self.width
+
+    def to_pos(self, index):
+        return (index % self.width, index // self.width)
+
+    def on_cycle(self, pos):
+        return pos is not None and self.order[self.to_index(pos)] >= 0
+
+    def reset(self):
+        self.ordered_moves = 0
+        self.detour_path = []
+
+    def next_move(self, head, tail, length, target, is_blocked=None):
+        """Pick the next cell for the head, or None if the planner cannot move safely.
+
+        None is only returned while the body is out of cycle order (after the
+        player steered) and the cycle ahead is blocked, or when the head is off
+        the cycle with no free cycle cell next to it, so the caller can fall
+        back to another strategy for that stretch.
+
+        is_blocked is only consulted while the body is out of cycle order,
+        so a synced snake decides in O(1).
+        """
+        head_index = self.to_index(head)
+        if self.detour_path:
+            self.ordered_moves += 1
+            return self.to_pos(self.detour_path.pop())
+        head_order = self.order[head_index]
+        if head_order < 0:
+            return self.rejoin(head_index, is_blocked)
+
+        cycle_length = self.cycle_length
+        ordered = self.ordered_moves >= length
+        best = self.successor[head_index]
+
+        if not ordered:
+            if is_blocked is not None and is_blocked(self.to_pos(best)):
+                self.ordered_moves = 0
+                return None
+        elif self.on_cycle(tail):
+            # Free cycle stretch ahead of the head before reaching the tail
+            tail_gap = (self.order[self.to_index(tail)] - head_order) % cycle_length
+            if length == 1:
+                tail_gap = cycle_length
+            limit = tail_gap - self.shortcut_margin
+            target_gap = 0
+            if target is not None:
+                target_index = self.to_index(target)
+                if self.order[target_index] >= 0:
+                    target_gap = (self.order[target_index] - head_order) % cycle_length
+                else:
+                    # Food off the cycle: walk over it from here if that fits,
+                    # otherwise follow the cycle, which packs the body and
+                    # opens up the free stretch until a walk fits
+                    if target_index != self.target_index:
+                        self.find_entries(target_index)
+                    if head_index in self.entries:
+                        path = self.detour(head_index, target_index, tail, limit, is_blocked)
+                        if path:
+                            # No shortcuts or detours until the tail has left
+                            # the walked cells and the body is in order again
+                            self.ordered_moves = 1 - len(path)
+                            self.detour_path = path[::-1]
+                            return self.next_move(head, tail, length, target, is_blocked)
+
+            if length < self.shortcut_fill * cycle_length:
+                best_gap = 1
+                for neighbour in self.neighbours[4 * head_index:4 * head_index + 4]:
+                    neighbour_order = self.order[neighbour]
+                    if neighbour_order < 0:
+                        continue
+                    gap = (neighbour_order - head_order) % cycle_length
+                    if best_gap < gap <= target_gap and gap < limit:
+                        best, best_gap = neighbour, gap
+
+        self.ordered_moves += 1
+        return self.to_pos(best)
+
+    def find_entries(self, target_index):
+        """Cycle cells next to the off-cycle region (free of obstacles) around the target"""
+        self.target_index = target_index
+        region, frontier = {target_index}, [target_index]
+        entries = set()
+        while frontier:
+            cell = frontier.pop()
+            for neighbour in self.neighbours[4 * cell:4 * cell + 4]:
+                if self.order[neighbour] >= 0:
+                    entries.add(neighbour)
+                elif neighbour not in region and neighbour not in self.obstacles:
+                    region.add(neighbour)
+                    frontier.append(neighbour)
+        self.entries = entries
+
+    def detour(self, head_index, target_index, tail, limit, is_blocked):
+        """Cells of a walk from the head over the off-cycle target and back onto
+        the cycle inside the free stretch, or None.
+
+        The walked cells stay in the body until the tail has passed them,
+        and meanwhile the head uses up that many more cycle cells, so the
+        cell rejoined must lie that much further inside the stretch (gap
+        plus walked cells below limit). The walk is the shortest way through
+        free off-cycle cells to the target, then the shortest way on from
+        there to each cycle cell; the one rejoining furthest ahead is taken.
+        """
+        tail_index = self.to_index(tail)
+
+        def free(cell):
+            return (self.order[cell] < 0 and cell not in self.obstacles and cell != tail_index
+                    and not (is_blocked and is_blocked(self.to_pos(cell))))
+
+        # Breadth-first from the head to the target over free off-cycle cells
+        parents = {head_index: None}
+        frontier = deque([head_index])
+        while frontier and target_index not in parents:
+            cell = frontier.popleft()
+            for neighbour in self.neighbours[4 * cell:4 * cell + 4]:
+                if neighbour not in parents and free(neighbour):
+                    parents[neighbour] = cell
+                    frontier.append(neighbour)
+        if target_index not in parents:
+            return None
+        path = []
+        cell = target_index
+        while cell != head_index:
+            path.append(cell)
+            cell = parents[cell]
+        path.reverse()
+
+        # Then on from the target to the cycle, not crossing that path again
+        head_order = self.order[head_index]
+        best, best_gap = None, 0
+        parents = {cell: None for cell in path}
+        parents[head_index] = None
+        parents[target_index] = None
+        frontier = deque([(target_index, len(path))])
+        while frontier:
+            cell, walked = frontier.popleft()
+            for neighbour in self.neighbours[4 * cell:4 * cell + 4]:
+                if neighbour in parents:
+                    continue
+                if self.order[neighbour] >= 0:
+                    gap = (self.order[neighbour] - head_order) % self.cycle_length
+                    if best_gap < gap < limit - walked:
+                        best, best_gap = (cell, neighbour), gap
+                elif free(neighbour):
+                    parents[neighbour] = cell
+                    frontier.append((neighbour, walked + 1))
+        if best is None:
+            return None
+
+        cell, reentry = best
+        way_out = [reentry]
+        while cell != target_index:
+            way_out.append(cell)
+            cell = parents[cell]
+        return path + way_out[::-1]
+
+    def rejoin(self, head_index, is_blocked):
+        """A free cycle cell next to a head that is off the cycle, or None"""
+        self.ordered_moves = 0
+        for cell in self.neighbours[4 * head_index:4 * head_index + 4]:
+            if self.order[cell] >= 0 and not (is_blocked and is_blocked(self.to_pos(cell))):
+                return self.to_pos(cell)
+        return None
@@ -0,0 +1,197 @@
+import heapq
+import time
+from array import array
+from collections import deque
+
+
+def neighbour_table(width, height):
+    """Wrap-around neighbours of every cell in one flat array.
+
+    The neighbours of cell x + y * width sit at [4 * cell, 4 * cell + 4), in
+    GridPathfinder.DIRECTIONS order. A single array instead of a tuple per
+    cell keeps large boards cheap to build and out of the garbage collector,
+    and one table can be shared by every planner on the board.
+    """
+    table = array('i')
+    for y in range(height):
+        row = y * width
+        below = ((y + 1) % height) * width
+        above = ((y - 1) % height) * width
+        for x in range(width):
+            table.extend((x + below, (x + 1) % width + row, x + above, (x - 1) % width + row))
+    return table
+
+
+class GridPathfinder:
+    """Breadth-first search on a wrap-around grid backed by flat cell arrays"""
+
+    DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+    def __init__(self, width, height, neighbours=None):
+        self.width = width
+        self.height = height
+        self.size = width * height
+
+        # Cells are addressed by a flat index: x + y * width
+        self.blocked = bytearray(self.size)
+        self.parent = array('i', [-1]) * self.size
+        self.neighbours = neighbours if neighbours is not None else neighbour_table(width, height)
+        # Per-cell tuples of the same neighbours for the BFS loop, made on its
+        # first search: they read about twice as fast as slices of the array
+        self.cell_neighbours = None
+
+    def to_index(self, pos):
+        return pos[0] + pos[1] * self.width
+
+    def to_pos(self, index):
+        return (index % self.width, index // self.width)
+
+    def set_blocked(self, *groups):
+        """Rebuild the blocked-cell grid from iterables of (x, y) positions"""
+        self.blocked[:] = bytes(self.size)
+        width = self.width
+        for cells in groups:
+            for x, y in cells:
+                self.blocked[x + y * width] = 1
+
+    def find_path(self, start, target):
+        """Return the shortest path from start to target, excluding start"""
+        if target is None:
+            return []
+        start_index = self.to_index(start)
+        target_index = self.to_index(target)
+        if start_index == target_index:
+            return []
+
+        if self.cell_neighbours is None:
+            table = iter(self.neighbours)
+            self.cell_neighbours = list(zip(table, table, table, table))
+        blocked = self.blocked
+        neighbours = self.cell_neighbours
+        parent = self.parent
+        visited = bytearray(self.size)
+        visited[start_index] = 1
+        frontier = deque([start_index])
+
+        while frontier:
+            current = frontier.popleft()
+            for next_index in neighbours[current]:
+                if visited[next_index] or blocked[next_index]:
+                    continue
+                visited[next_index] = 1
+                parent[next_index] = current
+                if next_index == target_index:
+                    return self.build_path(start_index, target_index)
+                frontier.append(next_index)
+        return []
+
+    def build_path(self, start_index, target_index):
+        path = []
+        index = target_index
+        while index != start_index:
+            path.append(self.to_pos(index))
+            index = self.parent[index]
+        path.reverse()
+        return path
+
+
+class AStarPathfinder(GridPathfinder):
+    """A* on the same wrap-around grid, run in slices with a time budget.
+
+    start() sets up a search and run() expands nodes until a deadline, so a
+    long search can be spread over several ticks. Until the target is reached
+    run() reports the path to the expanded node closest to it, which a caller
+    can follow while the search carries on.
+    """
+
+    # Expansions between clock checks; reading the clock costs about as much as an expansion
+    CHECK_EVERY = 16
+
+    def __init__(self, width, height, neighbours=None):
+        super().__init__(width, height, neighbours)
+        # Per-cell search state is tagged with the search it belongs to, so
+        # starting a search does not have to clear the whole board
+        self.cost = array('i', [0]) * self.size
+        self.seen = array('i', [0]) * self.size
+        self.closed = array('i', [0]) * self.size
+        self.generation = 0
+        self.open = []
+        self.start_index = self.target_index = self.best_index = None
+        self.done = True
+
+    def heuristic(self, index):
+        # Manhattan distance, going around whichever edge is closer
+        dx = abs(index % self.width - self.target_x)
+        dy = abs(index // self.width - self.target_y)
+        return min(dx, self.width - dx) + min(dy, self.height - dy)
+
+    def start(self, start, target):
+        """Begin a new search from start to target against the current blocked grid"""
+        self.generation += 1
+        self.start_index = self.to_index(start)
+        self.target_index = self.to_index(target) if target is not None else None
+        self.best_index = self.start_index
+        self.found = False
+        self.done = target is None or self.start_index == self.target_index
+        self.open = []
+        if self.done:
+            return
+        self.target_x, self.target_y = target
+        self.cost[self.start_index] = 0
+        self.seen[self.start_index] = self.generation
+        self.best_h = self.heuristic(self.start_index)
+        self.open.append((self.best_h, self.best_h, self.start_index))
+
+    def run(self, deadline=None):
+        """Expand nodes until the target is found, the open list empties or
+        time.perf_counter() passes deadline.
+
+        Returns (path, complete): the full path once the target is found,
+        otherwise the path to the best node so far (empty if the target is
+        unreachable and complete is True). Paths exclude the start cell.
+        """
+        if self.done:
+            if self.found:
+                return self.build_path(self.start_index, self.target_index), True
+            return [], True
+
+        blocked = self.blocked
+        neighbours = self.neighbours
+        parent = self.parent
+        cost = self.cost
+        seen = self.seen
+        closed = self.closed
+        generation = self.generation
+        open_list = self.open
+        target_index = self.target_index
+        heuristic = self.heuristic
+        expansions = 0
+
+        while open_list:
+            expansions += 1
+            if deadline is not None and expansions % self.CHECK_EVERY == 0 and time.perf_counter() >= deadline:
+                return self.build_path(self.start_index, self.best_index), False
+            _, h, current = heapq.heappop(open_list)
+            if closed[current] == generation:
+                continue  # Stale entry superseded by a cheaper one
+            closed[current] = generation
+            if current == target_index:
+                self.done = self.found = True
+                return self.build_path(self.start_index, target_index), True
+            if h < self.best_h:
+                self.best_h, self.best_index = h, current
+
+            next_cost = cost[current] + 1
+            for next_index in neighbours[4 * current:4 * current + 4]:
+                if blocked[next_index] or closed[next_index] == generation:
+                    continue
+                if seen[next_index] == generation and cost[next_index] <= next_cost:
+                    continue
+                seen[next_index] = generation
+                cost[next_index] = next_cost
+                parent[next_index] = current
+                next_h = heuristic(next_index)
+                heapq.heappush(open_list, (next_cost + next_h, next_h, next_index))
+
+        self.done = True
+        return [], True
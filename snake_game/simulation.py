@@ -0,0 +1,193 @@
+import random
+import time
+
+from snake_game.board import BoardState
+
+
+class SnakeSimulation:
+    """Snake game rules with no display, camera or mixer.
+
+    Holds the board state (snake, food, special food, obstacles, score) and
+    advances it one tick at a time. Occupancy lives in a BoardState, so
+    spawning and collision checks cost the same on an empty or full board.
+    Anything a renderer wants to react to (food eaten, game over) is reported
+    through self.events after each step.
+    """
+
+    def __init__(self, width, height, seed=None, num_obstacles=5,
+                 special_food_chance=0.2, special_food_duration=60):
+        self.width = width
+        self.height = height
+        self.num_obstacles = num_obstacles
+        self.special_food_chance = special_food_chance
+        self.special_food_duration = special_food_duration
+        self.rng = random.Random(seed)
+        self.board = BoardState(width, height)
+        self.reset()
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+
+        # Reset game objects in correct order
+        self.board.clear()
+        self.snake = self.board.body
+        self.board.push_head((self.width//2, self.height//2))
+        self.direction = (1, 0)
+        self.score = 0
+        self.obstacles = []  # Initialize obstacles list first
+        self.food = None
+        self.special_food = None
+        self.special_food_timer = 0
+        self.game_over = False
+        self.ticks = 0
+        self.events = []
+        self.vacated = None  # Cell the tail left on the last tick, for interpolation
+
+        # Now spawn game objects
+        self.food = self.spawn_food()  # Spawn food
+        self.spawn_obstacles()  # Then spawn obstacles
+        self.special_food = self.spawn_special_food()
+        if self.special_food:
+            self.special_food_timer = self.special_food_duration
+
+    def spawn_food(self):
+        pos = self.board.random_free(self.rng)
+        if pos:
+            self.board.occupy(pos, BoardState.FOOD)
+        return pos
+
+    def spawn_special_food(self):
+        if self.rng.random() < self.special_food_chance:
+            pos = self.board.random_free(self.rng)
+            if pos:
+                self.board.occupy(pos, BoardState.SPECIAL_FOOD)
+            return pos
+        return None
+
+    def spawn_obstacles(self):
+        for _ in range(self.num_obstacles):
+            pos = self.board.random_free(self.rng)
+            if pos is None:
+                break
+            self.board.occupy(pos, BoardState.OBSTACLE)
+            self.obstacles.append(pos)
+
+    def step(self, direction=None):
+        """Advance one tick, optionally turning first. Returns False once the game is over."""
+        self.events = []
+        self.vacated = None
+        if self.game_over:
+            return False
+        if direction is not None:
+            self.direction = direction
+        self.ticks += 1
+
+        # Update special food timer
+        if self.special_food:
+            self.special_food_timer -= 1
+            if self.special_food_timer <= 0:
+                self.board.release(self.special_food)
+                self.special_food = None
+
+        head_x = (self.snake[0][0] + self.direction[0]) % self.width
+        head_y = (self.snake[0][1] + self.direction[1]) % self.height
+        new_head = (head_x, head_y)
+
+        # Check collisions
+        if self.board.is_blocked(new_head):
+            self.game_over = True
+            self.events.append(("game_over", new_head))
+            return False
+
+        # Vacate the tail before the head moves in, in case they share a cell
+        eating = new_head == self.food or new_head == self.special_food
+        if not eating:
+            self.vacated = self.board.pop_tail()
+        self.board.push_head(new_head)
+
+        # Check food collision
+        if new_head == self.food:
+            self.score += 1
+            self.events.append(("food", new_head))
+            self.food = self.spawn_food()
+            if not self.special_food:
+                self.special_food = self.spawn_special_food()
+                if self.special_food:
+                    self.special_food_timer = self.special_food_duration
+        elif new_head == self.special_food:
+            self.score += 5
+            self.events.append(("special_food", new_head))
+            self.special_food = None
+        return True
+
+    def summary(self):
+        """Final-state snapshot used to check replays against their recording"""
+        return {'score': self.score, 'ticks': self.ticks, 'length': len(self.snake),
+                'game_over': self.game_over}
+
+    def fast_forward(self, controller=None, max_ticks=None, max_seconds=None):
+        """Step as fast as the CPU allows until game over or a tick/time limit.
+
+        controller is called with the simulation before every tick and returns
+        a direction (or None to keep going straight). Returns the ticks run.
+        """
+        start_tick = self.ticks
+        deadline = time.perf_counter() + max_seconds if max_seconds is not None else None
+        while not self.game_over:
+            if max_ticks is not None and self.ticks - start_tick >= max_ticks:
+                break
+            # Checking the clock every tick would dominate the cost of a step
+            if deadline is not None and self.ticks % 256 == 0 and time.perf_counter() >= deadline:
+                break
+            self.step(controller(self) if controller else None)
+        return self.ticks - start_tick
+
+
+def replay_session(replay, rerun_ai=False):
+    """Re-run a recorded Snake session headless and return its final state.
+
+    Recorded turns are applied as-is; with rerun_ai, ticks played in AI mode
+    ask SnakeAI again instead, which benchmarks the AI on the same session.
+    """
+    from snake_game.ai import SnakeAI
+
+    sim = SnakeSimulation(replay.params['width'], replay.params['height'], seed=replay.seed,
+                          num_obstacles=replay.params.get('num_obstacles', 5))
+    ai = SnakeAI(sim.width, sim.height) if rerun_ai else None
+    for dx, dy, flags in replay:
+        direction = (dx, dy) if dx or dy else None
+        if ai and flags & 1:
+            strategy = "hamiltonian" if flags & 2 else "astar" if flags & 4 else "bfs"
+            if ai.strategy != strategy:
+                ai.strategy = strategy
+                ai.reset()
+            direction = ai(sim)
+        sim.step(direction)
+    return sim.summary()
+
+
+if __name__ == "__main__":
+    import argparse
+    from snake_game.ai import SnakeAI
+
+    parser = argparse.ArgumentParser(description="Run headless Snake games in fast-forward")
+    parser.add_argument("--width", type=int, default=32)
+    parser.add_argument("--height", type=int, default=24)
+    parser.add_argument("--strategy", choices=SnakeAI.STRATEGIES, default="bfs")
+    parser.add_argument("--ticks", type=int, default=100000, help="Total ticks to simulate")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sim = SnakeSimulation(args.width, args.height, seed=args.seed)
+    ai = SnakeAI(args.width, args.height, strategy=args.strategy)
+    games, total_ticks, total_score = 0, 0, 0
+    start = time.perf_counter()
+    while total_ticks < args.ticks:
+        total_ticks += sim.fast_forward(ai, max_ticks=args.ticks - total_ticks)
+        games += 1
+        total_score += sim.score
+        sim.reset(seed=args.seed + games)
+    elapsed = time.perf_counter() - start
+    print(f"{games} games, {total_ticks} ticks in {elapsed:.2f}s "
+          f"({total_ticks / elapsed:,.0f} ticks/s), mean score {total_score / games:.1f}")
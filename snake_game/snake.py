@@ -1,32 +1,44 @@
 import pygame
-import numpy as np
-import cv2
-import mediapipe as mp
 from utils.sound_manager import SoundManager
+from utils.particles import ParticleSystem
+from utils.render_cache import RenderCache
+from utils.hand_tracker import get_hand_tracker
+from utils.hand_worker import INDEX_FINGER_TIP, WRIST
+from utils.landmark_filter import LandmarkPredictor
+from snake_game.simulation import SnakeSimulation
+from snake_game.board import BoardState
+from snake_game.ai import SnakeAI
+from snake_game.sprites import SnakeSprites
+from utils.replay import InputRecorder, new_seed, recording_path
 import math
+from collections import deque
 
 class SnakeGame:
-    def __init__(self):
+    STRATEGY_NAMES = {"bfs": "BFS", "hamiltonian": "Hamiltonian", "astar": "A*"}
+    
+    def __init__(self, board_size=None):
         # Initialize Pygame
         pygame.init()
         self.WIDTH = 1024
         self.HEIGHT = 768
         self.GRID_SIZE = 32
-        self.GRID_WIDTH = self.WIDTH // self.GRID_SIZE
-        self.GRID_HEIGHT = self.HEIGHT // self.GRID_SIZE
+        self.VIEW_WIDTH = self.WIDTH // self.GRID_SIZE
+        self.VIEW_HEIGHT = self.HEIGHT // self.GRID_SIZE
+        # The board defaults to exactly one screen; larger arenas (board_size in
+        # cells) scroll with a camera that follows the head
+        self.GRID_WIDTH, self.GRID_HEIGHT = board_size or (self.VIEW_WIDTH, self.VIEW_HEIGHT)
+        self.follow_camera = self.GRID_WIDTH > self.VIEW_WIDTH or self.GRID_HEIGHT > self.VIEW_HEIGHT
+        self.camera = (0.0, 0.0)  # Board cell at the top-left corner of the screen
+        # Keep the obstacle density of the one-screen board
+        self.num_obstacles = max(5, 5 * self.GRID_WIDTH * self.GRID_HEIGHT // (self.VIEW_WIDTH * self.VIEW_HEIGHT))
         
         self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT), pygame.RESIZABLE)
         pygame.display.set_caption("AI Snake Game")
         
-        # Initialize MediaPipe
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.7
-        )
-        self.cap = cv2.VideoCapture(0)
+        # Shared hand tracker, subscribed to when hand control is first turned on
+        self.hand_input = None
+        # Smooths the landmarks and predicts them forward over the tracking delay
+        self.hand_filter = LandmarkPredictor()
         self.hand_control = False  # Toggle for hand controls
         
         # Colors
@@ -40,19 +52,28 @@ class SnakeGame:
         self.ACCENT = (255, 165, 0)
         self.YELLOW = (255, 255, 0)
         
-        # Initialize game objects
-        self.snake = None
-        self.direction = None
-        self.food = None
-        self.obstacles = None
-        self.special_food = None
-        self.special_food_timer = None
-        self.score = None
-        self.game_over = None
-        self.show_tutorial = None
-        self.paused = None
-        self.ai_mode = None
-        self.path = None
+        # Game rules and AI run on a headless core
+        self.sim = SnakeSimulation(self.GRID_WIDTH, self.GRID_HEIGHT, num_obstacles=self.num_obstacles)
+        # Arena boards default to the time-budgeted A* and leave out the
+        # unbounded BFS, so searches never stall a frame
+        if self.follow_camera:
+            self.ai = SnakeAI(self.GRID_WIDTH, self.GRID_HEIGHT, strategy="astar",
+                              strategies=["hamiltonian", "astar"])
+        else:
+            self.ai = SnakeAI(self.GRID_WIDTH, self.GRID_HEIGHT)
+        self.ai.new_board(self.sim.obstacles)
+        self.show_tutorial = True
+        self.paused = False
+        self.ai_mode = False
+        
+        # The snake advances at the difficulty's tick rate while input and
+        # rendering run at the display rate
+        self.FPS = 60
+        self.DIFFICULTIES = [("Easy", 6), ("Normal", 10), ("Hard", 15), ("Insane", 24)]
+        self.difficulty = 1
+        self.input_queue = deque()
+        self.MAX_QUEUED_TURNS = 3
+        self.recorder = None
         
         # Fonts
         self.title_font = pygame.font.Font(None, 74)
@@ -60,358 +81,195 @@ class SnakeGame:
         self.small_font = pygame.font.Font(None, 36)
         
         # Particles
-        self.particles = []
+        self.particles = ParticleSystem()
+        
+        # Glow sprites and overlays, built once and reused every frame
+        self.render_cache = RenderCache()
         
         # Sound
         self.sound_manager = SoundManager()
         
-        # Initialize game objects in correct order
-        self.snake = [(self.GRID_WIDTH//2, self.GRID_HEIGHT//2)]
-        self.direction = (1, 0)
-        self.score = 0
-        self.obstacles = []  # Initialize obstacles list first
-        self.food = None
-        self.special_food = None
-        self.special_food_timer = 0
-        self.game_over = False
-        self.show_tutorial = True
-        self.paused = False
-        self.ai_mode = False
-        self.path = []
-        
-        # Now spawn game objects
-        self.food = self.spawn_food()  # Spawn food
-        self.spawn_obstacles()  # Then spawn obstacles
-        self.special_food = self.spawn_special_food()
-        if self.special_food:
-            self.special_food_timer = 60
-    
-    def spawn_food(self):
-        while True:
-            x = np.random.randint(0, self.GRID_WIDTH)
-            y = np.random.randint(0, self.GRID_HEIGHT)
-            pos = (x, y)
-            if pos not in self.snake and pos not in self.obstacles:
-                return pos
-    
-    def spawn_special_food(self):
-        if np.random.random() < 0.2:  # 20% chance
-            while True:
-                x = np.random.randint(0, self.GRID_WIDTH)
-                y = np.random.randint(0, self.GRID_HEIGHT)
-                pos = (x, y)
-                if pos not in self.snake and pos != self.food and pos not in self.obstacles:
-                    return pos
-        return None
-    
-    def spawn_obstacles(self):
-        num_obstacles = 5
-        for _ in range(num_obstacles):
-            while True:
-                x = np.random.randint(0, self.GRID_WIDTH)
-                y = np.random.randint(0, self.GRID_HEIGHT)
-                pos = (x, y)
-                if pos not in self.snake and pos != self.food and pos not in self.obstacles:
-                    self.obstacles.append(pos)
-                    break
+        # Sprites for every board cell type, built once for this grid size
+        self.sprites = SnakeSprites(self.GRID_SIZE, {
+            'white': self.WHITE, 'black': self.BLACK, 'green': self.GREEN,
+            'red': self.RED, 'purple': self.PURPLE, 'gray': self.GRAY
+        })
     
     def create_particles(self, x, y, color):
         grid_x = x * self.GRID_SIZE + self.GRID_SIZE//2
         grid_y = y * self.GRID_SIZE + self.GRID_SIZE//2
-        for _ in range(10):
-            particle = {
-                "x": grid_x,
-                "y": grid_y,
-                "dx": np.random.uniform(-5, 5),
-                "dy": np.random.uniform(-5, 5),
-                "lifetime": 30,
-                "color": color,
-                "size": np.random.uniform(2, 6)
-            }
-            self.particles.append(particle)
+        self.particles.spray((grid_x, grid_y), color)
     
-    def update_particles(self):
-        for particle in self.particles[:]:
-            particle["x"] += particle["dx"]
-            particle["y"] += particle["dy"]
-            particle["lifetime"] -= 1
-            if particle["lifetime"] <= 0:
-                self.particles.remove(particle)
+    def update_particles(self, scale=1.0):
+        # scale is elapsed time in units of the original 10 Hz frame
+        self.particles.update(scale)
     
     def draw_particles(self):
-        for particle in self.particles:
-            alpha = min(255, particle["lifetime"] * 8)
-            color = (*particle["color"][:3], alpha)
-            surf = pygame.Surface((particle["size"], particle["size"]), pygame.SRCALPHA)
-            pygame.draw.circle(surf, color, (particle["size"]/2, particle["size"]/2), particle["size"]/2)
-            self.screen.blit(surf, (particle["x"] - particle["size"]/2, particle["y"] - particle["size"]/2))
+        # Particles live in board pixels; shift them by the camera
+        offset = (self.camera[0] * self.GRID_SIZE, self.camera[1] * self.GRID_SIZE)
+        wrap = None
+        if self.follow_camera:
+            wrap = (self.GRID_WIDTH * self.GRID_SIZE, self.GRID_HEIGHT * self.GRID_SIZE)
+        self.particles.draw(self.screen, offset, wrap)
     
     def find_path_to_food(self):
-        target = self.food if not self.special_food else self.special_food
-        start = self.snake[0]
-        queue = [(start, [start])]
-        visited = set([start])
-        
-        while queue:
-            current, path = queue.pop(0)
-            if current == target:
-                return path[1:] if len(path) > 1 else []
-            
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                next_x = (current[0] + dx) % self.GRID_WIDTH
-                next_y = (current[1] + dy) % self.GRID_HEIGHT
-                next_pos = (next_x, next_y)
-                
-                if (next_pos not in visited and 
-                    next_pos not in self.snake[:-1] and 
-                    next_pos not in self.obstacles):
-                    queue.append((next_pos, path + [next_pos]))
-                    visited.add(next_pos)
-        return []
+        return self.ai.find_path_to_food(self.sim)
     
-    def update_game_state(self):
-        if self.paused or self.game_over or self.show_tutorial:
+    def tick_interval(self):
+        return 1000.0 / self.DIFFICULTIES[self.difficulty][1]
+    
+    def queue_direction(self, direction):
+        # Turns are buffered so quick presses between ticks are not lost,
+        # and checked against the last queued turn to block reversals. A full
+        # queue refuses new turns: dropping the oldest one would break the
+        # chain of checks and could turn the snake back into its neck.
+        if len(self.input_queue) >= self.MAX_QUEUED_TURNS:
             return
-        
-        # Update special food timer
-        if self.special_food:
-            self.special_food_timer -= 1
-            if self.special_food_timer <= 0:
-                self.special_food = None
-        
-        # AI mode path finding
-        if self.ai_mode and not self.path:
-            self.path = self.find_path_to_food()
-        
-        # Move snake
-        if self.ai_mode and self.path:
-            next_pos = self.path[0]
-            self.direction = (
-                (next_pos[0] - self.snake[0][0]) % self.GRID_WIDTH,
-                (next_pos[1] - self.snake[0][1]) % self.GRID_HEIGHT
-            )
-            self.path = self.path[1:]
-        
-        head_x = (self.snake[0][0] + self.direction[0]) % self.GRID_WIDTH
-        head_y = (self.snake[0][1] + self.direction[1]) % self.GRID_HEIGHT
-        new_head = (head_x, head_y)
-        
-        # Check collisions
-        if (new_head in self.snake[:-1] or 
-            new_head in self.obstacles):
-            self.game_over = True
+        last = self.input_queue[-1] if self.input_queue else self.sim.direction
+        if direction != last and direction != (-last[0], -last[1]):
+            self.input_queue.append(direction)
+    
+    def update_game_state(self):
+        if self.paused or self.sim.game_over or self.show_tutorial:
             return
         
-        self.snake.insert(0, new_head)
-        
-        # Check food collision
-        if new_head == self.food:
-            self.score += 1
-            self.create_particles(self.food[0], self.food[1], self.GREEN)
-            self.food = self.spawn_food()
-            if not self.special_food:
-                self.special_food = self.spawn_special_food()
-                if self.special_food:
-                    self.special_food_timer = 60
-        elif new_head == self.special_food:
-            self.score += 5
-            self.create_particles(self.special_food[0], self.special_food[1], self.PURPLE)
-            self.special_food = None
+        # AI mode picks the next direction with the selected strategy
+        if self.ai_mode:
+            direction = self.ai.next_direction(self.sim)
         else:
-            self.snake.pop()
-        
-        self.update_particles()
+            direction = self.input_queue.popleft() if self.input_queue else None
+        if self.recorder:
+            flags = ((1 if self.ai_mode else 0) | (2 if self.ai.strategy == "hamiltonian" else 0) |
+                     (4 if self.ai.strategy == "astar" else 0))
+            self.recorder.write(*(direction or (0, 0)), flags)
+        self.sim.step(direction)
+        if self.sim.game_over:
+            self.stop_recording()
+        
+        for event, pos in self.sim.events:
+            if event == "food":
+                self.create_particles(pos[0], pos[1], self.GREEN)
+            elif event == "special_food":
+                self.create_particles(pos[0], pos[1], self.PURPLE)
     
-    def draw_snake_segment(self, pos, is_head=False, is_tail=False, prev_pos=None, next_pos=None):
-        x, y = pos
-        cell_size = self.GRID_SIZE
-        screen_x = x * cell_size
-        screen_y = y * cell_size
-        
-        # Colors for gradient effect
-        base_color = self.GREEN
-        dark_color = (int(base_color[0] * 0.7), int(base_color[1] * 0.7), int(base_color[2] * 0.7))
-        
-        if is_head:
-            # Draw head with eyes and tongue
-            pygame.draw.rect(self.screen, base_color, (screen_x, screen_y, cell_size, cell_size), border_radius=8)
-            
-            # Add gradient effect
-            pygame.draw.rect(self.screen, dark_color, (screen_x + 4, screen_y + 4, cell_size - 8, cell_size - 8), border_radius=6)
-            
-            # Draw eyes
-            eye_color = self.WHITE
-            pupil_color = self.BLACK
-            eye_radius = cell_size // 6
-            pupil_radius = eye_radius // 2
-            
-            # Position eyes based on direction
-            if self.direction == (1, 0):  # Right
-                eye_positions = [(screen_x + cell_size - 10, screen_y + 8), (screen_x + cell_size - 10, screen_y + cell_size - 12)]
-            elif self.direction == (-1, 0):  # Left
-                eye_positions = [(screen_x + 10, screen_y + 8), (screen_x + 10, screen_y + cell_size - 12)]
-            elif self.direction == (0, -1):  # Up
-                eye_positions = [(screen_x + 8, screen_y + 10), (screen_x + cell_size - 12, screen_y + 10)]
-            else:  # Down
-                eye_positions = [(screen_x + 8, screen_y + cell_size - 10), (screen_x + cell_size - 12, screen_y + cell_size - 10)]
-            
-            for eye_pos in eye_positions:
-                pygame.draw.circle(self.screen, eye_color, eye_pos, eye_radius)
-                pygame.draw.circle(self.screen, pupil_color, eye_pos, pupil_radius)
-            
-            # Draw tongue occasionally
-            if pygame.time.get_ticks() % 2000 < 1000:  # Flick tongue every 2 seconds
-                tongue_start = (screen_x + cell_size//2, screen_y + cell_size//2)
-                if self.direction == (1, 0):  # Right
-                    tongue_end = (tongue_start[0] + 12, tongue_start[1])
-                    fork1 = (tongue_end[0] + 4, tongue_end[1] - 4)
-                    fork2 = (tongue_end[0] + 4, tongue_end[1] + 4)
-                elif self.direction == (-1, 0):  # Left
-                    tongue_end = (tongue_start[0] - 12, tongue_start[1])
-                    fork1 = (tongue_end[0] - 4, tongue_end[1] - 4)
-                    fork2 = (tongue_end[0] - 4, tongue_end[1] + 4)
-                elif self.direction == (0, -1):  # Up
-                    tongue_end = (tongue_start[0], tongue_start[1] - 12)
-                    fork1 = (tongue_end[0] - 4, tongue_end[1] - 4)
-                    fork2 = (tongue_end[0] + 4, tongue_end[1] - 4)
-                else:  # Down
-                    tongue_end = (tongue_start[0], tongue_start[1] + 12)
-                    fork1 = (tongue_end[0] - 4, tongue_end[1] + 4)
-                    fork2 = (tongue_end[0] + 4, tongue_end[1] + 4)
-                
-                pygame.draw.line(self.screen, self.RED, tongue_start, tongue_end, 2)
-                pygame.draw.line(self.screen, self.RED, tongue_end, fork1, 2)
-                pygame.draw.line(self.screen, self.RED, tongue_end, fork2, 2)
-        
-        else:
-            # Draw body segments with gradient and connection
-            segment_rect = pygame.Rect(screen_x + 2, screen_y + 2, cell_size - 4, cell_size - 4)
-            
-            # Determine segment orientation
-            if prev_pos and next_pos:
-                if prev_pos[0] == next_pos[0]:  # Vertical
-                    segment_rect.height += 4
-                    segment_rect.y -= 2
-                elif prev_pos[1] == next_pos[1]:  # Horizontal
-                    segment_rect.width += 4
-                    segment_rect.x -= 2
-            
-            # Draw segment with rounded corners
-            pygame.draw.rect(self.screen, base_color, segment_rect, border_radius=6)
-            
-            # Add gradient effect
-            inner_rect = segment_rect.inflate(-6, -6)
-            pygame.draw.rect(self.screen, dark_color, inner_rect, border_radius=4)
-            
-            # Add scales effect (small circles) on body segments
-            if not is_tail:
-                for i in range(2):
-                    for j in range(2):
-                        scale_x = screen_x + cell_size//3 * (i + 1) - cell_size//6
-                        scale_y = screen_y + cell_size//3 * (j + 1) - cell_size//6
-                        pygame.draw.circle(self.screen, dark_color, (scale_x, scale_y), 2)
-
-    def draw_game_state(self):
+    def interpolate(self, start, end, alpha):
+        # Moves across the wrap-around edge snap instead of sliding over the board
+        if abs(end[0] - start[0]) + abs(end[1] - start[1]) != 1:
+            return end
+        return (start[0] + (end[0] - start[0]) * alpha, start[1] + (end[1] - start[1]) * alpha)
+    
+    def update_camera(self, head):
+        if self.follow_camera:
+            # Centre the screen on the (interpolated) head
+            self.camera = (head[0] + 0.5 - self.WIDTH / (2 * self.GRID_SIZE),
+                           head[1] + 0.5 - self.HEIGHT / (2 * self.GRID_SIZE))
+    
+    def screen_cell(self, pos):
+        # Board position relative to the camera, taking the shortest way
+        # around the wrap-around edges
+        x = (pos[0] - self.camera[0]) % self.GRID_WIDTH
+        y = (pos[1] - self.camera[1]) % self.GRID_HEIGHT
+        if self.follow_camera:
+            if x > self.GRID_WIDTH - 2:
+                x -= self.GRID_WIDTH
+            if y > self.GRID_HEIGHT - 2:
+                y -= self.GRID_HEIGHT
+        return (x, y)
+    
+    def draw_game_state(self, alpha=1.0):
+        # alpha is how far the current tick has progressed (0..1); the head
+        # slides out of the neck cell and the tail into its cell accordingly
         # Draw grid (optional, comment out for cleaner look)
         # for x in range(0, self.WIDTH, self.GRID_SIZE):
-        #     pygame.draw.line(self.screen, self.GRAY, (x, 0), (x, self.HEIGHT))
+        #     pygame.draw.line(self.screen, self.GRAY, (x, 0), (self.WIDTH, x))
         # for y in range(0, self.HEIGHT, self.GRID_SIZE):
         #     pygame.draw.line(self.screen, self.GRAY, (0, y), (self.WIDTH, y))
         
-        # Draw snake
-        for i, pos in enumerate(self.snake):
-            is_head = (i == 0)
-            is_tail = (i == len(self.snake) - 1)
-            prev_pos = self.snake[i-1] if i > 0 else None
-            next_pos = self.snake[i+1] if i < len(self.snake)-1 else None
-            self.draw_snake_segment(pos, is_head, is_tail, prev_pos, next_pos)
-        
-        # Draw food with glow effect
-        if self.food:
-            x, y = self.food
-            screen_x = x * self.GRID_SIZE
-            screen_y = y * self.GRID_SIZE
-            
-            # Draw glow
-            glow_radius = self.GRID_SIZE
-            glow_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-            for radius in range(glow_radius, 0, -2):
-                alpha = int((radius / glow_radius) * 100)
-                pygame.draw.circle(glow_surface, (*self.RED[:3], alpha), (glow_radius, glow_radius), radius)
-            self.screen.blit(glow_surface, (screen_x - glow_radius + self.GRID_SIZE//2, 
-                                          screen_y - glow_radius + self.GRID_SIZE//2))
-            
-            # Draw main food
-            pygame.draw.circle(self.screen, self.RED, 
-                             (screen_x + self.GRID_SIZE//2, screen_y + self.GRID_SIZE//2), 
-                             self.GRID_SIZE//3)
-        
-        # Draw special food with sparkle effect
-        if self.special_food:
-            x, y = self.special_food
-            screen_x = x * self.GRID_SIZE + self.GRID_SIZE//2
-            screen_y = y * self.GRID_SIZE + self.GRID_SIZE//2
-            
-            # Draw shimmering effect
-            time = pygame.time.get_ticks()
-            for i in range(8):
-                angle = (time / 500.0 + i * math.pi / 4) % (2 * math.pi)
-                radius = 6 + math.sin(time / 200.0) * 2
-                sparkle_x = screen_x + math.cos(angle) * radius
-                sparkle_y = screen_y + math.sin(angle) * radius
-                pygame.draw.circle(self.screen, self.PURPLE, (int(sparkle_x), int(sparkle_y)), 2)
-            
-            # Draw main special food
-            pygame.draw.circle(self.screen, self.PURPLE, (screen_x, screen_y), self.GRID_SIZE//4)
-        
-        # Draw obstacles
-        for obstacle in self.obstacles:
-            x, y = obstacle
-            screen_x = x * self.GRID_SIZE
-            screen_y = y * self.GRID_SIZE
-            
-            # Draw rock-like obstacle
-            points = [
-                (screen_x + 4, screen_y + self.GRID_SIZE//2),
-                (screen_x + self.GRID_SIZE//2, screen_y + 4),
-                (screen_x + self.GRID_SIZE - 4, screen_y + self.GRID_SIZE//2),
-                (screen_x + self.GRID_SIZE//2, screen_y + self.GRID_SIZE - 4)
-            ]
-            pygame.draw.polygon(self.screen, self.GRAY, points)
-            
-            # Add some detail lines
-            for i in range(3):
-                start_pos = (screen_x + 8 + i * 8, screen_y + 8 + i * 4)
-                end_pos = (start_pos[0] + 8, start_pos[1] + 4)
-                pygame.draw.line(self.screen, self.BLACK, start_pos, end_pos, 2)
+        sprites = self.sprites
+        board = self.sim.board
+        time = pygame.time.get_ticks()
+        snake = self.sim.snake
+        head = snake[0]
+        tail = snake[-1]
+        
+        draw_head = head
+        if len(snake) > 1:
+            draw_head = self.interpolate(snake[1], head, alpha)
+        self.update_camera(draw_head)
+        
+        # Only cells on screen are visited, through the board's occupancy map,
+        # so the cost depends on the window size and not on the board size or
+        # snake length. One extra cell around the edges lets sprites that
+        # spill over their cell (glow, tongue) show when half off screen.
+        if self.follow_camera:
+            first_x = math.floor(self.camera[0]) - 1
+            first_y = math.floor(self.camera[1]) - 1
+            columns = min(self.GRID_WIDTH, self.VIEW_WIDTH + 3)
+            rows = min(self.GRID_HEIGHT, self.VIEW_HEIGHT + 3)
+        else:
+            first_x = first_y = 0
+            columns, rows = self.GRID_WIDTH, self.GRID_HEIGHT
+        offset_x = (first_x - self.camera[0]) * self.GRID_SIZE - sprites.pad
+        offset_y = (first_y - self.camera[1]) * self.GRID_SIZE - sprites.pad
+        
+        snake_blits, food_blits, obstacle_blits = [], [], []
+        cells = board.cells
+        width = self.GRID_WIDTH
+        start_x = first_x % width
+        for row in range(rows):
+            y = (first_y + row) % self.GRID_HEIGHT
+            row_start = y * width
+            if start_x + columns <= width:
+                visible = cells[row_start + start_x:row_start + start_x + columns]
+            else:
+                visible = (cells[row_start + start_x:row_start + width] +
+                           cells[row_start:row_start + start_x + columns - width])
+            screen_y = offset_y + row * self.GRID_SIZE
+            for column, kind in enumerate(visible):
+                if not kind:
+                    continue
+                screen_pos = (offset_x + column * self.GRID_SIZE, screen_y)
+                if kind == BoardState.SNAKE:
+                    pos = ((start_x + column) % width, y)
+                    if pos == head or pos == tail:
+                        continue  # Drawn below at their interpolated positions
+                    before, after = board.segment_neighbours(pos)
+                    snake_blits.append((sprites.body_sprite(before, after), screen_pos))
+                elif kind == BoardState.OBSTACLE:
+                    obstacle_blits.append((sprites.obstacle, screen_pos))
+                elif kind == BoardState.FOOD:
+                    food_blits.append((sprites.food, screen_pos))
+                elif kind == BoardState.SPECIAL_FOOD:
+                    food_blits.append((sprites.special_food_sprite(time), screen_pos))
+        
+        # Tail and head last so they slide over their neighbours
+        if len(snake) > 1:
+            if self.sim.vacated:
+                tail = self.interpolate(self.sim.vacated, tail, alpha)
+            snake_blits.append((sprites.tail, sprites.cell_position(*self.screen_cell(tail))))
+        snake_blits.append((sprites.head_sprite(self.sim.direction, time),
+                            sprites.cell_position(*self.screen_cell(draw_head))))
+        
+        # Same layering as before: snake, then food, then obstacles
+        self.screen.blits(snake_blits, doreturn=False)
+        self.screen.blits(food_blits, doreturn=False)
+        self.screen.blits(obstacle_blits, doreturn=False)
     
     def draw_ui_overlay(self):
         # Draw semi-transparent overlay for UI elements
-        overlay = pygame.Surface((self.WIDTH, 80), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.render_cache.panel((self.WIDTH, 80), (0, 0, 0, 180)), (0, 0))
         
         # Draw score with shadow and glow
-        score_text = f"Score: {self.score}"
-        shadow_surf = self.font.render(score_text, True, (0, 0, 0))
-        text_surf = self.font.render(score_text, True, self.WHITE)
-        
-        # Add glow effect
-        glow_surf = pygame.Surface(text_surf.get_size(), pygame.SRCALPHA)
-        glow_surf.blit(text_surf, (0, 0))
-        for i in range(3):
-            pygame.draw.rect(glow_surf, (*self.GREEN, 50-i*15), 
-                           glow_surf.get_rect().inflate(i*2, i*2), 1)
-        
-        self.screen.blit(shadow_surf, (22, 22))
-        self.screen.blit(glow_surf, (20, 20))
-        self.screen.blit(text_surf, (20, 20))
+        score_text = f"Score: {self.sim.score}"
+        self.screen.blit(self.render_cache.framed_text(self.font, score_text, self.WHITE, self.GREEN), (20, 20))
         
         # Draw game controls with icons
         controls = [
             ("⌨️ Arrows", "Move"),
             ("🤚 H", "Hand Control: " + ("ON" if self.hand_control else "OFF")),
             ("🤖 A", "AI Mode: " + ("ON" if self.ai_mode else "OFF")),
+            ("🧭 S", "Strategy: " + self.STRATEGY_NAMES[self.ai.strategy]),
+            ("⚡ D", "Speed: " + self.DIFFICULTIES[self.difficulty][0]),
             ("⏸️ P", "Pause"),
             ("🏠 ESC", "Menu")
         ]
@@ -428,22 +286,11 @@ class SnakeGame:
     
     def draw_pause_menu(self):
         # Draw semi-transparent overlay
-        overlay = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
-        
-        # Draw pause menu title
-        title_text = "Game Paused"
-        title_surf = self.font.render(title_text, True, self.WHITE)
-        title_rect = title_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2 - 60))
-        
-        # Add glow effect to title
-        for i in range(3):
-            glow_surf = self.font.render(title_text, True, (*self.GREEN, 100-i*30))
-            glow_rect = glow_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2 - 60))
-            self.screen.blit(glow_surf, glow_rect.inflate(i*4, i*4))
+        self.screen.blit(self.render_cache.panel((self.WIDTH, self.HEIGHT), (0, 0, 0, 180)), (0, 0))
         
-        self.screen.blit(title_surf, title_rect)
+        # Draw pause menu title with glow
+        title_surf = self.render_cache.glow_text(self.font, "Game Paused", self.WHITE, self.GREEN)
+        self.screen.blit(title_surf, title_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2 - 60)))
         
         # Draw menu options
         options = [
@@ -459,39 +306,15 @@ class SnakeGame:
     
     def draw_game_over(self):
         # Draw semi-transparent overlay
-        overlay = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
-        
-        # Draw game over title with glow effect
-        title_text = "Game Over!"
-        title_surf = self.font.render(title_text, True, self.RED)
-        title_rect = title_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2 - 60))
-        
-        # Add pulsing glow effect
-        pulse = math.sin(pygame.time.get_ticks() * 0.005) * 0.5 + 0.5
-        for i in range(3):
-            # Create a surface with per-pixel alpha for the glow
-            glow_surf = pygame.Surface(title_surf.get_size(), pygame.SRCALPHA)
-            # Render the text in red
-            temp_surf = self.font.render(title_text, True, self.RED)
-            glow_surf.blit(temp_surf, (0, 0))
-            # Scale the surface for the glow effect
-            size_mult = 1 + (i * 0.1)
-            scaled_size = (int(glow_surf.get_width() * size_mult), 
-                         int(glow_surf.get_height() * size_mult))
-            glow_surf = pygame.transform.smoothscale(glow_surf, scaled_size)
-            # Apply the pulse alpha
-            glow_surf.set_alpha(int(100 * pulse) - i * 30)
-            # Center the glow
-            glow_rect = glow_surf.get_rect(center=title_rect.center)
-            self.screen.blit(glow_surf, glow_rect)
-        
-        # Draw the main text
-        self.screen.blit(title_surf, title_rect)
+        self.screen.blit(self.render_cache.panel((self.WIDTH, self.HEIGHT), (0, 0, 0, 180)), (0, 0))
+        
+        # Draw game over title with a pulsing, scaled-up glow
+        alphas = self.render_cache.pulse_alphas(pygame.time.get_ticks(), 0.005)
+        title_surf = self.render_cache.glow_text(self.font, "Game Over!", self.RED, alphas=alphas, scale=0.1)
+        self.screen.blit(title_surf, title_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2 - 60)))
         
         # Draw score
-        score_text = f"Score: {self.score}"
+        score_text = f"Score: {self.sim.score}"
         score_surf = self.small_font.render(score_text, True, self.WHITE)
         score_rect = score_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2))
         self.screen.blit(score_surf, score_rect)
@@ -508,14 +331,15 @@ class SnakeGame:
             self.screen.blit(text_surf, text_rect)
     
     def draw_tutorial(self):
-        overlay = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 128))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.render_cache.panel((self.WIDTH, self.HEIGHT), (0, 0, 0, 128)), (0, 0))
         
         title = self.title_font.render("AI Snake Game", True, self.WHITE)
         tutorial_text = [
             "Use Arrow Keys to control the snake",
             "Press 'A' to toggle AI mode",
+            "Press 'S' to switch AI strategy ("
+            + " / ".join(self.STRATEGY_NAMES[name] for name in self.ai.strategies) + ")",
+            "Press 'D' to change speed",
             "Collect red food to grow",
             "Purple food gives bonus points!",
             "Avoid obstacles and yourself",
@@ -533,29 +357,19 @@ class SnakeGame:
             y += 40
     
     def get_hand_direction(self):
-        success, image = self.cap.read()
-        if not success:
-            return None
-        
-        # Flip the image horizontally for a later selfie-view display
-        image = cv2.flip(image, 1)
-        
-        # Convert the BGR image to RGB
-        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        
-        # Process the image and detect hands
-        results = self.hands.process(image)
-        
-        if results.multi_hand_landmarks:
-            hand_landmarks = results.multi_hand_landmarks[0]  # Get the first hand
-            
-            # Get index finger tip and palm base positions
-            index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-            palm_base = hand_landmarks.landmark[self.mp_hands.HandLandmark.WRIST]
-            
-            # Calculate direction vector
-            dx = index_tip.x - palm_base.x
-            dy = index_tip.y - palm_base.y
+        # Feed new tracking results to the filter; forget the hand once it is lost
+        hands, timestamp = self.hand_input.poll()
+        if hands:
+            self.hand_filter.update(hands[0], timestamp)  # Get the first hand
+        elif hands is not None:
+            self.hand_filter.reset()
+        
+        # Where the hand should be by now
+        hand = self.hand_filter.predict()
+        if hand is not None:
+            # Calculate direction vector from the palm base to the index finger tip
+            dx = hand[INDEX_FINGER_TIP, 0] - hand[WRIST, 0]
+            dy = hand[INDEX_FINGER_TIP, 1] - hand[WRIST, 1]
             
             # Set thresholds for movement detection
             threshold = 0.15  # Increased threshold for more deliberate movements
@@ -574,32 +388,35 @@ class SnakeGame:
             
         return None
     
-    def reset_game(self):
-        # Reset game objects in correct order
-        self.snake = [(self.GRID_WIDTH//2, self.GRID_HEIGHT//2)]
-        self.direction = (1, 0)
-        self.score = 0
-        self.obstacles = []  # Initialize obstacles list first
-        self.food = None
-        self.special_food = None
-        self.special_food_timer = 0
-        self.game_over = False
+    def start_recording(self):
+        # Recordings start from a freshly seeded game so they can be replayed
+        seed = new_seed()
+        self.reset_game(seed)
+        self.recorder = InputRecorder(recording_path('snake'), 'snake', seed,
+                                      {'width': self.GRID_WIDTH, 'height': self.GRID_HEIGHT,
+                                       'num_obstacles': self.num_obstacles})
+    
+    def stop_recording(self):
+        if self.recorder:
+            self.recorder.close(self.sim.summary())
+            print(f"Saved recording: {self.recorder.path}")
+            self.recorder = None
+    
+    def reset_game(self, seed=None):
+        self.stop_recording()
+        self.sim.reset(seed)
+        self.ai.new_board(self.sim.obstacles)
+        self.input_queue.clear()
         self.show_tutorial = True
         self.paused = False
         self.ai_mode = False
-        self.path = []
-        
-        # Now spawn game objects
-        self.food = self.spawn_food()  # Spawn food
-        self.spawn_obstacles()  # Then spawn obstacles
-        self.special_food = self.spawn_special_food()
-        if self.special_food:
-            self.special_food_timer = 60
     
     def run(self):
         clock = pygame.time.Clock()
         running = True
         return_to_menu = True
+        accumulator = 0.0
+        frame_time = 0
         
         while running:
             for event in pygame.event.get():
@@ -615,58 +432,81 @@ class SnakeGame:
                         self.paused = not self.paused
                     elif event.key == pygame.K_h:
                         self.hand_control = not self.hand_control
-                    elif event.key == pygame.K_a and not self.game_over:
+                        if self.hand_control and self.hand_input is None:
+                            self.hand_input = get_hand_tracker().subscribe()
+                    elif event.key == pygame.K_a and not self.sim.game_over:
                         self.ai_mode = not self.ai_mode
-                        self.path = []
+                        self.ai.reset()
+                    elif event.key == pygame.K_s and not self.sim.game_over:
+                        self.ai.cycle_strategy()
+                    elif event.key == pygame.K_d:
+                        self.difficulty = (self.difficulty + 1) % len(self.DIFFICULTIES)
+                    elif event.key == pygame.K_F9:
+                        if self.recorder:
+                            self.stop_recording()
+                        else:
+                            self.start_recording()
                     elif event.key == pygame.K_SPACE:
-                        if self.game_over:
+                        if self.sim.game_over:
                             self.reset_game()
                         elif self.show_tutorial:
                             self.show_tutorial = False
                         elif self.paused:
                             self.paused = False
-                    elif not self.game_over and not self.paused and not self.show_tutorial and not self.hand_control:
-                        if event.key == pygame.K_UP and self.direction != (0, 1):
-                            self.direction = (0, -1)
-                        elif event.key == pygame.K_DOWN and self.direction != (0, -1):
-                            self.direction = (0, 1)
-                        elif event.key == pygame.K_LEFT and self.direction != (1, 0):
-                            self.direction = (-1, 0)
-                        elif event.key == pygame.K_RIGHT and self.direction != (-1, 0):
-                            self.direction = (1, 0)
+                    elif not self.sim.game_over and not self.paused and not self.show_tutorial and not self.hand_control:
+                        if event.key == pygame.K_UP:
+                            self.queue_direction((0, -1))
+                        elif event.key == pygame.K_DOWN:
+                            self.queue_direction((0, 1))
+                        elif event.key == pygame.K_LEFT:
+                            self.queue_direction((-1, 0))
+                        elif event.key == pygame.K_RIGHT:
+                            self.queue_direction((1, 0))
             
             # Handle hand controls
-            if self.hand_control and not self.game_over and not self.paused and not self.show_tutorial:
+            if self.hand_control and not self.sim.game_over and not self.paused and not self.show_tutorial:
                 hand_dir = self.get_hand_direction()
                 if hand_dir:
-                    if hand_dir[0] != -self.direction[0] or hand_dir[1] != -self.direction[1]:
-                        self.direction = hand_dir
+                    self.queue_direction(hand_dir)
             
-            # Update game state
-            self.update_game_state()
+            # Advance the simulation in fixed ticks; cap the catch-up after a stall
+            tick_interval = self.tick_interval()
+            accumulator = min(accumulator + frame_time, 5 * tick_interval)
+            while accumulator >= tick_interval:
+                self.update_game_state()
+                accumulator -= tick_interval
+            running_ticks = not (self.paused or self.sim.game_over or self.show_tutorial)
+            alpha = accumulator / tick_interval if running_ticks else 1.0
+            self.update_particles(frame_time / 100.0)
             
             # Draw everything
             self.screen.fill(self.BLACK)
-            self.draw_game_state()
+            self.draw_game_state(alpha)
             self.draw_particles()
             self.draw_ui_overlay()
             
             if self.show_tutorial:
                 self.draw_tutorial()
-            elif self.game_over:
+            elif self.sim.game_over:
                 self.draw_game_over()
             elif self.paused:
                 self.draw_pause_menu()
             
             pygame.display.flip()
-            clock.tick(10)  # Snake speed
+            frame_time = clock.tick(self.FPS)
         
         # Clean up
-        self.cap.release()
-        self.hands.close()
+        self.stop_recording()
         pygame.quit()
         return return_to_menu
 
 if __name__ == "__main__":
-    game = SnakeGame()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="AI Snake Game")
+    parser.add_argument("--board", help="Board size in cells as WIDTHxHEIGHT, e.g. 500x500 "
+                                        "(default: one screen)")
+    args = parser.parse_args()
+    board_size = tuple(int(n) for n in args.board.lower().split("x")) if args.board else None
+    game = SnakeGame(board_size)
     game.run()
@@ -0,0 +1,188 @@
+import math
+
+import pygame
+
+from utils.render_cache import to_display_format
+
+
+class SnakeSprites:
+    """Pre-rendered sprite atlas for the Snake board.
+
+    Every sprite is drawn once per grid size with the same pygame calls the
+    game used to issue per cell per frame. Sprites share one padded size so
+    effects that spill over the cell (tongue, glow) fit, and each board cell
+    is drawn with a single blit at cell_position(x, y).
+    """
+
+    DIRECTIONS = [(1, 0), (-1, 0), (0, -1), (0, 1)]
+    SPARKLE_ANGLE_FRAMES = 8
+    SPARKLE_RADIUS_FRAMES = 8
+
+    def __init__(self, grid_size, colors):
+        self.grid_size = grid_size
+        self.colors = colors
+        # The food glow reaches one full cell out from the centre
+        self.pad = grid_size // 2
+        self.sprite_size = grid_size + 2 * self.pad
+
+        self.heads = {}
+        for direction in self.DIRECTIONS:
+            for tongue in (False, True):
+                self.heads[(direction, tongue)] = self.build_head(direction, tongue)
+        self.bodies = {
+            orientation: self.build_body(orientation, is_tail=False)
+            for orientation in ("horizontal", "vertical", "bend")
+        }
+        self.tail = self.build_body("bend", is_tail=True)
+        self.food = self.build_food()
+        self.special_food_frames = [
+            [self.build_special_food(angle_step, radius_step)
+             for radius_step in range(self.SPARKLE_RADIUS_FRAMES)]
+            for angle_step in range(self.SPARKLE_ANGLE_FRAMES)
+        ]
+        self.obstacle = self.build_obstacle()
+
+    def new_sprite(self):
+        return pygame.Surface((self.sprite_size, self.sprite_size), pygame.SRCALPHA)
+
+    def cell_position(self, x, y):
+        return (x * self.grid_size - self.pad, y * self.grid_size - self.pad)
+
+    def build_head(self, direction, tongue):
+        surf = self.new_sprite()
+        cell_size = self.grid_size
+        screen_x = screen_y = self.pad
+        base_color = self.colors['green']
+        dark_color = tuple(int(c * 0.7) for c in base_color)
+
+        pygame.draw.rect(surf, base_color, (screen_x, screen_y, cell_size, cell_size), border_radius=8)
+        pygame.draw.rect(surf, dark_color, (screen_x + 4, screen_y + 4, cell_size - 8, cell_size - 8), border_radius=6)
+
+        # Draw eyes, positioned based on direction
+        eye_radius = cell_size // 6
+        pupil_radius = eye_radius // 2
+        if direction == (1, 0):  # Right
+            eye_positions = [(screen_x + cell_size - 10, screen_y + 8), (screen_x + cell_size - 10, screen_y + cell_size - 12)]
+        elif direction == (-1, 0):  # Left
+            eye_positions = [(screen_x + 10, screen_y + 8), (screen_x + 10, screen_y + cell_size - 12)]
+        elif direction == (0, -1):  # Up
+            eye_positions = [(screen_x + 8, screen_y + 10), (screen_x + cell_size - 12, screen_y + 10)]
+        else:  # Down
+            eye_positions = [(screen_x + 8, screen_y + cell_size - 10), (screen_x + cell_size - 12, screen_y + cell_size - 10)]
+        for eye_pos in eye_positions:
+            pygame.draw.circle(surf, self.colors['white'], eye_pos, eye_radius)
+            pygame.draw.circle(surf, self.colors['black'], eye_pos, pupil_radius)
+
+        if tongue:
+            tongue_start = (screen_x + cell_size//2, screen_y + cell_size//2)
+            if direction == (1, 0):  # Right
+                tongue_end = (tongue_start[0] + 12, tongue_start[1])
+                fork1 = (tongue_end[0] + 4, tongue_end[1] - 4)
+                fork2 = (tongue_end[0] + 4, tongue_end[1] + 4)
+            elif direction == (-1, 0):  # Left
+                tongue_end = (tongue_start[0] - 12, tongue_start[1])
+                fork1 = (tongue_end[0] - 4, tongue_end[1] - 4)
+                fork2 = (tongue_end[0] - 4, tongue_end[1] + 4)
+            elif direction == (0, -1):  # Up
+                tongue_end = (tongue_start[0], tongue_start[1] - 12)
+                fork1 = (tongue_end[0] - 4, tongue_end[1] - 4)
+                fork2 = (tongue_end[0] + 4, tongue_end[1] - 4)
+            else:  # Down
+                tongue_end = (tongue_start[0], tongue_start[1] + 12)
+                fork1 = (tongue_end[0] - 4, tongue_end[1] + 4)
+                fork2 = (tongue_end[0] + 4, tongue_end[1] + 4)
+            pygame.draw.line(surf, self.colors['red'], tongue_start, tongue_end, 2)
+            pygame.draw.line(surf, self.colors['red'], tongue_end, fork1, 2)
+            pygame.draw.line(surf, self.colors['red'], tongue_end, fork2, 2)
+        return to_display_format(surf)
+
+    def build_body(self, orientation, is_tail):
+        surf = self.new_sprite()
+        cell_size = self.grid_size
+        screen_x = screen_y = self.pad
+        base_color = self.colors['green']
+        dark_color = tuple(int(c * 0.7) for c in base_color)
+
+        # Straight segments stretch towards their neighbours to look connected
+        segment_rect = pygame.Rect(screen_x + 2, screen_y + 2, cell_size - 4, cell_size - 4)
+        if orientation == "vertical":
+            segment_rect.height += 4
+            segment_rect.y -= 2
+        elif orientation == "horizontal":
+            segment_rect.width += 4
+            segment_rect.x -= 2
+
+        pygame.draw.rect(surf, base_color, segment_rect, border_radius=6)
+        inner_rect = segment_rect.inflate(-6, -6)
+        pygame.draw.rect(surf, dark_color, inner_rect, border_radius=4)
+
+        # Add scales effect (small circles) on body segments
+        if not is_tail:
+            for i in range(2):
+                for j in range(2):
+                    scale_x = screen_x + cell_size//3 * (i + 1) - cell_size//6
+                    scale_y = screen_y + cell_size//3 * (j + 1) - cell_size//6
+                    pygame.draw.circle(surf, dark_color, (scale_x, scale_y), 2)
+        return to_display_format(surf)
+
+    def build_food(self):
+        surf = self.new_sprite()
+        center = (self.pad + self.grid_size//2, self.pad + self.grid_size//2)
+        glow_radius = self.grid_size
+        for radius in range(glow_radius, 0, -2):
+            alpha = int((radius / glow_radius) * 100)
+            pygame.draw.circle(surf, (*self.colors['red'][:3], alpha), center, radius)
+        pygame.draw.circle(surf, self.colors['red'], center, self.grid_size//3)
+        return to_display_format(surf)
+
+    def build_special_food(self, angle_step, radius_step):
+        surf = self.new_sprite()
+        center_x = center_y = self.pad + self.grid_size//2
+        # The sparkle pattern repeats every quarter turn
+        base_angle = angle_step * (math.pi / 4) / self.SPARKLE_ANGLE_FRAMES
+        radius = 6 + math.sin(2 * math.pi * radius_step / self.SPARKLE_RADIUS_FRAMES) * 2
+        for i in range(8):
+            angle = base_angle + i * math.pi / 4
+            sparkle_x = center_x + math.cos(angle) * radius
+            sparkle_y = center_y + math.sin(angle) * radius
+            pygame.draw.circle(surf, self.colors['purple'], (int(sparkle_x), int(sparkle_y)), 2)
+        pygame.draw.circle(surf, self.colors['purple'], (center_x, center_y), self.grid_size//4)
+        return to_display_format(surf)
+
+    def build_obstacle(self):
+        surf = self.new_sprite()
+        screen_x = screen_y = self.pad
+        grid_size = self.grid_size
+        points = [
+            (screen_x + 4, screen_y + grid_size//2),
+            (screen_x + grid_size//2, screen_y + 4),
+            (screen_x + grid_size - 4, screen_y + grid_size//2),
+            (screen_x + grid_size//2, screen_y + grid_size - 4)
+        ]
+        pygame.draw.polygon(surf, self.colors['gray'], points)
+        for i in range(3):
+            start_pos = (screen_x + 8 + i * 8, screen_y + 8 + i * 4)
+            end_pos = (start_pos[0] + 8, start_pos[1] + 4)
+            pygame.draw.line(surf, self.colors['black'], start_pos, end_pos, 2)
+        return to_display_format(surf)
+
+    def head_sprite(self, direction, time_ms):
+        if direction not in self.DIRECTIONS:
+            direction = (0, 1)
+        # Flick tongue every 2 seconds
+        return self.heads[(direction, time_ms % 2000 < 1000)]
+
+    def body_sprite(self, prev_pos, next_pos):
+        if prev_pos[0] == next_pos[0]:
+            return self.bodies["vertical"]
+        if prev_pos[1] == next_pos[1]:
+            return self.bodies["horizontal"]
+        return self.bodies["bend"]
+
+    def special_food_sprite(self, time_ms):
+        # Sparkles rotate a quarter turn every 500 * pi / 4 ms and pulse every 400 * pi ms
+        angle_phase = (time_ms / 500.0) % (math.pi / 4) / (math.pi / 4)
+        radius_phase = (time_ms / 200.0) % (2 * math.pi) / (2 * math.pi)
+        angle_step = int(angle_phase * self.SPARKLE_ANGLE_FRAMES) % self.SPARKLE_ANGLE_FRAMES
+        radius_step = int(radius_phase * self.SPARKLE_RADIUS_FRAMES) % self.SPARKLE_RADIUS_FRAMES
+        return self.special_food_frames[angle_step][radius_step]
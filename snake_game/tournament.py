@@ -0,0 +1,118 @@
+import argparse
+import csv
+import statistics
+import time
+from multiprocessing import Pool
+
+from snake_game.simulation import SnakeSimulation
+from snake_game.ai import SnakeAI
+
+
+class TimedController:
+    """Wraps an AI controller and accumulates the time spent planning"""
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.planner_time = 0.0
+
+    def __call__(self, sim):
+        start = time.perf_counter()
+        direction = self.controller(sim)
+        self.planner_time += time.perf_counter() - start
+        return direction
+
+
+def play_game(job):
+    """Play one seeded game headless and return its stats"""
+    strategy, seed, width, height, max_ticks, budget_us = job
+    sim = SnakeSimulation(width, height, seed=seed)
+    controller = TimedController(SnakeAI(width, height, strategy=strategy, budget_us=budget_us))
+
+    start = time.perf_counter()
+    ticks = sim.fast_forward(controller, max_ticks=max_ticks)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'strategy': strategy,
+        'seed': seed,
+        'score': sim.score,
+        'ticks': ticks,
+        'length': len(sim.snake),
+        'died': sim.game_over,
+        'elapsed': elapsed,
+        'planner_time': controller.planner_time,
+    }
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(results, strategies):
+    print(f"{'strategy':<12} {'games':>6} {'score mean':>10} {'p10':>6} {'median':>7} {'p90':>6} "
+          f"{'max':>6} {'survival':>9} {'died':>6} {'ticks/s':>10} {'planner':>8}")
+    for strategy in strategies:
+        games = [r for r in results if r['strategy'] == strategy]
+        if not games:
+            continue
+        scores = [r['score'] for r in games]
+        ticks = [r['ticks'] for r in games]
+        elapsed = sum(r['elapsed'] for r in games)
+        planner = sum(r['planner_time'] for r in games)
+        died = sum(1 for r in games if r['died'])
+        print(f"{strategy:<12} {len(games):>6} {statistics.mean(scores):>10.1f} "
+              f"{percentile(scores, 0.1):>6} {statistics.median(scores):>7.1f} "
+              f"{percentile(scores, 0.9):>6} {max(scores):>6} {statistics.mean(ticks):>9.0f} "
+              f"{died / len(games):>6.0%} {sum(ticks) / elapsed:>10,.0f} {planner / elapsed:>8.0%}")
+
+
+def write_results(path, results):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play seeded headless Snake games across AI strategies")
+    parser.add_argument("--strategies", nargs="+", choices=SnakeAI.STRATEGIES, default=SnakeAI.STRATEGIES)
+    parser.add_argument("--games", type=int, default=100, help="Games per strategy")
+    parser.add_argument("--first-seed", type=int, default=0,
+                        help="Games use seeds first-seed .. first-seed + games - 1")
+    parser.add_argument("--seeds", type=int, nargs="+", help="Explicit seed list (overrides --games)")
+    parser.add_argument("--max-ticks", type=int, default=100000, help="Tick limit per game")
+    parser.add_argument("--width", type=int, default=32)
+    parser.add_argument("--height", type=int, default=24)
+    parser.add_argument("--budget-us", type=int, default=None,
+                        help="Per-tick A* search budget in microseconds (default: unbounded, "
+                             "so results do not depend on CPU speed)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", help="Write per-game results to this CSV file")
+    parser.add_argument("--fail-on-death", action="store_true",
+                        help="Exit with an error if any game ends in a collision, e.g. to check "
+                             "that the Hamiltonian strategy never dies")
+    args = parser.parse_args()
+
+    seeds = args.seeds if args.seeds else list(range(args.first_seed, args.first_seed + args.games))
+    jobs = [(strategy, seed, args.width, args.height, args.max_ticks, args.budget_us)
+            for strategy in args.strategies for seed in seeds]
+
+    start = time.perf_counter()
+    with Pool(args.workers) as pool:
+        results = list(pool.imap_unordered(play_game, jobs))
+    wall_time = time.perf_counter() - start
+
+    # Games finish in any order; sort so the report and CSV depend only on the seeds
+    results.sort(key=lambda r: (args.strategies.index(r['strategy']), r['seed']))
+    print(f"{len(jobs)} games on a {args.width}x{args.height} board in {wall_time:.1f}s")
+    summarize(results, args.strategies)
+    if args.output:
+        write_results(args.output, results)
+    deaths = [f"{r['strategy']} seed {r['seed']} (tick {r['ticks']})" for r in results if r['died']]
+    if args.fail_on_death and deaths:
+        raise SystemExit("Games lost: " + ", ".join(deaths))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import threading
+import time
+
+import cv2
+
+
+class CameraStream:
+    """Webcam capture on a background thread, keeping only the newest frame.
+
+    cv2.VideoCapture.read() blocks until the camera delivers a frame, so
+    calling it from a game loop ties the frame rate to the webcam. Here a
+    daemon thread does the blocking reads and overwrites a single slot;
+    read() returns the newest frame not seen before, or (None, None) right
+    away when there is none. Frames overwritten before anyone read them are
+    counted as dropped.
+    """
+
+    # Give up after this many failed reads in a row (camera unplugged)
+    MAX_FAILURES = 50
+    # Frames still need hand tracking (see utils.frame_sources)
+    provides_hands = False
+
+    def __init__(self, index=0, mirror=False):
+        self.index = index
+        self.mirror = mirror  # Flip horizontally for a selfie view, off the game thread
+        self.cap = None
+        self.thread = None
+        self.running = False
+        self.lock = threading.Lock()
+
+        # Newest frame, its capture time (time.perf_counter()) and sequence number
+        self.frame = None
+        self.timestamp = None
+        self.seq = 0
+        self.read_seq = 0
+
+        self.captured = 0
+        self.dropped = 0
+        self.delivered = 0
+        self.started_at = None
+
+    def start(self):
+        """Open the camera and start capturing; does nothing if already running"""
+        if self.running:
+            return self
+        self.cap = cv2.VideoCapture(self.index)
+        if not self.cap.isOpened():
+            self.cap.release()
+            self.cap = None
+            return self
+        self.running = True
+        self.started_at = time.perf_counter()
+        self.thread = threading.Thread(target=self.capture_loop, args=(self.cap,),
+                                       name="camera", daemon=True)
+        self.thread.start()
+        return self
+
+    def is_opened(self):
+        return self.running
+
+    def capture_loop(self, cap):
+        try:
+            self.capture_frames(cap)
+        finally:
+            # Released here, never while another thread is blocked in read()
+            cap.release()
+
+    def capture_frames(self, cap):
+        failures = 0
+        while self.running:
+            ok, frame = cap.read()
+            timestamp = time.perf_counter()
+            if not ok:
+                failures += 1
+                if failures >= self.MAX_FAILURES:
+                    self.running = False
+                    break
+                time.sleep(0.01)
+                continue
+            failures = 0
+            if self.mirror:
+                frame = cv2.flip(frame, 1)
+
+            with self.lock:
+                if self.seq > self.read_seq:
+                    self.dropped += 1
+                self.frame = frame
+                self.timestamp = timestamp
+                self.seq += 1
+                self.captured += 1
+
+    def read(self):
+        """Newest frame not returned before, as (frame, timestamp); never blocks"""
+        with self.lock:
+            if self.seq == self.read_seq:
+                return None, None
+            self.read_seq = self.seq
+            self.delivered += 1
+            return self.frame, self.timestamp
+
+    def stats(self):
+        """Capture counters, the camera's measured frame rate and the newest frame's age"""
+        with self.lock:
+            elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+            return {
+                'captured': self.captured,
+                'delivered': self.delivered,
+                'dropped': self.dropped,
+                'fps': self.captured / elapsed if elapsed else 0.0,
+                'age_ms': (time.perf_counter() - self.timestamp) * 1000 if self.timestamp else None,
+            }
+
+    def stop(self):
+        """Stop the capture thread and release the camera"""
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        self.cap = None
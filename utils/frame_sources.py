@@ -0,0 +1,440 @@
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+
+from utils.camera import CameraStream
+from utils.hand_poses import LABELS, synthetic_hands
+from utils.landmark_filter import sweeping_hand
+
+
+class FrameSource:
+    """Frames from anything but a live camera, read like a CameraStream.
+
+    start(), is_opened(), read(), stats() and stop() behave as they do on
+    CameraStream, so the hand tracker and the games take either. Frame i
+    belongs at frame_time(i) seconds into the stream. With realtime, read()
+    returns the newest frame that is due by the clock, or (None, None)
+    while none is, and frames that came due unread are counted as dropped,
+    as a camera would drop them. Without it every frame is returned in
+    order, one per read(), as fast as the caller asks: the same frames
+    whatever the machine, for benchmarking tracking throughput.
+
+    Sources with provides_hands set already know the landmarks of each
+    frame (recorded or generated) and set hands, a list of (21, 3) arrays,
+    with every frame read, so no tracking has to run.
+
+    Subclasses implement open(), next_frame(index), rewind() and close().
+    """
+
+    provides_hands = False
+
+    def __init__(self, fps=30.0, realtime=True, loop=False):
+        self.fps = fps
+        self.realtime = realtime
+        self.loop = loop  # Start again from the first frame at the end
+        self.running = False
+        self.hands = None
+
+        self.index = 0  # Next frame
+        self.origin = None  # time.perf_counter() at frame 0 of this pass
+        self.timestamp = None
+        self.captured = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.started_at = None
+
+    def start(self):
+        """Open the source; does nothing if already running"""
+        if self.running:
+            return self
+        if not self.open():
+            return self
+        self.running = True
+        self.index = 0
+        self.started_at = self.origin = time.perf_counter()
+        return self
+
+    def is_opened(self):
+        return self.running
+
+    def frame_time(self, index):
+        return index / self.fps
+
+    def due_index(self, elapsed):
+        """The newest frame due elapsed seconds into the pass"""
+        return int(elapsed * self.fps)
+
+    def read(self):
+        """Next frame, as (frame, timestamp); never blocks"""
+        if not self.running:
+            return None, None
+        now = time.perf_counter()
+        index = self.due_index(now - self.origin) if self.realtime else self.index
+        if index < self.index:
+            return None, None
+
+        result = self.next_frame(index)
+        if result is None:
+            # End of the stream
+            if not self.loop or self.index == 0:
+                self.stop()
+                return None, None
+            self.rewind()
+            self.index = 0
+            self.origin = now
+            return self.read()
+
+        frame, self.hands = result
+        self.dropped += index - self.index
+        self.captured += index - self.index + 1
+        self.delivered += 1
+        self.index = index + 1
+        # Real-time frames carry the time they were due, as if captured then
+        self.timestamp = self.origin + self.frame_time(index) if self.realtime else now
+        return frame, self.timestamp
+
+    def stats(self):
+        """The same counters as CameraStream.stats()"""
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        return {
+            'captured': self.captured,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'fps': self.captured / elapsed if elapsed else 0.0,
+            'age_ms': (time.perf_counter() - self.timestamp) * 1000 if self.timestamp else None,
+        }
+
+    def stop(self):
+        if self.running:
+            self.running = False
+            self.close()
+
+    def open(self):
+        """Prepare the frames; returns False if they cannot be read"""
+        return True
+
+    def next_frame(self, index):
+        """Frame index (always past the last one asked for) as (frame, hands),
+        or None past the end"""
+        raise NotImplementedError
+
+    def rewind(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class VideoFileSource(FrameSource):
+    """Frames of a video file, at its own frame rate unless fps is given"""
+
+    def __init__(self, path, realtime=True, loop=False, fps=None, mirror=False):
+        super().__init__(fps or 30.0, realtime, loop)
+        self.path = path
+        self.fixed_fps = fps is not None
+        self.mirror = mirror
+        self.cap = None
+        self.position = 0  # Index of the next frame the decoder gives
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            self.cap.release()
+            self.cap = None
+            return False
+        native = self.cap.get(cv2.CAP_PROP_FPS)
+        if not self.fixed_fps and native > 0:
+            self.fps = native
+        self.position = 0
+        return True
+
+    def next_frame(self, index):
+        # Frames skipped in real time are only grabbed, not decoded
+        while self.position < index:
+            if not self.cap.grab():
+                return None
+            self.position += 1
+        ok, frame = self.cap.read()
+        if not ok:
+            return None
+        self.position += 1
+        if self.mirror:
+            frame = cv2.flip(frame, 1)
+        return frame, None
+
+    def rewind(self):
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self.position = 0
+
+    def close(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+def draw_hands(hands, frame_size=(640, 480)):
+    """A black BGR frame with the landmarks of each hand drawn as dots"""
+    width, height = frame_size
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    for hand in hands:
+        for x, y, _ in hand:
+            cv2.circle(frame, (int(x * width), int(y * height)), 4, (255, 255, 255), -1)
+    return frame
+
+
+class NpzSource(FrameSource):
+    """Frames or landmarks stored in an .npz file.
+
+    frames holds (N, H, W, 3) BGR images (as record_frames() saves them) and
+    landmarks (N, 21, 3) or (N, hands, 21, 3) normalized landmarks, NaN where
+    there was no hand (as utils.landmark_filter records them); either or
+    both may be there. Stored landmarks are used as they are unless
+    use_landmarks is off, so a recording replays without tracking; frames
+    missing from the file are drawn from them. Timing comes from captured,
+    the frames' capture times in seconds, if it is there, and from fps
+    otherwise.
+    """
+
+    def __init__(self, path, realtime=True, loop=False, fps=30.0, use_landmarks=True,
+                 frame_size=(640, 480)):
+        super().__init__(fps, realtime, loop)
+        self.path = path
+        self.use_landmarks = use_landmarks
+        self.frame_size = frame_size
+        self.frames = None
+        self.landmarks = None
+        self.times = None
+
+    def open(self):
+        if not os.path.exists(self.path):
+            return False
+        with np.load(self.path) as data:
+            if 'frames' not in data.files and 'landmarks' not in data.files:
+                raise ValueError(f"{self.path} holds neither frames nor landmarks")
+            if 'frames' in data.files:
+                self.frames = data['frames']
+            if 'landmarks' in data.files and (self.use_landmarks or self.frames is None):
+                landmarks = data['landmarks'].astype(np.float32)
+                self.landmarks = landmarks[:, None] if landmarks.ndim == 3 else landmarks
+            if 'captured' in data.files:
+                self.times = data['captured'] - data['captured'][0]
+        self.provides_hands = self.use_landmarks and self.landmarks is not None
+        return True
+
+    def frame_count(self):
+        return len(self.frames if self.frames is not None else self.landmarks)
+
+    def frame_time(self, index):
+        if self.times is None:
+            return index / self.fps
+        return self.times[min(index, len(self.times) - 1)]
+
+    def due_index(self, elapsed):
+        if self.times is None:
+            return int(elapsed * self.fps)
+        return int(np.searchsorted(self.times, elapsed, side='right')) - 1
+
+    def next_frame(self, index):
+        if index >= self.frame_count():
+            return None
+        hands = None
+        if self.landmarks is not None:
+            hands = [hand for hand in self.landmarks[index] if not np.isnan(hand).any()]
+        frame = self.frames[index] if self.frames is not None else draw_hands(hands, self.frame_size)
+        return frame, hands if self.provides_hands else None
+
+    def close(self):
+        self.frames = None
+        self.landmarks = None
+
+
+class SyntheticSource(FrameSource):
+    """A generated hand acting out a script of gestures, with noise.
+
+    The hand holds each (gesture, turn) of SCRIPT for hold seconds, the
+    turn being the way its fingers point (degrees clockwise from up), while
+    its wrist sweeps about as utils.landmark_filter.sweeping_hand does. So
+    every game reacts to it: the paddle follows the index fingertip, the
+    snake turns where an extended index finger points and Rock Paper
+    Scissors' gesture model sees its throws (the thumb/index rule the game
+    uses until the model is validated mostly does not). Hands are posed as
+    the gesture model's training data (utils.hand_poses.synthetic_hands).
+
+    Needs no camera, files or tracking model. Frame i is the same every
+    time, however frames are skipped, so runs are repeatable; count limits
+    the stream (None for endless). The landmarks are given as tracking
+    results unless provides_hands is turned off, in which case only the
+    drawn frames come out, for the tracker to work on.
+    """
+
+    # Every throw is followed by an open scene (no gesture) so the next one
+    # counts; paper and scissors point the snake right, down, left and up
+    SCRIPT = [("paper", 90), (None, 90), ("rock", 90), (None, 90),
+              ("scissors", 180), (None, 180), ("paper", 270), (None, 270),
+              ("rock", 270), (None, 270), ("scissors", 0), (None, 0)]
+
+    def __init__(self, count=None, fps=30.0, realtime=True, loop=False, seed=0, noise=0.004,
+                 frame_size=(640, 480), provides_hands=True, hold=1.5, scale=0.16):
+        super().__init__(fps, realtime, loop)
+        self.labels = [LABELS.index(gesture) for gesture, _ in self.SCRIPT]
+        self.count = count
+        self.seed = seed
+        self.noise = noise
+        self.frame_size = frame_size
+        self.provides_hands = provides_hands
+        self.hold = hold
+        self.scale = scale
+        self.scene = None
+        self.scene_hand = None
+
+    def next_frame(self, index):
+        if self.count is not None and index >= self.count:
+            return None
+        t = index / self.fps
+        scene = int(t / self.hold)
+        # The hand keeps its shape through a scene, posed around (0, 0) once;
+        # only its position and the tracking noise change from frame to frame
+        if self.scene != scene:
+            step = scene % len(self.SCRIPT)
+            hand, _ = synthetic_hands(1, seed=(self.seed, scene), labels=[self.labels[step]],
+                                turn=self.SCRIPT[step][1], centre=(0.0, 0.0), scale=self.scale)
+            self.scene, self.scene_hand = scene, hand[0]
+        hand = self.scene_hand.copy()
+        hand[:, :2] += sweeping_hand(t).mean(axis=0)[:2]
+        rng = np.random.default_rng((self.seed, index))
+        hands = [(hand + rng.normal(0, self.noise, (21, 3))).astype(np.float32)]
+        return draw_hands(hands, self.frame_size), hands if self.provides_hands else None
+
+
+def open_source(spec, realtime=True, loop=False):
+    """A frame source from a spec string (not started yet):
+
+    webcam[:index]    a live camera (always real time, mirrored)
+    video:PATH        a video file
+    npz:PATH          an .npz of frames or landmarks (NpzSource)
+    synthetic[:seed]  SyntheticSource
+
+    A bare path is read as an .npz or video file by its extension.
+    """
+    kind, _, arg = spec.partition(":")
+    if kind == "webcam":
+        return CameraStream(int(arg or 0), mirror=True)
+    if kind == "video":
+        return VideoFileSource(arg, realtime, loop)
+    if kind == "npz":
+        return NpzSource(arg, realtime, loop)
+    if kind == "synthetic":
+        return SyntheticSource(realtime=realtime, loop=loop, seed=int(arg or 0))
+    if os.path.exists(spec):
+        return NpzSource(spec, realtime, loop) if spec.endswith(".npz") else VideoFileSource(spec, realtime, loop)
+    raise ValueError(f"Unknown frame source {spec!r}")
+
+
+def record_frames(source, path, count):
+    """Save up to count frames of a started source, with their capture times,
+    for NpzSource"""
+    frames, captured = [], []
+    while source.is_opened() and len(frames) < count:
+        frame, timestamp = source.read()
+        if frame is None:
+            time.sleep(0.002)
+            continue
+        frames.append(frame)
+        captured.append(timestamp)
+    np.savez_compressed(path, frames=np.array(frames), captured=np.array(captured))
+    return len(frames)
+
+
+def wait_for_worker(worker):
+    worker.poll()
+    time.sleep(0.0005)
+
+
+def benchmark(source, count, track=False, crop=True):
+    """Read up to count frames from a started source as fast as it gives them
+    and, with track, run hand tracking on every one (even if the source
+    knows the landmarks already); returns the figures. crop=False tracks
+    on whole frames, to compare against cropped tracking.
+
+    Frames go to the tracker one by one, each waiting for a free slot
+    instead of being skipped, so every run tracks the same frames.
+    """
+    worker = None
+    if track:
+        from utils.hand_worker import HandTrackingWorker
+        worker = HandTrackingWorker(crop=crop)
+
+    frames = 0
+    start = time.perf_counter()
+    try:
+        while source.is_opened() and frames < count:
+            frame, timestamp = source.read()
+            if frame is None:
+                time.sleep(0.0005)
+                continue
+            frames += 1
+            if worker is None:
+                continue
+            while not worker.submit(frame, timestamp):
+                wait_for_worker(worker)
+        while worker is not None and worker.completed < worker.submitted:
+            wait_for_worker(worker)
+        elapsed = time.perf_counter() - start
+        tracked = worker.completed if worker is not None else 0
+        figures = {'frames': frames, 'tracked': tracked, 'seconds': elapsed,
+                   'fps': frames / elapsed if elapsed else 0.0, 'source': source.stats()}
+        if worker is not None:
+            figures['tracking'] = worker.stats()
+        return figures
+    finally:
+        if worker is not None:
+            worker.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark and record frame sources")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("benchmark", help="Read (and track) frames as fast as possible")
+    run.add_argument("source", nargs="?", default="synthetic",
+                     help="webcam[:index], video:PATH, npz:PATH or synthetic[:seed]")
+    run.add_argument("--frames", type=int, default=1000)
+    run.add_argument("--track", action="store_true", help="Run hand tracking on every frame")
+    run.add_argument("--realtime", action="store_true", help="Pace the source by its frame rate")
+    run.add_argument("--no-crop", action="store_true",
+                     help="Track on whole frames instead of a crop around the hand")
+
+    record = commands.add_parser("record", help="Save a source's frames to an .npz file")
+    record.add_argument("source", help="webcam[:index], video:PATH or synthetic[:seed]")
+    record.add_argument("path", help="Output .npz file")
+    record.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        source = open_source(args.source).start()
+        if not source.is_opened():
+            parser.error(f"could not open {args.source}")
+        count = record_frames(source, args.path, args.frames)
+        source.stop()
+        print(f"Recorded {count} frames to {args.path}")
+        return
+
+    source = open_source(args.source, realtime=args.realtime).start()
+    if not source.is_opened():
+        parser.error(f"could not open {args.source}")
+    figures = benchmark(source, args.frames, args.track, crop=not args.no_crop)
+    source.stop()
+    print(f"{figures['frames']} frames in {figures['seconds']:.2f}s ({figures['fps']:,.1f} frames/s), "
+          f"{figures['source']['dropped']} dropped")
+    if 'tracking' in figures:
+        tracking = figures['tracking']
+        print(f"Tracked {figures['tracked']}: inference {tracking['inference_ms']:.1f} ms, "
+              f"capture to result {tracking['latency_ms']:.1f} ms, "
+              f"hand lost {tracking['lost']} times ({tracking['cropped']} frames cropped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import numpy as np
+
+# Gesture labels; index 0 is "no gesture" (no hand, or a hand shape that is
+# none of the three). Same order as RockPaperScissors.GESTURES.
+LABELS = [None, "rock", "paper", "scissors"]
+
+# Synthetic hand, in palm lengths with y up: base (MCP) joint, pointing angle
+# (degrees from straight up, positive towards the pinky) and bone lengths of
+# each finger from the index to the pinky
+FINGER_BASES = np.array([(-0.25, 0.95), (0.0, 1.0), (0.22, 0.93), (0.42, 0.82)])
+FINGER_ANGLES = np.array([-8.0, 0.0, 8.0, 16.0])
+FINGER_BONES = np.array([(0.42, 0.25, 0.2), (0.47, 0.28, 0.2), (0.43, 0.27, 0.2), (0.33, 0.2, 0.18)])
+THUMB_BASE = np.array([-0.2, 0.2])
+THUMB_BONES = np.array([0.4, 0.32, 0.27])
+
+# Joint bend ranges in degrees (knuckle, middle joint, end joint) per finger state
+FINGER_STATES = {
+    'E': ((-5, 20), (0, 20), (0, 15)),  # Extended
+    'C': ((60, 95), (80, 110), (30, 70)),  # Curled
+    'H': ((25, 55), (30, 60), (10, 40)),  # Half bent
+}
+# Index, middle, ring and pinky states of each gesture; thumb extended or tucked
+GESTURE_POSES = {
+    "rock": ["CCCC"],
+    "paper": ["EEEE"],
+    "scissors": ["EECC"],
+    None: ["ECCC", "EEEC", "CCCE", "ECCE", "HHHH", "CEEE", "CECC", "HHCC", "CCEE"],
+}
+
+
+def synthetic_hands(count, seed=0, labels=None, turn=None, centre=None, scale=None):
+    """Random MediaPipe-style landmarks of labelled hand shapes.
+
+    Each hand is built joint by joint from a gesture's finger states with
+    random bends, then randomly turned, tilted, mirrored, sized, placed
+    and jittered, and given in normalized 640x480 frame coordinates.
+    Returns ((count, 21, 3) landmarks, (count,) label indices).
+
+    Scripted hands can fix the label indices, the turn (degrees clockwise
+    from fingers up; such hands are not mirrored, so the fingers point
+    that way), the wrist's position centre and the scale (the palm's length
+    as a share of the frame height) of every hand.
+    """
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, len(LABELS), count) if labels is None else np.asarray(labels)
+    points = np.zeros((count, 21, 3))
+    palm_normal = np.array([0.0, 0.0, -1.0])  # Fingers curl towards the camera
+    size = rng.uniform(0.9, 1.1, count)[:, None]
+
+    states = np.empty((count, 4), dtype='<U1')
+    for index, label in enumerate(LABELS):
+        chosen = labels == index
+        if not chosen.any():
+            continue
+        poses = GESTURE_POSES[label]
+        picks = rng.integers(0, len(poses), chosen.sum())
+        states[chosen] = [list(poses[pick]) for pick in picks]
+
+    def bend(state_of, joint):
+        low = np.array([FINGER_STATES[s][joint][0] for s in 'ECH'])
+        high = np.array([FINGER_STATES[s][joint][1] for s in 'ECH'])
+        kind = np.array(['ECH'.index(s) for s in state_of])
+        return np.radians(rng.uniform(low[kind], high[kind]))
+
+    for finger in range(4):
+        spread = FINGER_ANGLES[finger] + rng.normal(0, 3, count)
+        if finger < 2:
+            # Scissors fingers are held apart
+            apart = (labels == LABELS.index("scissors")) * rng.uniform(5, 15, count)
+            spread += -apart if finger == 0 else apart
+        direction = np.stack([np.sin(np.radians(spread)), np.cos(np.radians(spread)), np.zeros(count)], axis=1)
+        joint = np.zeros((count, 3))
+        joint[:, :2] = FINGER_BASES[finger] * size
+        base = 5 + 4 * finger  # Landmark index of the finger's base joint
+        points[:, base] = joint
+        angle = np.zeros(count)
+        for bone in range(3):
+            angle = angle + bend(states[:, finger], bone)
+            step = np.cos(angle)[:, None] * direction + np.sin(angle)[:, None] * palm_normal
+            joint = joint + step * FINGER_BONES[finger, bone] * size
+            points[:, base + bone + 1] = joint
+
+    # Thumb: out to the side for paper, tucked across the palm otherwise
+    tucked = labels != LABELS.index("paper")
+    tucked = np.where(labels == 0, rng.random(count) < 0.5, tucked)
+    spread = np.where(tucked, rng.uniform(-20, 5, count), rng.uniform(-65, -40, count))
+    direction = np.stack([np.sin(np.radians(spread)), np.cos(np.radians(spread)), np.zeros(count)], axis=1)
+    joint = np.zeros((count, 3))
+    joint[:, :2] = THUMB_BASE * size
+    points[:, 1] = joint
+    angle = np.zeros(count)
+    for bone in range(3):
+        angle = angle + np.radians(np.where(tucked, rng.uniform(15, 45, count), rng.uniform(-5, 15, count)))
+        step = np.cos(angle)[:, None] * direction + np.sin(angle)[:, None] * palm_normal
+        joint = joint + step * THUMB_BONES[bone] * size
+        points[:, 2 + bone] = joint
+
+    # Turn in the image plane, tilt out of it and mirror half of them (left hands)
+    def rotation(axis, angles):
+        c, s = np.cos(angles), np.sin(angles)
+        matrix = np.tile(np.eye(3), (count, 1, 1))
+        i, j = [(1, 2), (0, 2), (0, 1)][axis]
+        matrix[:, i, i], matrix[:, i, j], matrix[:, j, i], matrix[:, j, j] = c, -s, s, c
+        return matrix
+
+    for axis, limit in ((2, 45), (0, 30), (1, 30)):
+        angles = rng.uniform(-limit, limit, count)
+        if axis == 2 and turn is not None:
+            angles = -np.broadcast_to(turn, count)
+        matrix = rotation(axis, np.radians(angles))
+        points = np.einsum('nij,nkj->nki', matrix, points)
+    mirrored = rng.random(count) < 0.5
+    if turn is None:
+        points[mirrored, :, 0] *= -1
+
+    # Into normalized image coordinates (y down, x and z in units of the width)
+    drawn_scale = rng.uniform(0.08, 0.3, count)
+    scale = (drawn_scale if scale is None else np.broadcast_to(scale, count))[:, None]
+    drawn_centre = rng.uniform(0.2, 0.8, (count, 2))
+    centre = drawn_centre if centre is None else np.broadcast_to(centre, (count, 2))
+    landmarks = np.empty_like(points)
+    landmarks[..., 0] = centre[:, :1] + points[..., 0] * scale * 0.75
+    landmarks[..., 1] = centre[:, 1:] - points[..., 1] * scale
+    landmarks[..., 2] = points[..., 2] * scale * 0.75
+    landmarks += rng.normal(0, 0.02, landmarks.shape) * scale[..., None]
+    return landmarks.astype(np.float32), labels
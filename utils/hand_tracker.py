@@ -0,0 +1,130 @@
+import atexit
+import os
+
+from utils.frame_sources import open_source
+from utils.hand_worker import HandTrackingWorker
+
+
+class HandTracker:
+    """Webcam and hand tracking shared by every game in the process.
+
+    Nothing is opened until the first subscribe(), and both then stay open
+    until the process exits, so switching games from the menu does not
+    reopen the camera or reload the model. Each game holds its own
+    HandSubscription; all of them are served from the same single
+    inference per camera frame.
+
+    Frames come from source: a utils.frame_sources spec ("webcam:1",
+    "video:clip.mp4", "npz:hand.npz", "synthetic") or a source object, the
+    first webcam by default. Landmarks a source already provides are
+    passed on as they are, without starting the tracking worker.
+    """
+
+    def __init__(self, source=None, **worker_options):
+        self.source = source or "webcam"
+        self.worker_options = worker_options
+        self.stream = None
+        self.worker = None
+
+        # Newest camera frame and newest tracking result
+        self.frame = None
+        self.hands = None
+        self.timestamp = None
+        self.result_seq = 0
+
+    def start(self):
+        # A camera that failed to open is tried again by the next subscriber
+        if self.is_opened():
+            return
+        stream = open_source(self.source) if isinstance(self.source, str) else self.source
+        self.stream = stream.start()
+        if self.worker is None and not stream.provides_hands:
+            self.worker = HandTrackingWorker(**self.worker_options)
+
+    def is_opened(self):
+        return self.stream is not None and self.stream.is_opened()
+
+    def subscribe(self):
+        """Open the camera and tracker if needed and return a new consumer handle"""
+        self.start()
+        return HandSubscription(self)
+
+    def update(self):
+        """Pass the newest camera frame to the worker and collect its newest result"""
+        if self.stream is None:
+            return
+        frame, timestamp = self.stream.read()
+        if frame is not None:
+            self.frame = frame
+            if self.stream.provides_hands:
+                self.hands = self.stream.hands
+                self.timestamp = timestamp
+                self.result_seq += 1
+                return
+        if self.worker is None:
+            return
+        try:
+            if frame is not None:
+                self.worker.submit(frame, timestamp)
+            hands, timestamp = self.worker.poll()
+        except RuntimeError as error:
+            # Reported once; the games keep the camera image but get no hands
+            print(f"Error: {error}")
+            self.worker.close()
+            self.worker = None
+            return
+        if hands is not None:
+            self.hands = hands
+            self.timestamp = timestamp
+            self.result_seq += 1
+
+    def stats(self):
+        if self.stream is None:
+            return {}
+        return {'camera': self.stream.stats(),
+                'tracking': self.worker.stats() if self.worker is not None else {}}
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream = None
+        if self.worker is not None:
+            self.worker.close()
+            self.worker = None
+
+
+class HandSubscription:
+    """One consumer's view of a HandTracker"""
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.seen = tracker.result_seq
+
+    def poll(self):
+        """Newest tracking result this consumer has not seen, as (hands, timestamp),
+        or (None, None). hands holds one (21, 3) landmark array per hand."""
+        self.tracker.update()
+        if self.tracker.result_seq == self.seen:
+            return None, None
+        self.seen = self.tracker.result_seq
+        return self.tracker.hands, self.tracker.timestamp
+
+    def frame(self):
+        """Newest mirrored camera frame (BGR), or None"""
+        return self.tracker.frame
+
+    def is_opened(self):
+        return self.tracker.is_opened()
+
+
+shared_tracker = None
+
+
+def get_hand_tracker():
+    """The process-wide HandTracker, created (but not opened) on first use.
+    The FRAME_SOURCE environment variable picks its source (a frame_sources spec)."""
+    global shared_tracker
+    if shared_tracker is None:
+        shared_tracker = HandTracker(os.environ.get("FRAME_SOURCE"), max_num_hands=1)
+        atexit.register(shared_tracker.close)
+    return shared_tracker
@@ -0,0 +1,316 @@
+import multiprocessing as mp
+import queue
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+# Landmark indices, as in mediapipe.solutions.hands.HandLandmark
+WRIST = 0
+THUMB_TIP = 4
+INDEX_FINGER_TIP = 8
+MIDDLE_FINGER_TIP = 12
+
+
+class HandRegion:
+    """Picks the part of each frame hand inference runs on.
+
+    While a hand is tracked, inference is cropped to a square around the
+    last landmarks' bounding box, grown by MARGIN on every side; once no
+    hand is found the next frame is searched whole again. The square stays
+    put while the hand keeps clear of its edges (and still fills enough of
+    it), since MediaPipe's tracking carries landmarks over from the last
+    image it saw and a crop that moves every frame would throw that off.
+    The crop (or the whole frame) is then downscaled so its longer side is
+    at most max_size pixels. Landmarks from the crop are mapped back to coordinates
+    normalized to the full frame, so callers never see the difference.
+    """
+
+    # Extra room around the hand's bounding box, as a share of its size
+    MARGIN = 0.5
+    # Smallest crop, as a share of the frame's shorter side
+    MIN_SIZE = 0.25
+    # Crops covering more of the frame than this search the whole frame instead
+    MAX_COVER = 0.8
+    # The crop is kept while the hand stays this share of its side away from
+    # every edge and needs at least MIN_FILL of its side
+    EDGE = 0.1
+    MIN_FILL = 0.5
+
+    def __init__(self, max_size=256, crop=True):
+        self.max_size = max_size
+        self.crop = crop
+        self.box = None  # (x0, y0, x1, y1) in pixels, or None for the whole frame
+
+    def prepare(self, frame):
+        """The image to run inference on, and the (x0, y0, x1, y1) box it covers"""
+        height, width = frame.shape[:2]
+        x0, y0, x1, y1 = self.box or (0, 0, width, height)
+        image = frame[y0:y1, x0:x1]
+        longest = max(x1 - x0, y1 - y0)
+        if self.max_size and longest > self.max_size:
+            scale = self.max_size / longest
+            size = (max(1, round((x1 - x0) * scale)), max(1, round((y1 - y0) * scale)))
+            image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        return image, (x0, y0, x1, y1)
+
+    def to_frame(self, landmarks, box, frame_size):
+        """Map landmarks normalized to box back to the whole frame, in place"""
+        width, height = frame_size
+        x0, y0, x1, y1 = box
+        landmarks[:, 0] = (x0 + landmarks[:, 0] * (x1 - x0)) / width
+        landmarks[:, 1] = (y0 + landmarks[:, 1] * (y1 - y0)) / height
+        # z is on roughly the same scale as x
+        landmarks[:, 2] *= (x1 - x0) / width
+        return landmarks
+
+    def update(self, hands, frame_size):
+        """Follow the hands found on the last frame (full-frame landmarks)"""
+        if not self.crop or not hands:
+            self.box = None
+            return
+        width, height = frame_size
+        points = np.concatenate(hands)
+        left, top = points[:, 0].min() * width, points[:, 1].min() * height
+        right, bottom = points[:, 0].max() * width, points[:, 1].max() * height
+        side = max(right - left, bottom - top) * (1 + 2 * self.MARGIN)
+        side = max(side, self.MIN_SIZE * min(width, height))
+        if self.box is not None:
+            x0, y0, x1, y1 = self.box
+            edge = self.EDGE * (x1 - x0)
+            if (left - x0 >= edge and top - y0 >= edge and x1 - right >= edge
+                    and y1 - bottom >= edge and side >= self.MIN_FILL * (x1 - x0)):
+                return
+        if side * side > self.MAX_COVER * width * height:
+            self.box = None
+            return
+        side = min(side, width, height)
+
+        # Square around the box's centre, shifted back inside the frame
+        x0 = int(min(max((left + right - side) / 2, 0), width - side))
+        y0 = int(min(max((top + bottom - side) / 2, 0), height - side))
+        self.box = (x0, y0, x0 + int(side), y0 + int(side))
+
+
+def run_worker(shm_name, shape, requests, results, options, max_size, crop):
+    """Child process entry point; an error that stops tracking (mediapipe
+    missing, a failed start-up or frame) is sent back as (None, message)"""
+    try:
+        track_hands(shm_name, shape, requests, results, options, max_size, crop)
+    except Exception as error:
+        results.put((None, f"{type(error).__name__}: {error}"))
+        raise
+
+
+def track_hands(shm_name, shape, requests, results, options, max_size, crop):
+    """MediaPipe Hands on frames taken from shared memory"""
+    import mediapipe
+
+    # Attached only; the parent owns the block and unlinks it
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+    frame_size = (shape[2], shape[1])
+    hands = mediapipe.solutions.hands.Hands(**options)
+    # Detection-only instance for frames cropped differently from the one before
+    detector = None
+    if crop and not options['static_image_mode']:
+        detector = mediapipe.solutions.hands.Hands(**dict(options, static_image_mode=True))
+    region = HandRegion(max_size, crop)
+    last_box = None
+    try:
+        while True:
+            job = requests.get()
+            if job is None:
+                break
+            seq, slot, timestamp = job
+            start = time.perf_counter()
+            image, box = region.prepare(frames[slot])
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            result = hands.process(image)
+            if detector is not None and box != last_box:
+                # The tracker went by landmarks relative to the previous crop;
+                # take a fresh detection, the tracker has seen this crop now
+                result = detector.process(image)
+            last_box = box
+            landmarks = [region.to_frame(np.array([(p.x, p.y, p.z) for p in hand.landmark], dtype=np.float32),
+                                         box, frame_size)
+                         for hand in result.multi_hand_landmarks or []]
+            cropped = region.box is not None
+            region.update(landmarks, frame_size)
+            results.put((seq, slot, timestamp, landmarks, time.perf_counter() - start, cropped))
+    finally:
+        hands.close()
+        if detector is not None:
+            detector.close()
+        del frames
+        shm.close()
+
+
+class HandTrackingWorker:
+    """MediaPipe hand tracking in a separate process.
+
+    Frames are copied into a small set of slots in a shared-memory block,
+    and only (sequence, slot, timestamp) goes through the request queue; the
+    worker reads the frame in place and sends back one (21, 3) float32 array
+    of normalized x, y, z landmarks per hand. submit() and poll() never
+    block, so the game keeps its frame rate while tracking runs as fast as
+    the CPU allows. A frame arriving while every slot is still in use is
+    skipped rather than queued, which keeps the latency to at most SLOTS
+    inference times.
+
+    By default tracking is adaptive (see HandRegion): inference runs on a
+    downscaled crop around the hand and searches the whole frame only after
+    the hand is lost. crop=False and max_size=None give full-resolution,
+    whole-frame tracking. lost counts results without a hand right after
+    one with a hand, to compare how often each setting drops the hand.
+
+    The process is started on the first frame, once its size is known.
+    Once it has stopped, submit() and poll() raise RuntimeError with the
+    error it sent back.
+    """
+
+    SLOTS = 2
+    # Weight of the newest sample in the running latency averages
+    SMOOTHING = 0.1
+
+    def __init__(self, static_image_mode=False, max_num_hands=1,
+                 min_detection_confidence=0.7, min_tracking_confidence=0.7,
+                 max_size=256, crop=True):
+        self.options = {
+            'static_image_mode': static_image_mode,
+            'max_num_hands': max_num_hands,
+            'min_detection_confidence': min_detection_confidence,
+            'min_tracking_confidence': min_tracking_confidence,
+        }
+        self.max_size = max_size
+        self.crop = crop
+        self.process = None
+        self.shm = None
+        self.frames = None
+        self.free_slots = []
+        self.error = None  # Why the worker process stopped, once it has
+
+        self.seq = 0
+        self.result_seq = 0
+        self.submitted = 0
+        self.completed = 0
+        self.skipped = 0
+        self.cropped = 0
+        self.lost = 0
+        self.had_hand = False
+        self.latency = None  # Capture to result, seconds (running average)
+        self.inference = None  # Time the worker spends per frame, seconds (running average)
+        self.last_latency = None
+
+    def start(self, frame_shape):
+        shape = (self.SLOTS,) + tuple(frame_shape)
+        self.shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+        self.frames = np.ndarray(shape, dtype=np.uint8, buffer=self.shm.buf)
+        self.free_slots = list(range(self.SLOTS))
+
+        # Spawned rather than forked: the game process has SDL and camera threads running
+        context = mp.get_context("spawn")
+        self.requests = context.Queue()
+        self.results = context.Queue()
+        self.process = context.Process(target=run_worker, name="hand-tracking", daemon=True,
+                                       args=(self.shm.name, shape, self.requests, self.results,
+                                             self.options, self.max_size, self.crop))
+        self.process.start()
+
+    def submit(self, frame, timestamp=None):
+        """Queue a BGR camera frame for tracking; returns False if it was skipped"""
+        if self.process is None:
+            self.start(frame.shape)
+        self.check()
+        if not self.free_slots:
+            self.skipped += 1
+            return False
+        if frame.shape != self.frames.shape[1:]:
+            frame = cv2.resize(frame, (self.frames.shape[2], self.frames.shape[1]))
+
+        slot = self.free_slots.pop()
+        self.frames[slot] = frame
+        self.seq += 1
+        self.submitted += 1
+        self.requests.put((self.seq, slot, time.perf_counter() if timestamp is None else timestamp))
+        return True
+
+    def poll(self):
+        """Newest finished result as (landmarks, timestamp), or (None, None).
+
+        landmarks is a list with one (21, 3) array per detected hand and
+        timestamp is the capture time of the frame it came from.
+        """
+        if self.process is None:
+            return None, None
+        newest = None
+        while self.error is None:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if result[0] is None:
+                self.error = result[1]
+                break
+            seq, slot, timestamp, landmarks, inference, cropped = result
+            self.free_slots.append(slot)
+            self.completed += 1
+            self.cropped += cropped
+            self.lost += self.had_hand and not landmarks
+            self.had_hand = bool(landmarks)
+            self.result_seq = seq
+            self.last_latency = time.perf_counter() - timestamp
+            self.latency = self.average(self.latency, self.last_latency)
+            self.inference = self.average(self.inference, inference)
+            newest = (landmarks, timestamp)
+        self.check()
+        return newest or (None, None)
+
+    def check(self):
+        """Raise RuntimeError if the worker process has stopped"""
+        if self.error is None and not self.process.is_alive():
+            self.error = f"exit code {self.process.exitcode}"
+            # An error sent just before exiting can still be queued
+            while True:
+                try:
+                    result = self.results.get_nowait()
+                except queue.Empty:
+                    break
+                if result[0] is None:
+                    self.error = result[1]
+                    break
+        if self.error is not None:
+            raise RuntimeError(f"The hand tracking process stopped: {self.error}")
+
+    def average(self, mean, sample):
+        return sample if mean is None else mean + (sample - mean) * self.SMOOTHING
+
+    def stats(self):
+        """Frame counts, latency and how many frames the worker is behind"""
+        to_ms = lambda seconds: seconds * 1000 if seconds is not None else None
+        return {
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'skipped': self.skipped,
+            'cropped': self.cropped,
+            'lost': self.lost,
+            'behind': self.seq - self.result_seq,
+            'latency_ms': to_ms(self.latency),
+            'last_latency_ms': to_ms(self.last_latency),
+            'inference_ms': to_ms(self.inference),
+        }
+
+    def close(self):
+        """Stop the worker process and free the shared memory"""
+        if self.process is not None:
+            self.requests.put(None)
+            self.process.join(timeout=2.0)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+        if self.shm is not None:
+            self.frames = None
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
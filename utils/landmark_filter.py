@@ -0,0 +1,244 @@
+import argparse
+import math
+import time
+
+import numpy as np
+
+
+class OneEuroFilter:
+    """One Euro filter (Casiez et al.) over a whole array of values at once.
+
+    A low-pass filter whose cutoff rises with speed: slow movements are
+    smoothed hard (no jitter at rest), fast ones follow closely (little
+    lag). min_cutoff (Hz) sets the smoothing at rest and beta how quickly
+    the cutoff opens up with speed, in the values' units per second. The
+    filtered speed is kept as well, for prediction.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=10.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.velocity = None
+        self.timestamp = None
+
+    def smoothing(self, cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, value, timestamp):
+        """Filter a new sample taken at timestamp (seconds); returns the filtered value"""
+        value = np.asarray(value, dtype=np.float64)
+        if self.value is None:
+            self.value = value.copy()
+            self.velocity = np.zeros_like(value)
+            self.timestamp = timestamp
+            return self.value
+        dt = max(timestamp - self.timestamp, 1e-6)
+        self.timestamp = timestamp
+
+        a = self.smoothing(self.d_cutoff, dt)
+        self.velocity += a * ((value - self.value) / dt - self.velocity)
+        cutoff = self.min_cutoff + self.beta * np.abs(self.velocity)
+        self.value += self.smoothing(cutoff, dt) * (value - self.value)
+        return self.value
+
+
+class LandmarkPredictor:
+    """Smooths hand landmarks and extrapolates them to the time they are used.
+
+    update() takes each tracking result with its camera capture timestamp;
+    predict() returns the landmarks expected at another time (normally now),
+    moving the filtered position on at constant velocity. That makes up
+    for the capture, inference and queueing delay, up to max_lead seconds.
+
+    The velocity is taken from the filtered positions and low-passed at
+    v_cutoff Hz; the One Euro filter's own speed estimate works from raw
+    samples and is too noisy to extrapolate with. The filter starts over
+    when a hand reappears after reset_after seconds.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=10.0, d_cutoff=1.0, v_cutoff=2.0,
+                 max_lead=0.12, reset_after=0.3):
+        self.filter = OneEuroFilter(min_cutoff, beta, d_cutoff)
+        self.v_cutoff = v_cutoff
+        self.max_lead = max_lead
+        self.reset_after = reset_after
+        self.velocity = None
+
+    def reset(self):
+        self.filter.reset()
+        self.velocity = None
+
+    def update(self, landmarks, timestamp):
+        last = self.filter.timestamp
+        if last is not None and timestamp - last > self.reset_after:
+            self.reset()
+            last = None
+        previous = None if last is None else self.filter.value.copy()
+        value = self.filter(landmarks, timestamp)
+        if previous is None:
+            self.velocity = np.zeros_like(value)
+        else:
+            dt = max(timestamp - last, 1e-6)
+            a = self.filter.smoothing(self.v_cutoff, dt)
+            self.velocity += a * ((value - previous) / dt - self.velocity)
+        return value
+
+    def predict(self, timestamp=None):
+        """Landmarks expected at timestamp (default now), or None before any update"""
+        if self.filter.value is None:
+            return None
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        lead = min(max(timestamp - self.filter.timestamp, 0.0), self.max_lead)
+        return self.filter.value + self.velocity * lead
+
+
+def save_stream(path, captured, used, landmarks, truth=None):
+    """Store a landmark stream: capture and use times (N,) and (N, 21, 3) landmarks,
+    NaN where no hand was found; truth optionally holds the noise-free positions"""
+    arrays = {'captured': captured, 'used': used, 'landmarks': landmarks}
+    if truth is not None:
+        arrays['truth'] = truth
+    np.savez_compressed(path, **arrays)
+
+
+def load_stream(path):
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def record_stream(path, seconds):
+    """Record the shared hand tracker's results for offline evaluation"""
+    from utils.hand_tracker import get_hand_tracker
+
+    hand_input = get_hand_tracker().subscribe()
+    if not hand_input.is_opened():
+        raise RuntimeError("Could not open camera")
+    captured, used, landmarks = [], [], []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        hands, timestamp = hand_input.poll()
+        if hands is not None:
+            captured.append(timestamp)
+            used.append(time.perf_counter())
+            landmarks.append(hands[0] if hands else np.full((21, 3), np.nan, dtype=np.float32))
+        time.sleep(0.002)
+    save_stream(path, np.array(captured), np.array(used), np.array(landmarks))
+    return len(captured)
+
+
+def sweeping_hand(t):
+    """Noise-free landmarks of a hand sweeping about at varying speed, at times t
+    (seconds), as (..., 21, 3)"""
+    t = np.asarray(t, dtype=np.float64)
+    x = 0.5 + 0.3 * np.sin(1.3 * t) * np.sin(0.21 * t + 1)
+    y = 0.5 + 0.25 * np.sin(2.1 * t + 0.5) * np.cos(0.37 * t)
+    position = np.stack([x, y, np.zeros_like(t)], axis=-1)
+
+    # Landmarks keep a fixed shape around the moving hand
+    shape = np.zeros((21, 3))
+    shape[:, 0] = np.linspace(-0.05, 0.05, 21)
+    shape[:, 1] = np.linspace(0.06, -0.06, 21)
+    return position[..., None, :] + shape
+
+
+def synthetic_stream(seconds=20, rate=30, noise=0.004, latency=(0.04, 0.08), seed=0):
+    """A sweeping_hand() seen through a noisy, late tracker"""
+    rng = np.random.default_rng(seed)
+    captured = np.arange(0, seconds, 1.0 / rate) + rng.uniform(0, 0.004, int(seconds * rate))
+    captured.sort()
+    used = captured + rng.uniform(latency[0], latency[1], len(captured))
+
+    landmarks = sweeping_hand(captured) + rng.normal(0, noise, (len(captured), 21, 3))
+    landmarks[..., 2] = 0
+    return {'captured': captured, 'used': used, 'landmarks': landmarks,
+            'truth': sweeping_hand(used)}
+
+
+def evaluate(stream, predictor_factory, frame_width=640):
+    """Error and jitter, in pixels, of landmarks as they would be used in a game.
+
+    Each result is used at its recorded use time, and is compared with the
+    hand's position at that moment: the stream's truth if it has one,
+    otherwise the raw landmarks interpolated between captures. Jitter is
+    the RMS second difference of that error from result to result, so the
+    hand's own movement does not count. Returns (mean error, jitter) for
+    the raw landmarks, the filtered ones and the filtered ones extrapolated
+    to the use time.
+    """
+    captured, used, landmarks = stream['captured'], stream['used'], stream['landmarks']
+    if 'truth' in stream:
+        truth = stream['truth']
+    else:
+        flat = landmarks.reshape(len(landmarks), -1)
+        ok = ~np.isnan(flat[:, 0])
+        truth = np.stack([np.interp(used, captured[ok], column) for column in flat[ok].T], axis=1)
+        truth = truth.reshape(landmarks.shape)
+        # Beyond the last capture there is nothing to compare with
+        truth[used > captured[ok][-1]] = np.nan
+
+    predictor = predictor_factory()
+    outputs = {'raw': [], 'filtered': [], 'predicted': []}
+    for i in range(len(captured)):
+        if np.isnan(landmarks[i, 0, 0]):
+            predictor.reset()
+            for values in outputs.values():
+                values.append(np.full(landmarks.shape[1:], np.nan))
+            continue
+        filtered = predictor.update(landmarks[i], captured[i]).copy()
+        outputs['raw'].append(landmarks[i])
+        outputs['filtered'].append(filtered)
+        outputs['predicted'].append(predictor.predict(used[i]))
+
+    results = {}
+    for name, values in outputs.items():
+        offset = np.array(values)[..., :2] - truth[..., :2]
+        error = np.linalg.norm(offset, axis=-1) * frame_width
+        jitter = np.diff(offset, n=2, axis=0)
+        jitter = np.sqrt(np.nanmean(np.sum(jitter ** 2, axis=-1))) * frame_width
+        results[name] = (float(np.nanmean(error)), float(jitter))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record hand landmark streams and evaluate "
+                                                 "the smoothing and latency compensation on them")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Record the webcam's landmark stream")
+    record.add_argument("path", help="Output .npz file")
+    record.add_argument("--seconds", type=float, default=30)
+
+    run = commands.add_parser("evaluate", help="Compare raw, filtered and predicted landmarks")
+    run.add_argument("path", nargs="?", help="Recorded .npz stream (default: a synthetic one)")
+    run.add_argument("--min-cutoff", type=float, default=1.0)
+    run.add_argument("--beta", type=float, default=10.0)
+    run.add_argument("--d-cutoff", type=float, default=1.0)
+    run.add_argument("--v-cutoff", type=float, default=2.0)
+    run.add_argument("--max-lead", type=float, default=0.12)
+    run.add_argument("--width", type=int, default=640, help="Frame width for the pixel figures")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        count = record_stream(args.path, args.seconds)
+        print(f"Recorded {count} results to {args.path}")
+        return
+
+    stream = load_stream(args.path) if args.path else synthetic_stream()
+    latency = (stream['used'] - stream['captured']) * 1000
+    print(f"{len(latency)} results, capture-to-use latency {latency.mean():.1f} ms "
+          f"(max {latency.max():.1f} ms)")
+    factory = lambda: LandmarkPredictor(args.min_cutoff, args.beta, args.d_cutoff, args.v_cutoff,
+                                        args.max_lead)
+    for name, (error, jitter) in evaluate(stream, factory, args.width).items():
+        print(f"{name:>9}: mean error {error:6.2f} px, jitter {jitter:6.2f} px")
+
+
+if __name__ == "__main__":
+    main()
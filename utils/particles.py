@@ -0,0 +1,130 @@
+import math
+
+import numpy as np
+import pygame
+
+from utils.render_cache import to_display_format
+
+
+class ParticleSystem:
+    """Fixed-capacity particle pool kept as NumPy arrays (one per attribute).
+
+    Live particles are packed at the front of the arrays. Emitting writes a
+    block after them, update() moves and ages all of them at once and then
+    compacts out the expired ones, and draw() blits the lot in one batch
+    from small sprites cached per colour, radius and alpha level. Emits that
+    do not fit in the pool are dropped.
+    """
+
+    ALPHA_LEVELS = 16
+    RADIUS_STEP = 0.5  # Sprite radii are rounded to this many pixels
+
+    def __init__(self, capacity=500, rng=None):
+        self.capacity = capacity
+        self.rng = rng or np.random.default_rng()
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.life = np.zeros(capacity)  # 1 when emitted, expires at 0
+        self.decay = np.zeros(capacity)  # Life lost per update step
+        self.radius = np.zeros(capacity)
+        self.alpha = np.zeros(capacity)  # Alpha at full life
+        self.color = np.zeros(capacity, dtype=np.int64)  # Index into self.colors
+        self.count = 0
+
+        self.colors = []
+        self.color_ids = {}
+        self.sprites = {}
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def color_id(self, color):
+        color = tuple(color[:3])
+        if color not in self.color_ids:
+            self.color_ids[color] = len(self.colors)
+            self.colors.append(color)
+        return self.color_ids[color]
+
+    def emit(self, pos, color, velocities, lifetime, radius, alpha=255):
+        """Add one particle per row of velocities at pos; returns how many fit.
+
+        lifetime is in update steps; radius may be a number or one per particle.
+        """
+        n = min(len(velocities), self.capacity - self.count)
+        if n <= 0:
+            return 0
+        block = slice(self.count, self.count + n)
+        self.pos[block] = pos
+        self.vel[block] = velocities[:n]
+        self.life[block] = 1.0
+        self.decay[block] = 1.0 / lifetime
+        self.radius[block] = radius[:n] if isinstance(radius, np.ndarray) else radius
+        self.alpha[block] = alpha
+        self.color[block] = self.color_id(color)
+        self.count += n
+        return n
+
+    def burst(self, pos, color, count=10, speed=(2, 5), lifetime=50, radius=3, alpha=255):
+        """Particles flying out from pos in random directions"""
+        angles = self.rng.uniform(0, 2 * np.pi, count)
+        speeds = self.rng.uniform(speed[0], speed[1], count)
+        velocities = np.column_stack((np.cos(angles) * speeds, np.sin(angles) * speeds))
+        return self.emit(pos, color, velocities, lifetime, radius, alpha)
+
+    def spray(self, pos, color, count=10, max_speed=5, lifetime=30, radius=(1, 3), alpha=240):
+        """Particles with independent random x and y speeds and random sizes"""
+        velocities = self.rng.uniform(-max_speed, max_speed, (count, 2))
+        radii = self.rng.uniform(radius[0], radius[1], count)
+        return self.emit(pos, color, velocities, lifetime, radii, alpha)
+
+    def update(self, dt=1.0):
+        """Move and age every particle by dt update steps, dropping expired ones"""
+        n = self.count
+        if not n:
+            return
+        self.pos[:n] += self.vel[:n] * dt
+        self.life[:n] -= self.decay[:n] * dt
+        alive = self.life[:n] > 0
+        if alive.all():
+            return
+        live = np.flatnonzero(alive)
+        for values in (self.pos, self.vel, self.life, self.decay, self.radius, self.alpha, self.color):
+            values[:len(live)] = values[live]
+        self.count = len(live)
+
+    def draw(self, surface, offset=(0, 0), wrap=None):
+        """Blit every live particle, shifted by -offset and optionally wrapped
+        into a (width, height) area for scrolling, wrap-around views"""
+        n = self.count
+        if not n:
+            return
+        pos = self.pos[:n] - offset
+        if wrap is not None:
+            pos %= wrap
+
+        radius_steps = np.maximum(1, np.rint(self.radius[:n] / self.RADIUS_STEP)).astype(np.int64)
+        levels = np.ceil(self.life[:n] * self.alpha[:n] * (self.ALPHA_LEVELS - 1) / 255).astype(np.int64)
+        keys = (self.color[:n] * 1024 + radius_steps) * self.ALPHA_LEVELS + levels
+        corners = np.rint(pos - (radius_steps * self.RADIUS_STEP)[:, None]).astype(np.int64)
+
+        keys = keys.tolist()
+        sprites = self.sprites
+        for key in set(keys).difference(sprites):
+            self.build_sprite(key)
+        positions = zip(corners[:, 0].tolist(), corners[:, 1].tolist())
+        surface.blits(zip(map(sprites.__getitem__, keys), positions), doreturn=False)
+
+    def build_sprite(self, key):
+        rest, level = divmod(key, self.ALPHA_LEVELS)
+        color_id, radius_steps = divmod(rest, 1024)
+        radius = radius_steps * self.RADIUS_STEP
+        size = max(1, math.ceil(2 * radius))
+        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        alpha = level * 255 // (self.ALPHA_LEVELS - 1)
+        pygame.draw.circle(surf, (*self.colors[color_id], alpha), (size / 2, size / 2), radius)
+        surf = to_display_format(surf)
+        self.sprites[key] = surf
+        return surf
@@ -0,0 +1,147 @@
+import math
+
+import pygame
+
+
+def to_display_format(surf):
+    """Convert a per-pixel-alpha surface to the display's pixel format once a window exists"""
+    if pygame.display.get_surface() is not None:
+        return surf.convert_alpha()
+    return surf
+
+
+class RenderCache:
+    """Effect sprites (glows, pulsing titles, translucent panels) built once.
+
+    Each sprite is keyed by everything that changes its pixels (shape, size,
+    colour, text, alpha levels) and converted to the display's pixel format,
+    so drawing an effect is a single blit. Pulsing effects are quantized to
+    PULSE_FRAMES levels, which bounds how many frames get built. The oldest
+    sprites are dropped once more than MAX_SPRITES are cached.
+    """
+
+    PULSE_FRAMES = 16
+    MAX_SPRITES = 512
+
+    def __init__(self):
+        self.sprites = {}
+
+    def clear(self):
+        """Forget every sprite, e.g. after the display was recreated"""
+        self.sprites.clear()
+
+    def get(self, key, build):
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            if len(self.sprites) >= self.MAX_SPRITES:
+                del self.sprites[next(iter(self.sprites))]
+            sprite = to_display_format(build())
+            self.sprites[key] = sprite
+        return sprite
+
+    def pulse_alphas(self, time_ms, speed, peak=100, falloff=30, layers=3):
+        """Glow layer alphas for a pulse following sin(time_ms * speed),
+        quantized so only PULSE_FRAMES distinct frames are ever built"""
+        pulse = math.sin(time_ms * speed) * 0.5 + 0.5
+        level = round(pulse * (self.PULSE_FRAMES - 1)) / (self.PULSE_FRAMES - 1)
+        return tuple(max(0, int(peak * level) - i * falloff) for i in range(layers))
+
+    def panel(self, size, color):
+        """Plain translucent rectangle, e.g. the dark overlay behind menus"""
+        def build():
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            surf.fill(color)
+            return surf
+        return self.get(("panel", tuple(size), tuple(color)), build)
+
+    def glow_rect(self, size, color, alphas=(50, 35, 20), spread=2, border_radius=5, width=0):
+        """Rounded-rectangle glow, layer i grown by i * spread on each side
+        (filled, or an outline with width).
+
+        The sprite is centred on a rect of the given size; blit it at the
+        rect's top-left minus glow_margin(alphas, spread).
+        """
+        def build():
+            margin = self.glow_margin(alphas, spread)
+            surf = pygame.Surface((size[0] + 2 * margin, size[1] + 2 * margin), pygame.SRCALPHA)
+            for i in reversed(range(len(alphas))):
+                layer = pygame.Surface(surf.get_size(), pygame.SRCALPHA)
+                rect = pygame.Rect(margin, margin, size[0], size[1]).inflate(i * 2 * spread, i * 2 * spread)
+                pygame.draw.rect(layer, (*color[:3], alphas[i]), rect,
+                                 width=width, border_radius=border_radius + i * spread)
+                surf.blit(layer, (0, 0))
+            return surf
+        return self.get(("glow_rect", tuple(size), tuple(color), tuple(alphas), spread,
+                         border_radius, width), build)
+
+    def glow_circle(self, radius, color, alphas=(50, 35, 20), spread=4):
+        """Circular glow, layer i of radius + i * spread; blit centred on the circle"""
+        def build():
+            outer = radius + (len(alphas) - 1) * spread
+            surf = pygame.Surface((2 * outer, 2 * outer), pygame.SRCALPHA)
+            for i in reversed(range(len(alphas))):
+                layer = pygame.Surface(surf.get_size(), pygame.SRCALPHA)
+                pygame.draw.circle(layer, (*color[:3], alphas[i]), (outer, outer), radius + i * spread)
+                surf.blit(layer, (0, 0))
+            return surf
+        return self.get(("glow_circle", radius, tuple(color), tuple(alphas), spread), build)
+
+    def glow_margin(self, alphas, spread):
+        return (len(alphas) - 1) * spread
+
+    def framed_text(self, font, text, color, frame_color, shadow_color=(0, 0, 0), shadow_offset=2):
+        """Text over a drop shadow with a thin translucent frame, as used for scores.
+
+        Blit it where the text itself goes; the shadow extends shadow_offset
+        pixels to the right and below.
+        """
+        def build():
+            text_surf = font.render(text, True, color)
+            w, h = text_surf.get_size()
+            surf = pygame.Surface((w + shadow_offset, h + shadow_offset), pygame.SRCALPHA)
+            surf.blit(font.render(text, True, shadow_color), (shadow_offset, shadow_offset))
+            frame = pygame.Surface((w, h), pygame.SRCALPHA)
+            pygame.draw.rect(frame, (*frame_color[:3], 50), frame.get_rect(), 1)
+            surf.blit(frame, (0, 0))
+            surf.blit(text_surf, (0, 0))
+            return surf
+        return self.get(("framed_text", id(font), text, tuple(color), tuple(frame_color),
+                         tuple(shadow_color), shadow_offset), build)
+
+    def glow_text(self, font, text, color, glow_color=None, alphas=(100, 70, 40), offset=2, scale=None):
+        """Text with translucent glow copies behind it, as one sprite centred on the text.
+
+        Glow copy i is either shifted up-left by i * offset pixels or, with
+        scale, enlarged by i * scale (smoothscaled once, at build time).
+        """
+        glow_color = glow_color or color
+
+        def build():
+            text_surf = font.render(text, True, color)
+            glow_surf = font.render(text, True, glow_color)
+            w, h = text_surf.get_size()
+            layers = []
+            for i, alpha in enumerate(alphas):
+                if scale:
+                    layer = pygame.transform.smoothscale(
+                        glow_surf, (int(w * (1 + i * scale)), int(h * (1 + i * scale))))
+                    shift = None
+                else:
+                    layer = glow_surf.copy()
+                    shift = (-i * offset, -i * offset)
+                layer.set_alpha(alpha)
+                layers.append((layer, shift))
+
+            width = max(layer.get_width() for layer, _ in layers) + 2 * (len(alphas) - 1) * offset
+            height = max(layer.get_height() for layer, _ in layers) + 2 * (len(alphas) - 1) * offset
+            surf = pygame.Surface((max(w, width), max(h, height)), pygame.SRCALPHA)
+            center = (surf.get_width() // 2, surf.get_height() // 2)
+            for layer, shift in layers:
+                rect = layer.get_rect(center=center)
+                if shift:
+                    rect.move_ip(shift)
+                surf.blit(layer, rect)
+            surf.blit(text_surf, text_surf.get_rect(center=center))
+            return surf
+        return self.get(("glow_text", id(font), text, tuple(color), tuple(glow_color),
+                         tuple(alphas), offset, scale), build)
@@ -0,0 +1,147 @@
+import argparse
+import gzip
+import json
+import os
+import random
+import struct
+import time
+
+MAGIC = b'GRPL'
+VERSION = 1
+
+# One fixed-size record per game tick, prefixed with a b'T' tag byte
+RECORD_FORMATS = {
+    # Turn passed to the simulation (0, 0 for none) and flags: 1 = AI mode, 2 = Hamiltonian strategy,
+    # 4 = A* strategy
+    'snake': '<bbB',
+    # Paddle positions after keyboard/hand input
+    'ball': '<hh',
+    # Gesture seen on the frame: 0 = none, 1 = rock, 2 = paper, 3 = scissors;
+    # 255 marks the player resetting the scores
+    'rps': '<B',
+}
+
+RECORDINGS_DIR = "recordings"
+
+
+def new_seed():
+    return random.SystemRandom().randrange(2 ** 32)
+
+
+def recording_path(game):
+    """Timestamped file name for a new recording of the given game"""
+    os.makedirs(RECORDINGS_DIR, exist_ok=True)
+    return os.path.join(RECORDINGS_DIR, f"{game}-{time.strftime('%Y%m%d-%H%M%S')}.rpl")
+
+
+class InputRecorder:
+    """Writes a game's RNG seed and per-tick input stream to a gzip-compressed file"""
+
+    def __init__(self, path, game, seed, params=None):
+        self.path = path
+        self.game = game
+        self.record = struct.Struct('<c' + RECORD_FORMATS[game][1:])
+        self.ticks = 0
+        self.file = gzip.open(path, 'wb')
+
+        name = game.encode()
+        params_blob = json.dumps(params or {}).encode()
+        self.file.write(MAGIC + struct.pack('<BB', VERSION, len(name)) + name)
+        self.file.write(struct.pack('<QI', seed, len(params_blob)) + params_blob)
+
+    def write(self, *values):
+        self.file.write(self.record.pack(b'T', *values))
+        self.ticks += 1
+
+    def close(self, summary=None):
+        """Finish the file, optionally with the final game state for replay checks"""
+        if self.file is None:
+            return
+        if summary is not None:
+            blob = json.dumps(summary).encode()
+            self.file.write(b'E' + struct.pack('<I', len(blob)) + blob)
+        self.file.close()
+        self.file = None
+
+
+class InputReplay:
+    """Reads a recording made by InputRecorder"""
+
+    def __init__(self, path):
+        with gzip.open(path, 'rb') as f:
+            data = f.read()
+
+        if data[:4] != MAGIC:
+            raise ValueError(f"{path} is not a game recording")
+        version, name_length = struct.unpack_from('<BB', data, 4)
+        if version != VERSION:
+            raise ValueError(f"Unsupported recording version {version}")
+        offset = 6
+        self.game = data[offset:offset + name_length].decode()
+        offset += name_length
+        self.seed, params_length = struct.unpack_from('<QI', data, offset)
+        offset += 12
+        self.params = json.loads(data[offset:offset + params_length])
+        offset += params_length
+
+        record = struct.Struct('<c' + RECORD_FORMATS[self.game][1:])
+        self.records = []
+        self.summary = None
+        while offset < len(data):
+            if data[offset:offset + 1] == b'E':
+                (blob_length,) = struct.unpack_from('<I', data, offset + 1)
+                self.summary = json.loads(data[offset + 5:offset + 5 + blob_length])
+                break
+            self.records.append(record.unpack_from(data, offset)[1:])
+            offset += record.size
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded game session at maximum speed")
+    parser.add_argument("path", help="Recording (.rpl) to replay")
+    parser.add_argument("--render", action="store_true",
+                        help="Draw every tick as well (to benchmark rendering); still uncapped")
+    parser.add_argument("--rerun-ai", action="store_true",
+                        help="Snake only: recompute AI-mode moves instead of using the recorded ones")
+    args = parser.parse_args()
+
+    if not args.render:
+        # No window or audio device needed for a headless replay
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    replay = InputReplay(args.path)
+    # Build the game first so window and mixer setup stay out of the timing
+    if replay.game == 'snake':
+        from snake_game.simulation import replay_session
+        run = lambda: replay_session(replay, rerun_ai=args.rerun_ai)
+    elif replay.game == 'ball':
+        from Ball.ball import BallGame
+        game = BallGame()
+        run = lambda: game.replay_session(replay, render=args.render)
+    elif replay.game == 'rps':
+        from RockPaperScissors.rpsdata import RockPaperScissors
+        game = RockPaperScissors()
+        run = lambda: game.replay_session(replay, render=args.render)
+    else:
+        raise ValueError(f"Unknown game in recording: {replay.game}")
+
+    start = time.perf_counter()
+    summary = run()
+    elapsed = time.perf_counter() - start
+
+    print(f"{replay.game}: {len(replay)} ticks in {elapsed:.3f}s ({len(replay) / max(elapsed, 1e-9):,.0f} ticks/s)")
+    print(f"Final state: {summary}")
+    if replay.summary is not None:
+        print("Matches recording" if summary == replay.summary
+              else f"MISMATCH, recorded: {replay.summary}")
+
+
+if __name__ == "__main__":
+    main()